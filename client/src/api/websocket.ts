@@ -12,12 +12,33 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 // WebSocket event types
 export interface WebSocketEvents {
   connected: { session_id: string };
-  message: { user_message: Message; ai_message: Message };
-  streaming_message: { chunk: string; is_complete: boolean; message_id?: string };
+  message: {
+    user_message: Message;
+    ai_message: Message;
+    client_message_id?: string | null;
+    duplicate?: boolean;
+  };
+  streaming_message: {
+    chunk: string;
+    is_complete: boolean;
+    message_id?: string;
+    offset?: number;
+    resumed?: boolean;
+  };
   typing_start: { from: 'bot' | 'user' };
   typing_stop: { from: 'bot' | 'user' };
   phase_change: { phase: string };
   prd_ready: { message: string };
+  prd_job_started: {
+    job_id: string;
+    session_id: string;
+    status: string;
+    stage: string;
+    progress: number;
+    prd_id: string | null;
+  };
+  prd_progress: { job_id: string; stage: string; progress: number; chunk: string };
+  prd_failed: { job_id: string; message: string };
   prd_generated: {
     prd_id: string;
     filename: string;
@@ -80,6 +101,10 @@ export class WebSocketClient {
   // Track if listeners have been set up
   private listenersInitialized = false;
 
+  // Response stream in progress: next chunk offset expected, so a
+  // reconnect can resume it instead of losing the missed chunks
+  private activeStream: { messageId: string; offset: number } | null = null;
+
   /**
    * Connect to the WebSocket server
    */
@@ -114,9 +139,14 @@ export class WebSocketClient {
       this.isSocketConnected = true;
       this.reconnectAttempts = 0;
 
-      // Join the session room
+      // Join the session room, resuming an interrupted response stream
       if (this.socket && this.sessionId) {
-        this.socket.emit('join_session', { session_id: this.sessionId });
+        this.socket.emit('join_session', {
+          session_id: this.sessionId,
+          ...(this.activeStream && {
+            resume: { message_id: this.activeStream.messageId, offset: this.activeStream.offset },
+          }),
+        });
       }
       this.emitLocal('connect', {});
     });
@@ -151,11 +181,14 @@ export class WebSocketClient {
     // Handle all WebSocket events
     this.socket.on('connected', (data) => this.emitLocal('connected', data));
     this.socket.on('message', (data) => this.emitLocal('message', data));
-    this.socket.on('streaming_message', (data) => this.emitLocal('streaming_message', data));
+    this.socket.on('streaming_message', (data) => this.handleStreamingMessage(data));
     this.socket.on('typing_start', (data) => this.emitLocal('typing_start', data));
     this.socket.on('typing_stop', (data) => this.emitLocal('typing_stop', data));
     this.socket.on('phase_change', (data) => this.emitLocal('phase_change', data));
     this.socket.on('prd_ready', (data) => this.emitLocal('prd_ready', data));
+    this.socket.on('prd_job_started', (data) => this.emitLocal('prd_job_started', data));
+    this.socket.on('prd_progress', (data) => this.emitLocal('prd_progress', data));
+    this.socket.on('prd_failed', (data) => this.emitLocal('prd_failed', data));
     this.socket.on('prd_generated', (data) => this.emitLocal('prd_generated', data));
     this.socket.on('experts_matched', (data) => this.emitLocal('experts_matched', data));
     this.socket.on('availability', (data) => this.emitLocal('availability', data));
@@ -176,16 +209,38 @@ export class WebSocketClient {
     });
   }
 
+  /**
+   * Track stream offsets and drop chunks already received (a resumed
+   * stream can overlap with chunks broadcast around the reconnect)
+   */
+  private handleStreamingMessage(data: WebSocketEvents['streaming_message']): void {
+    if (data.is_complete) {
+      this.activeStream = null;
+    } else if (data.message_id && data.offset !== undefined) {
+      const stream = this.activeStream;
+      if (stream && stream.messageId === data.message_id) {
+        if (data.offset < stream.offset) return;
+        stream.offset = data.offset + 1;
+      } else {
+        this.activeStream = { messageId: data.message_id, offset: data.offset + 1 };
+      }
+    }
+    this.emitLocal('streaming_message', data);
+  }
+
   /**
    * Send a chat message
+   *
+   * Pass the same clientMessageId when retrying so the server replays the
+   * original turn instead of processing the message twice.
    */
-  sendMessage(content: string): void {
+  sendMessage(content: string, clientMessageId: string = crypto.randomUUID()): void {
     if (!this.socket || !this.isSocketConnected) {
       console.error('[WebSocket] Not connected');
       return;
     }
 
-    this.socket.emit('send_message', { content });
+    this.socket.emit('send_message', { content, client_message_id: clientMessageId });
   }
 
   /**
@@ -246,13 +301,13 @@ export class WebSocketClient {
   /**
    * Send a streaming chat message (for real-time response chunks)
    */
-  sendStreamingMessage(content: string): void {
+  sendStreamingMessage(content: string, clientMessageId: string = crypto.randomUUID()): void {
     if (!this.socket || !this.isSocketConnected) {
       console.error('[WebSocket] Not connected');
       return;
     }
 
-    this.socket.emit('send_streaming_message', { content });
+    this.socket.emit('send_streaming_message', { content, client_message_id: clientMessageId });
   }
 
   /**
@@ -0,0 +1,55 @@
+"""Add denormalized active booking count to experts
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-01-04 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add experts.active_booking_count and backfill it from bookings."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('experts'):
+        # Fresh databases get the column from create_all
+        return
+    columns = {column['name'] for column in inspector.get_columns('experts')}
+    if 'active_booking_count' not in columns:
+        op.add_column(
+            'experts',
+            sa.Column(
+                'active_booking_count',
+                sa.Integer(),
+                nullable=False,
+                server_default='0',
+            ),
+        )
+
+    if inspector.has_table('bookings'):
+        # Same count as ExpertService.reconcile_workload_counts: confirmed
+        # bookings that have not started yet. The startup reconciliation job
+        # keeps it in sync from here on.
+        op.execute(
+            """
+            UPDATE experts SET active_booking_count = (
+                SELECT COUNT(*) FROM bookings
+                WHERE bookings.expert_id = experts.id
+                  AND bookings.status = 'confirmed'
+                  AND bookings.start_time >= CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+
+def downgrade() -> None:
+    """Remove the active booking count column."""
+    with op.batch_alter_table('experts') as batch_op:
+        batch_op.drop_column('active_booking_count')
@@ -0,0 +1,68 @@
+"""Add delta storage and preview metadata to PRD documents
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-01-05 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.core.types import UUIDType
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = ('content_delta', 'delta_base_id', 'preview_text', 'content_length')
+
+
+def upgrade() -> None:
+    """Add delta and preview columns, and allow delta-only content."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('prd_documents'):
+        # Fresh databases get the columns from create_all
+        return
+    columns = {column['name'] for column in inspector.get_columns('prd_documents')}
+
+    # Batch mode: SQLite can only change NOT NULL by recreating the table
+    with op.batch_alter_table('prd_documents') as batch_op:
+        if 'content_delta' not in columns:
+            batch_op.add_column(sa.Column('content_delta', sa.LargeBinary(), nullable=True))
+        if 'delta_base_id' not in columns:
+            batch_op.add_column(sa.Column('delta_base_id', UUIDType(), nullable=True))
+        if 'preview_text' not in columns:
+            batch_op.add_column(sa.Column('preview_text', sa.String(200), nullable=True))
+        if 'content_length' not in columns:
+            batch_op.add_column(
+                sa.Column('content_length', sa.Integer(), nullable=False, server_default='0')
+            )
+        batch_op.alter_column('content_markdown', existing_type=sa.Text(), nullable=True)
+
+    # Same values as make_preview_text() and default_content_length()
+    op.execute(
+        """
+        UPDATE prd_documents SET
+            preview_text = CASE
+                WHEN LENGTH(content_markdown) > 197
+                THEN SUBSTR(content_markdown, 1, 197) || '...'
+                ELSE content_markdown
+            END,
+            content_length = LENGTH(content_markdown)
+        WHERE content_markdown IS NOT NULL AND preview_text IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Remove delta and preview columns.
+
+    Fails if any version is stored only as a delta; restore those rows'
+    content first.
+    """
+    with op.batch_alter_table('prd_documents') as batch_op:
+        batch_op.alter_column('content_markdown', existing_type=sa.Text(), nullable=False)
+        for column in reversed(NEW_COLUMNS):
+            batch_op.drop_column(column)
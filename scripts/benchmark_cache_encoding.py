@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark the encoding of cached sessions.
+
+Compares plain JSON (the previous session cache format) with the compact
+cache encoding (MessagePack, uncompressed and with zstd/lz4) on sessions
+of increasing length, reporting bytes per cached session and encode and
+decode times.
+
+Usage:
+    python scripts/benchmark_cache_encoding.py [--messages 10 50 200] [--number 500]
+"""
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import cache_codec, json_codec
+
+ANSWERS = [
+    "We run a regional clinic network and intake is still paper based.",
+    "Budget is around $80k and we'd like something live before Q3.",
+    "The main pain point is duplicate data entry between scheduling and billing.",
+    "Our IT team is small, three people, mostly supporting hardware.",
+]
+
+
+def session_payload(messages: int) -> dict[str, Any]:
+    """Build a session as cached by SessionService.get_session."""
+    started = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "visitor_id": str(uuid.uuid4()),
+        "status": "active",
+        "current_phase": "discovery",
+        "client_info": {"name": "Jane Roe", "email": "jane@example.com", "company": "Acme Clinics"},
+        "business_context": {"industry": "Healthcare", "company_size": "50-200"},
+        "qualification": {"budget_range": "$50k-100k", "timeline": "Q3"},
+        "email_opt_in": False,
+        "email_preferences": {},
+        "started_at": started.isoformat(),
+        "last_activity": started.isoformat(),
+        "completed_at": None,
+        "messages": [
+            {
+                "id": str(uuid.uuid4()),
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": ANSWERS[i % len(ANSWERS)] if i % 2 == 0 else (
+                    "Thanks, that helps. Could you tell me more about how patients "
+                    "book appointments today and which systems are involved? " * 3
+                ),
+                "meta_data": {},
+                "created_at": (started + timedelta(seconds=30 * i)).isoformat(),
+            }
+            for i in range(messages)
+        ],
+    }
+
+
+def measure(function: Callable[[], Any], number: int) -> float:
+    """Microseconds per call, best of three runs."""
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 50, 200], help="Messages per session")
+    parser.add_argument("--number", type=int, default=500, help="Calls per measurement")
+    args = parser.parse_args()
+
+    encodings: list[tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]] = [
+        ("json", json_codec.dumps, json_codec.loads),
+        ("msgpack", lambda value: cache_codec.encode(value, compression="none"), cache_codec.decode),
+    ]
+    if cache_codec.ZSTD_AVAILABLE:
+        encodings.append(
+            ("msgpack+zstd", lambda value: cache_codec.encode(value, compression="zstd"), cache_codec.decode)
+        )
+    if cache_codec.LZ4_AVAILABLE:
+        encodings.append(
+            ("msgpack+lz4", lambda value: cache_codec.encode(value, compression="lz4"), cache_codec.decode)
+        )
+
+    print(f"{'messages':>8}  {'encoding':<14}{'bytes':>10}{'ratio':>8}{'encode µs':>12}{'decode µs':>12}")
+    for messages in args.messages:
+        payload = session_payload(messages)
+        json_size = len(json_codec.dumps(payload))
+        for name, encode, decode in encodings:
+            encoded = encode(payload)
+            assert decode(encoded) == payload
+            encode_us = measure(lambda: encode(payload), args.number)  # noqa: B023
+            decode_us = measure(lambda: decode(encoded), args.number)  # noqa: B023
+            print(
+                f"{messages:>8}  {name:<14}{len(encoded):>10}{len(encoded) / json_size:>8.2f}"
+                f"{encode_us:>12.1f}{decode_us:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
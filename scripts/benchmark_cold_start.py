@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark the API process's cold start.
+
+Reports the import time of `src.main` broken down by top-level package
+(from `python -X importtime`), and the time from launching uvicorn to the
+first healthy response of the health endpoint. Each measurement runs in a
+fresh interpreter; the median of the runs is reported.
+
+Usage:
+    python scripts/benchmark_cold_start.py [--runs 5] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEALTH_PATH = "/api/v1/health"
+
+
+def import_times() -> tuple[float, dict[str, float]]:
+    """Import src.main in a fresh interpreter.
+
+    Returns:
+        Total import time and self time per top-level package, in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    by_package: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us) / 1e6
+        if name.strip() == "src.main":
+            total = int(cumulative_us) / 1e6
+    return total, by_package
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def time_to_healthy(timeout: float) -> float:
+    """Launch the API with uvicorn and time the first healthy response."""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{HEALTH_PATH}", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"No healthy response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Startup deadline (s)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    totals: list[float] = []
+    packages: dict[str, list[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        total, by_package = import_times()
+        totals.append(total)
+        for name, seconds in by_package.items():
+            packages[name].append(seconds)
+    breakdown = sorted(
+        ((name, statistics.median(times)) for name, times in packages.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:args.top]
+    healthy = statistics.median(time_to_healthy(args.timeout) for _ in range(args.runs))
+
+    if args.json:
+        print(json.dumps({
+            "import_seconds": statistics.median(totals),
+            "import_breakdown_seconds": dict(breakdown),
+            "time_to_healthy_seconds": healthy,
+        }, indent=2))
+        return
+
+    print(f"{'package':<28}{'import':>10}")
+    for name, seconds in breakdown:
+        print(f"{name:<28}{seconds * 1000:>8.1f}ms")
+    print(f"\n{'import src.main':<28}{statistics.median(totals) * 1000:>8.1f}ms")
+    print(f"{'time to first healthy':<28}{healthy * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark JSON encoding of session-sized payloads.
+
+Compares the standard library (as previously used, with `default=str`)
+against the fast JSON codec on the payloads of the hot paths: the cached
+session dict, a JSONType column value and an API response body.
+
+Usage:
+    python scripts/benchmark_json_codec.py [--messages 50] [--number 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import json_codec
+
+
+def session_payload(messages: int) -> dict[str, Any]:
+    """Build a session as cached by SessionService.get_session."""
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "visitor_id": str(uuid.uuid4()),
+        "status": "active",
+        "current_phase": "discovery",
+        "client_info": {"name": "Jane Roe", "email": "jane@example.com", "company": "Acme Corp"},
+        "business_context": {
+            "industry": "Healthcare",
+            "challenges": ["legacy systems", "data silos", "compliance reporting"],
+            "company_size": "50-200",
+        },
+        "qualification": {"budget_range": "$50k-100k", "timeline": "Q3", "decision_maker": True},
+        "email_opt_in": False,
+        "email_preferences": {},
+        "started_at": now.isoformat(),
+        "last_activity": now.isoformat(),
+        "completed_at": None,
+        "messages": [
+            {
+                "id": uuid.uuid4(),
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": "We need help modernizing our patient intake workflow. " * 4,
+                "meta_data": {"phase_change": "discovery"} if i % 10 == 0 else {},
+                "created_at": now,
+            }
+            for i in range(messages)
+        ],
+    }
+
+
+def measure(function: Callable[[], Any], number: int) -> float:
+    """Microseconds per call, best of three runs."""
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50, help="Messages per session")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    payload = session_payload(args.messages)
+    column = payload["business_context"]
+    stdlib_encoded = json.dumps(payload, default=str)
+    codec_encoded = json_codec.dumps(payload)
+
+    cases = [
+        ("encode session", lambda: json.dumps(payload, default=str), lambda: json_codec.dumps(payload)),
+        ("decode session", lambda: json.loads(stdlib_encoded), lambda: json_codec.loads(codec_encoded)),
+        ("encode column", lambda: json.dumps(column), lambda: json_codec.dumps_str(column)),
+        (
+            "cache key",
+            lambda: json.dumps(column, sort_keys=True).encode(),
+            lambda: json_codec.dumps(column, sort_keys=True),
+        ),
+    ]
+
+    backend = "orjson" if json_codec.ORJSON_AVAILABLE else "stdlib fallback"
+    print(f"session payload: {len(codec_encoded)} bytes, codec backend: {backend}")
+    print(f"{'operation':<18}{'stdlib µs':>12}{'codec µs':>12}{'speedup':>10}")
+    for name, stdlib_call, codec_call in cases:
+        stdlib_us = measure(stdlib_call, args.number)
+        codec_us = measure(codec_call, args.number)
+        print(f"{name:<18}{stdlib_us:>12.1f}{codec_us:>12.1f}{stdlib_us / codec_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
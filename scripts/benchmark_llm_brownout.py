@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark chat responses under an LLM provider brownout.
+
+Runs concurrent AIService.generate_response calls against the
+fault-injecting fake LLM and reports latency percentiles and how many
+turns were answered from fallback templates, with the resilience features
+(deadlines, circuit breaker, hedging) tuned per scenario.
+
+Usage:
+    python scripts/benchmark_llm_brownout.py [--calls 200] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import settings
+from src.services.ai_service import AIService
+from src.services.fake_llm import FaultInjectingLLM
+from src.services.llm_resilience import CircuitBreaker
+from src.services.llm_scheduler import LLMScheduler
+
+SCENARIOS = [
+    # name, failure rate, stall rate, hedge delay, breaker threshold
+    ("healthy", 0.0, 0.0, None, 5),
+    ("brownout, no breaker", 0.3, 0.2, None, 10**9),
+    ("brownout, breaker", 0.3, 0.2, None, 5),
+    ("slow tail, hedged", 0.0, 0.1, 0.3, 5),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+async def run_scenario(
+    failure_rate: float,
+    stall_rate: float,
+    hedge_delay: float | None,
+    breaker_threshold: int,
+    calls: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """Run one scenario and return its latency and fallback statistics."""
+    service = AIService()
+    service.llm = FaultInjectingLLM(  # type: ignore[assignment]
+        first_token_latency=0.1, failure_rate=failure_rate, stall_rate=stall_rate, seed=42,
+    )
+    service.circuit_breaker = CircuitBreaker(
+        failure_threshold=breaker_threshold, recovery_timeout=0.5
+    )
+    settings.llm_hedge_delay_seconds = hedge_delay
+
+    context = {"client_info": {}, "business_context": {}, "qualification": {}}
+    fallback = service._fallback_response("Hello", context)
+    limit = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    fallbacks = 0
+
+    async def call() -> None:
+        nonlocal fallbacks
+        async with limit:
+            started = time.perf_counter()
+            response = await service.generate_response("Hello", [], context)
+            latencies.append(time.perf_counter() - started)
+            fallbacks += response == fallback
+
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return {
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "fallback_rate": fallbacks / calls,
+        "llm_calls": service.llm.calls,  # type: ignore[union-attr]
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-call deadline (s)")
+    args = parser.parse_args()
+
+    settings.llm_timeout_seconds = args.timeout
+    settings.llm_first_token_timeout_seconds = args.timeout
+    import src.services.ai_service as ai_service_module
+    ai_service_module.llm_scheduler = LLMScheduler(
+        max_concurrency=args.concurrency * 2, max_queue_depth=args.calls, max_queue_wait=60
+    )
+
+    print(f"{'scenario':<24}{'p50':>8}{'p95':>8}{'p99':>8}{'fallback':>10}{'LLM calls':>11}")
+    for name, failure_rate, stall_rate, hedge_delay, threshold in SCENARIOS:
+        stats = await run_scenario(
+            failure_rate, stall_rate, hedge_delay, threshold, args.calls, args.concurrency
+        )
+        print(
+            f"{name:<24}{stats['p50']:>7.2f}s{stats['p95']:>7.2f}s{stats['p99']:>7.2f}s"
+            f"{stats['fallback_rate']:>9.0%}{stats['llm_calls']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent chat-turn writes on SQLite.
+
+Runs many concurrent conversations, each committing a user and an
+assistant message per turn and touching its session row, against a fresh
+database file with the default engine and with the production profile
+(WAL, tuned pragmas, read pool and batching single writer). Reports turn
+throughput, commit latency percentiles, "database is locked" errors and
+the number of write transactions.
+
+Usage:
+    python scripts/benchmark_sqlite_concurrency.py [--sessions 50] [--turns 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.database import Base
+from src.core.sqlite import create_sqlite_engines, queued_write_sessionmaker
+from src.models.session import ConversationSession, Message, MessageRole
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+async def run_profile(
+    session_factory: async_sessionmaker, engines: list[AsyncEngine], sessions: int, turns: int
+) -> dict[str, float]:
+    """Run the conversations and return throughput, latency and error statistics."""
+    async with engines[0].begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    latencies: list[float] = []
+    locked = 0
+
+    async def conversation() -> None:
+        nonlocal locked
+        session_id = uuid.uuid4()
+        async with session_factory() as db:
+            try:
+                db.add(ConversationSession(id=session_id, visitor_id=str(session_id)))
+                await db.commit()
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                # The conversation never started
+                locked += 1
+                return
+        for turn in range(turns):
+            async with session_factory() as db:
+                started = time.perf_counter()
+                try:
+                    conversation_session = await db.scalar(
+                        select(ConversationSession).where(ConversationSession.id == session_id)
+                    )
+                    if conversation_session is None:
+                        raise RuntimeError(f"Session {session_id} not found")
+                    db.add(Message(session_id=session_id, role=MessageRole.USER, content=f"Question {turn}"))
+                    db.add(Message(session_id=session_id, role=MessageRole.ASSISTANT, content=f"Answer {turn}"))
+                    conversation_session.last_activity = datetime.utcnow()
+                    await db.commit()
+                    latencies.append(time.perf_counter() - started)
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    locked += 1
+                    await db.rollback()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(conversation() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    for engine in engines:
+        await engine.dispose()
+
+    write_queue = session_factory.kw.get("write_queue")
+    return {
+        "transactions": write_queue.commits if write_queue else sessions + len(latencies),
+        "turns_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5) if latencies else 0.0,
+        "p95": percentile(latencies, 0.95) if latencies else 0.0,
+        "locked": locked,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent conversations")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per conversation")
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'turns/s':>10}{'p50':>10}{'p95':>10}{'locked':>8}{'transactions':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        default_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'default.db')}"
+        engine = create_async_engine(default_url, connect_args={"check_same_thread": False})
+        default_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        writer, reader = create_sqlite_engines(f"sqlite+aiosqlite:///{os.path.join(tmp, 'production.db')}")
+        production_factory = queued_write_sessionmaker(writer, reader, expire_on_commit=False)
+
+        for name, factory, engines in (
+            ("default", default_factory, [engine]),
+            ("production", production_factory, [writer, reader]),
+        ):
+            stats = await run_profile(factory, engines, args.sessions, args.turns)
+            print(
+                f"{name:<12}{stats['turns_per_second']:>10.0f}{stats['p50'] * 1000:>8.1f}ms"
+                f"{stats['p95'] * 1000:>8.1f}ms{stats['locked']:>8}{stats['transactions']:>14}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,7 +4,7 @@ from typing import Annotated, Any
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 
 # User type for authentication (stub - no auth in current implementation)
 User = Any
@@ -39,5 +39,6 @@ async def get_current_admin() -> User:
 
 # Type aliases for dependency injection
 DBSession = Annotated[AsyncSession, Depends(get_db)]
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]
 SessionId = Annotated[str, Depends(require_session_id)]
 OptionalSessionId = Annotated[str | None, Depends(get_session_id)]
@@ -0,0 +1,13 @@
+"""Response classes for API routes."""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from src.utils import json_codec
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with the fast JSON codec (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
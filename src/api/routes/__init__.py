@@ -15,7 +15,12 @@ from src.api.routes.uploads import router as uploads_router
 from src.core.config import settings
 from src.core.database import AsyncSessionLocal
 from src.core.security import require_admin_auth
-from src.services.cache_service import CACHE_PREFIXES, cache_service
+from src.services.cache_service import (
+    CACHE_PREFIXES,
+    NAMESPACES,
+    cache_service,
+    invalidate_namespace,
+)
 
 # Create main router
 router = APIRouter(prefix="/api/v1")
@@ -95,12 +100,13 @@ async def health_check():
 async def cache_status(admin_data: dict = Depends(require_admin_auth)):
     """Get cache status and statistics."""
     try:
-        # Test Redis connection
+        # Connect if not connected yet (reconnection is automatic afterwards)
         await cache_service.connect()
 
         # Get cache statistics
         stats: dict[str, object] = {
             "status": "healthy",
+            "connection": cache_service.get_connection_stats(),
             "prefixes": CACHE_PREFIXES,
             "total_keys": 0,
             "key_counts": {}
@@ -129,6 +135,15 @@ async def clear_cache_prefix(
             detail=f"Invalid prefix. Valid prefixes: {list(CACHE_PREFIXES.keys())}"
         )
 
+    if prefix in NAMESPACES:
+        # Versioned prefix: one increment instead of deleting every key
+        generation = await invalidate_namespace(prefix)
+        return {
+            "message": "Invalidated all cache entries",
+            "prefix": prefix,
+            "generation": generation
+        }
+
     pattern = f"{CACHE_PREFIXES[prefix]}*"
     deleted = await cache_service.delete_pattern(pattern)
 
@@ -6,7 +6,7 @@ import uuid
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_db
+from src.api.dependencies import get_db, get_read_db
 from src.core.security import require_admin_auth
 from src.schemas.expert import ExpertCreate, ExpertResponse, ExpertUpdate
 from src.services.analytics_service import AnalyticsService
@@ -40,7 +40,7 @@ async def verify_admin_access(
 @router.get("/experts", response_model=list[ExpertResponse])
 async def list_all_experts(
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> list[ExpertResponse]:
     """List all experts for admin management (requires authentication).
 
@@ -132,7 +132,7 @@ async def delete_expert_admin(
 @router.get("/analytics")
 async def get_admin_analytics(
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get system analytics and metrics for admins (requires authentication).
 
@@ -161,6 +161,9 @@ async def get_admin_analytics(
         # Get booking analytics
         booking_analytics = await analytics_service.get_booking_analytics(days_back=30)
 
+        # Get LLM usage analytics
+        llm_usage = await analytics_service.get_llm_usage_analytics(days_back=30)
+
         # Get system health
         system_health = await analytics_service.get_system_health()
 
@@ -174,6 +177,7 @@ async def get_admin_analytics(
             "conversations": conversation_analytics,
             "experts_performance": expert_analytics,
             "bookings": booking_analytics,
+            "llm_usage": llm_usage,
             "system_health": system_health,
             "api": {
                 "version": "1.0.0",
@@ -197,7 +201,7 @@ async def get_admin_analytics(
 async def get_conversation_analytics(
     days_back: int = 30,
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get detailed conversation analytics (requires authentication).
 
@@ -223,7 +227,7 @@ async def get_conversation_analytics(
 async def get_expert_analytics(
     days_back: int = 30,
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get expert performance analytics (requires authentication).
 
@@ -249,7 +253,7 @@ async def get_expert_analytics(
 async def get_booking_analytics(
     days_back: int = 30,
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get booking performance analytics (requires authentication).
 
@@ -271,10 +275,65 @@ async def get_booking_analytics(
         ) from e
 
 
+@router.get("/analytics/llm-usage")
+async def get_llm_usage_analytics(
+    days_back: int = 30,
+    top_sessions: int = 10,
+    admin_data: dict = Depends(verify_admin_access),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get LLM token and latency usage analytics (requires authentication).
+
+    Args:
+        days_back: Number of days to look back (default: 30)
+        top_sessions: Number of most expensive sessions to list (default: 10)
+        admin_data: Admin authentication data
+
+    Returns:
+        Usage totals, per-phase and per-day rollups, and top sessions by tokens
+    """
+    try:
+        analytics_service = AnalyticsService(db)
+        analytics = await analytics_service.get_llm_usage_analytics(
+            days_back=days_back, top_sessions=top_sessions
+        )
+        return analytics
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch LLM usage analytics: {str(e)}"
+        ) from e
+
+
+@router.get("/analytics/llm-usage/sessions/{session_id}")
+async def get_session_llm_usage(
+    session_id: uuid.UUID,
+    admin_data: dict = Depends(verify_admin_access),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get LLM token and latency usage of one session (requires authentication).
+
+    Args:
+        session_id: The session ID
+        admin_data: Admin authentication data
+
+    Returns:
+        The session's usage totals and per-phase usage
+    """
+    try:
+        analytics_service = AnalyticsService(db)
+        return await analytics_service.get_session_llm_usage(session_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch session LLM usage: {str(e)}"
+        ) from e
+
+
 @router.get("/analytics/health")
 async def get_system_health(
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get system health and performance status (requires authentication).
 
@@ -451,7 +510,7 @@ async def cleanup_orphaned_data(
 @router.get("/cleanup/stats")
 async def get_cleanup_stats(
     admin_data: dict = Depends(verify_admin_access),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get cleanup statistics and session lifecycle metrics.
 
@@ -4,7 +4,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.schemas.booking import AvailabilityResponse
 from src.schemas.expert import (
     ExpertCreate,
@@ -29,7 +29,7 @@ router = APIRouter()
     description="Get a list of all active expert profiles",
 )
 async def list_experts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[ExpertPublicResponse]:
     """List all active experts.
 
@@ -63,7 +63,7 @@ async def list_experts(
 )
 async def get_expert(
     expert_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ExpertPublicResponse:
     """Get an expert profile by ID.
 
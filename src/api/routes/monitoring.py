@@ -5,8 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_db
+from src.core.config import settings
 from src.schemas.monitoring import SystemMetricsResponse, HealthStatusResponse, EndpointMetricsResponse
+from src.services.llm_resilience import llm_circuit_breaker
+from src.services.llm_scheduler import llm_scheduler
+from src.services.cache_service import cache_service, get_session_cache_memory_report
 from src.services.monitoring_service import MonitoringService, get_monitoring_service
+from src.utils import cache_codec
 
 router = APIRouter()
 
@@ -42,7 +47,10 @@ async def get_system_metrics(
                     "prd_generated": metrics.prd_generated,
                     "bookings_created": metrics.bookings_created,
                     "expert_matches": metrics.expert_matches,
-                }
+                },
+                "chat_metrics": monitoring_service.get_chat_turn_metrics(),
+                "llm_scheduler": llm_scheduler.get_metrics(),
+                "llm_circuit_breaker": llm_circuit_breaker.get_metrics(),
             }
         )
     except Exception as e:
@@ -64,6 +72,27 @@ async def get_endpoint_metrics(
         raise HTTPException(status_code=500, detail=f"Failed to get endpoint metrics: {str(e)}")
 
 
+@router.get("/metrics/cache", response_model=SystemMetricsResponse, tags=["monitoring"])
+async def get_cache_metrics():
+    """Get the cache backend, hit ratios per tier, memory used by cached sessions and the encoding."""
+    try:
+        return SystemMetricsResponse(
+            success=True,
+            data={
+                "connection": cache_service.get_connection_stats(),
+                "tiers": cache_service.get_tier_stats(),
+                "sessions": await get_session_cache_memory_report(),
+                "encoding": {
+                    "serializer": "msgpack" if cache_codec.ORMSGPACK_AVAILABLE or cache_codec.MSGPACK_AVAILABLE else "json",
+                    "compression": settings.cache_compression,
+                    "compression_min_bytes": settings.cache_compression_min_bytes,
+                },
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get cache metrics: {str(e)}") from e
+
+
 @router.get("/health", response_model=HealthStatusResponse, tags=["monitoring"])
 async def get_health_status(
     monitoring_service: MonitoringService = Depends(get_monitoring_service),
@@ -1,19 +1,28 @@
 """PRD (Project Requirements Document) API routes."""
+import base64
 import uuid
-from io import BytesIO
+from email.utils import parsedate_to_datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
+from src.models.prd import make_preview_text
 from src.schemas.prd import (
     ConversationSummaryApproveRequest,
     ConversationSummaryResponse,
     PRDCreate,
+    PRDJobResponse,
     PRDPreview,
     PRDRegenerateRequest,
     PRDResponse,
+    PRDVersionSummary,
+)
+from src.services.prd_job_service import (
+    PRDJob,
+    PRDJobStatus,
+    prd_job_manager,
+    session_factory_for,
 )
 from src.services.prd_service import PRDService
 from src.services.session_service import SessionService
@@ -21,6 +30,81 @@ from src.services.session_service import SessionService
 router = APIRouter()
 
 
+def _job_response(job: PRDJob) -> PRDJobResponse:
+    """Convert a PRD job to its API response."""
+    return PRDJobResponse(
+        job_id=job.id,
+        session_id=job.session_id,
+        status=job.status.value,
+        stage=job.stage,
+        progress=job.progress,
+        prd_id=job.prd_id,
+        error=job.error,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+    )
+
+
+@router.post(
+    "/jobs",
+    response_model=PRDJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start PRD generation job",
+    description="Start PRD generation in the background; progress streams over Socket.IO",
+)
+async def start_prd_job(
+    request: PRDCreate,
+    db: AsyncSession = Depends(get_db),
+) -> PRDJobResponse:
+    """Start a background PRD generation job for a session.
+
+    Returns immediately with a job ID. Progress and partial Markdown are
+    streamed to the session room as `prd_progress` events, followed by
+    `prd_generated` (or `prd_failed`). Repeated requests for the same
+    session return the job that is already running.
+    """
+    session_service = SessionService(db)
+
+    session = await session_service.get_session(request.session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {request.session_id} not found",
+        )
+
+    if not session.client_info.get("name"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Client name is required for PRD generation",
+        )
+
+    if not session.business_context.get("challenges"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Business challenges are required for PRD generation",
+        )
+
+    job = prd_job_manager.submit(session.id, session_factory=session_factory_for(db))
+    return _job_response(job)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=PRDJobResponse,
+    summary="Get PRD generation job",
+    description="Get the status and progress of a background PRD generation job",
+)
+async def get_prd_job(job_id: str) -> PRDJobResponse:
+    """Get a PRD generation job by ID."""
+    job = prd_job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"PRD job {job_id} not found",
+        )
+    return _job_response(job)
+
+
 @router.post(
     "/generate",
     response_model=PRDResponse,
@@ -62,8 +146,16 @@ async def generate_prd(
             detail="Business challenges are required for PRD generation",
         )
 
-    # Generate PRD
-    prd = await prd_service.generate_prd(session)
+    # Generate PRD, joining any job already running for this session
+    job = prd_job_manager.submit(session.id, session_factory=session_factory_for(db))
+    await prd_job_manager.wait(job)
+
+    prd = await prd_service.get_prd(job.prd_id) if job.prd_id else None
+    if job.status != PRDJobStatus.COMPLETED or not prd:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate PRD",
+        )
 
     return PRDResponse(
         id=prd.id,
@@ -90,7 +182,7 @@ async def generate_prd(
 )
 async def get_prd(
     prd_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> PRDResponse:
     """Get a PRD document by ID."""
     prd_service = PRDService(db)
@@ -113,7 +205,7 @@ async def get_prd(
         recommended_service=prd.recommended_service,
         matched_expert=prd.matched_expert,
         storage_url=prd.storage_url,
-        download_count=prd.download_count,
+        download_count=await prd_service.get_download_count(prd),
         created_at=prd.created_at,
         expires_at=prd.expires_at,
     )
@@ -127,7 +219,7 @@ async def get_prd(
 )
 async def get_prd_by_session(
     session_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> PRDResponse:
     """Get a PRD document by session ID."""
     prd_service = PRDService(db)
@@ -150,12 +242,39 @@ async def get_prd_by_session(
         recommended_service=prd.recommended_service,
         matched_expert=prd.matched_expert,
         storage_url=prd.storage_url,
-        download_count=prd.download_count,
+        download_count=await prd_service.get_download_count(prd),
         created_at=prd.created_at,
         expires_at=prd.expires_at,
     )
 
 
+@router.get(
+    "/session/{session_id}/versions",
+    response_model=list[PRDVersionSummary],
+    summary="List PRD versions",
+    description="List all PRD versions of a session (metadata only)",
+)
+async def list_prd_versions(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+) -> list[PRDVersionSummary]:
+    """List PRD version history for a session without loading content."""
+    prd_service = PRDService(db)
+    versions = await prd_service.list_versions(session_id)
+
+    return [
+        PRDVersionSummary(
+            id=prd.id,
+            version=prd.version,
+            preview_text=prd.preview_text or "",
+            content_length=prd.content_length or 0,
+            download_count=await prd_service.get_download_count(prd),
+            created_at=prd.created_at,
+        )
+        for prd in versions
+    ]
+
+
 @router.get(
     "/{prd_id}/preview",
     response_model=PRDPreview,
@@ -164,11 +283,11 @@ async def get_prd_by_session(
 )
 async def get_prd_preview(
     prd_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> PRDPreview:
     """Get a PRD preview for chat display."""
     prd_service = PRDService(db)
-    prd = await prd_service.get_prd(prd_id)
+    prd = await prd_service.get_prd_metadata(prd_id)
 
     if not prd:
         raise HTTPException(
@@ -177,8 +296,11 @@ async def get_prd_preview(
         )
 
     filename = prd_service.generate_filename(prd)
-    # Truncate to 197 chars + "..." to meet max_length=200 validation
-    preview_text = prd.content_markdown[:197] + "..." if len(prd.content_markdown) > 197 else prd.content_markdown
+    preview_text = prd.preview_text
+    if preview_text is None:
+        # Rows created before preview metadata existed
+        full_prd = await prd_service.get_prd(prd_id)
+        preview_text = make_preview_text(full_prd.content_markdown if full_prd else "")
 
     return PRDPreview(
         id=prd.id,
@@ -189,43 +311,161 @@ async def get_prd_preview(
     )
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    """Check an If-Modified-Since header against a Last-Modified date."""
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single `bytes=` range.
+
+    Returns:
+        Inclusive (start, end) offsets, or None if the range is unsatisfiable
+
+    Raises:
+        ValueError: If the header is malformed or requests multiple ranges
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {range_header}")
+
+    start_text, _, end_text = spec.strip().partition("-")
+    if not start_text:
+        # Suffix range: the last N bytes
+        suffix = int(end_text)
+        if suffix <= 0:
+            return None
+        return max(0, size - suffix), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if end_text and start > end:
+        raise ValueError(f"Invalid range: {range_header}")
+    if start >= size:
+        return None
+    return start, min(end, size - 1)
+
+
+def _select_encoding(accept_encoding: str, available: set[str]) -> str:
+    """Pick the preferred content coding the client accepts."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
 @router.get(
     "/{prd_id}/download",
     summary="Download PRD",
-    description="Download PRD as a Markdown file",
+    description="Download PRD as a Markdown file (supports ETag, compression and ranges)",
 )
 async def download_prd(
     prd_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-) -> StreamingResponse:
-    """Download PRD as a Markdown file."""
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Download PRD as a Markdown file.
+
+    The prepared download (content-hash ETag and gzip/brotli variants) is
+    cached per PRD, so repeat downloads do not touch the database.
+    Conditional requests get 304 Not Modified, single byte ranges get
+    206 Partial Content, and download counts are buffered in the cache.
+    """
     prd_service = PRDService(db)
-    prd = await prd_service.get_prd(prd_id)
+    download = await prd_service.get_download(prd_id)
 
-    if not prd:
+    if not download:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"PRD {prd_id} not found",
         )
 
-    # Increment download count
-    await prd_service.increment_download_count(prd)
-
-    # Generate filename
-    filename = prd_service.generate_filename(prd)
-
-    # Create file content
-    content = prd.content_markdown.encode("utf-8")
-    file_like = BytesIO(content)
-
-    # Return as streaming response
+    filename = download["filename"]
     headers = {
         "Content-Disposition": f'attachment; filename="{filename}"',
-        "Content-Type": "text/markdown; charset=utf-8",
+        "ETag": download["etag"],
+        "Last-Modified": download["last_modified"],
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
     }
 
-    return StreamingResponse(
-        file_like,
+    # Conditional GET
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if (if_none_match and _etag_matches(if_none_match, download["etag"])) or (
+        not if_none_match
+        and if_modified_since
+        and _not_modified_since(if_modified_since, download["last_modified"])
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Range request (served from the identity representation)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == download["etag"]):
+        content = base64.b64decode(download["variants"]["identity"])
+        try:
+            byte_range = _parse_range(range_header, len(content))
+        except ValueError:
+            # Malformed or multi-range requests get the full document
+            pass
+        else:
+            if byte_range is None:
+                headers["Content-Range"] = f"bytes */{len(content)}"
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers=headers,
+                )
+
+            start, end = byte_range
+            # Count a download once, on the request for its first byte
+            if start == 0:
+                await prd_service.record_download(prd_id)
+
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            return Response(
+                content=content[start:end + 1],
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type="text/markdown",
+                headers=headers,
+            )
+
+    # Full download, precompressed if the client accepts it
+    encoding = _select_encoding(
+        request.headers.get("accept-encoding", ""), set(download["variants"])
+    )
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    await prd_service.record_download(prd_id)
+
+    return Response(
+        content=base64.b64decode(download["variants"][encoding]),
         media_type="text/markdown",
         headers=headers,
     )
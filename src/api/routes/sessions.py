@@ -2,7 +2,8 @@
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
@@ -19,7 +20,10 @@ from src.schemas.session import (
     UnsubscribeRequest,
 )
 from src.services.expert_service import ExpertService
+from src.services.prd_job_service import session_factory_for
 from src.services.session_service import SessionService
+from src.services.sse_service import chat_turn_event_stream
+from src.services.turn_service import turn_coordinator
 
 router = APIRouter()
 
@@ -163,17 +167,86 @@ async def send_message(
     session_id: str,
     message_create: MessageCreate,
     db: AsyncSession = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ) -> MessageResponse:
     """Send a message to a session.
 
     Add a user message to the conversation session and return the user message.
     The AI response will be sent via WebSocket for real-time streaming.
+
+    Messages to one session are processed one at a time. A retried request
+    with the same `Idempotency-Key` header returns the original message
+    instead of adding it again; requests without the header are never
+    deduplicated.
+    """
+    # Validate session_id and convert to UUID
+    session_uuid = validate_session_id(session_id)
+
+    async def process_turn() -> dict:
+        service = SessionService(db)
+        # Skip cache to ensure we have a fresh, attached session object
+        session = await service.get_session(session_uuid, skip_cache=True)
+
+        if not session:
+            raise NotFoundError("Session", session_id)
+
+        # Check if session is active (handle both string and enum)
+        status_value = session.status.value if hasattr(session.status, 'value') else session.status
+        if status_value != "active":
+            raise BadRequestError(f"Cannot send message to {status_value} session")
+
+        # Add user message
+        user_message = await service.add_message(
+            session_uuid, message_create, MessageRole.USER
+        )
+
+        # Update session activity
+        await service.update_session_activity(session)
+
+        # Generate AI response (will be sent via WebSocket in production)
+        # For now, we generate it but return the user message
+        await service.generate_ai_response(session, message_create.content)
+
+        return MessageResponse(
+            id=user_message.id,
+            session_id=user_message.session_id,
+            role=user_message.role,
+            content=user_message.content,
+            meta_data=user_message.meta_data,
+            created_at=user_message.created_at,
+        ).model_dump(mode="json")
+
+    result, _ = await turn_coordinator.run_turn(
+        str(session_uuid), process_turn, idempotency_key=idempotency_key,
+    )
+    return MessageResponse.model_validate(result)
+
+
+@router.post(
+    "/{session_id}/messages/stream",
+    summary="Send message and stream the response",
+    description="Send a user message and stream the AI response as Server-Sent Events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_message(
+    session_id: str,
+    message_create: MessageCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> StreamingResponse:
+    """Send a message to a session and stream the AI response.
+
+    Runs the same turn pipeline as the Socket.IO `send_message` event, for
+    clients that cannot use WebSockets. The response is a `text/event-stream`
+    of `chunk` events followed by a `message` (or `error`) event, with
+    heartbeat comments while idle. Disconnecting cancels the AI response.
     """
     # Validate session_id and convert to UUID
     session_uuid = validate_session_id(session_id)
 
     service = SessionService(db)
-    # Skip cache to ensure we have a fresh, attached session object
     session = await service.get_session(session_uuid, skip_cache=True)
 
     if not session:
@@ -184,25 +257,20 @@ async def send_message(
     if status_value != "active":
         raise BadRequestError(f"Cannot send message to {status_value} session")
 
-    # Add user message
-    user_message = await service.add_message(
-        session_uuid, message_create, MessageRole.USER
-    )
-
-    # Update session activity
-    await service.update_session_activity(session)
-
-    # Generate AI response (will be sent via WebSocket in production)
-    # For now, we generate it but return the user message
-    await service.generate_ai_response(session, message_create.content)
-
-    return MessageResponse(
-        id=user_message.id,
-        session_id=user_message.session_id,
-        role=user_message.role,
-        content=user_message.content,
-        meta_data=user_message.meta_data,
-        created_at=user_message.created_at,
+    return StreamingResponse(
+        chat_turn_event_stream(
+            request,
+            str(session_uuid),
+            message_create.content,
+            session_factory_for(db),
+            idempotency_key=idempotency_key,
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering (nginx) so events are delivered immediately
+            "X-Accel-Buffering": "no",
+        },
     )
 
 
@@ -3,38 +3,75 @@ import logging
 import uuid
 from typing import Any, cast
 
-from socketio import AsyncServer
+from socketio import AsyncManager, AsyncServer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
-from src.models.session import MessageRole
-from src.schemas.session import MessageCreate
+from src.services.chat_pipeline import ChatTurnPipeline
 from src.services.expert_service import ExpertService
-from src.services.prd_service import PRDService
+from src.services.prd_job_service import prd_job_manager, session_factory_for
 from src.services.session_service import SessionService
+from src.services.socketio_service import create_client_manager, presence_service
+from src.services.stream_buffer_service import stream_buffer
 
 logger = logging.getLogger(__name__)
 
+
+def create_sio_server(client_manager: AsyncManager | None = None) -> AsyncServer:
+    """Create a Socket.IO server.
+
+    With a pub/sub client manager (Redis), rooms and emits span all workers.
+    Polling transports need sticky sessions behind a load balancer; set
+    socketio_transports to "websocket" or socketio_sticky_cookie to support
+    that deployment.
+
+    Args:
+        client_manager: Client manager to use (defaults to the configured one)
+    """
+    return AsyncServer(
+        cors_allowed_origins=settings.allowed_origins.split(","),
+        async_mode="asgi",
+        client_manager=client_manager or create_client_manager(),
+        transports=[t.strip() for t in settings.socketio_transports.split(",")],
+        cookie=settings.socketio_sticky_cookie,
+        logger=True,
+        engineio_logger=False,
+    )
+
+
 # Socket.IO server
-sio = AsyncServer(
-    cors_allowed_origins=settings.allowed_origins.split(","),
-    async_mode="asgi",
-    logger=True,
-    engineio_logger=False,
-)
+sio = create_sio_server()
 
 
 class WebSocketManager:
-    """Manages WebSocket connections and event handling."""
+    """Manages WebSocket connections and event handling.
+
+    `active_connections` holds the connections of this worker (sid to
+    session ID); presence across all workers is kept in shared state.
+    """
 
     def __init__(self):
         self.active_connections: dict[str, Any] = {}
 
-    def disconnect(self, session_id: str) -> None:
+    async def connect(self, session_id: str, sid: str) -> None:
+        """Register a WebSocket connection for a session."""
+        self.active_connections[sid] = session_id
+        await presence_service.mark_connected(session_id, sid)
+
+    async def disconnect(self, session_id: str, sid: str | None = None) -> None:
         """Disconnect a WebSocket connection."""
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
-            logger.info(f"WebSocket disconnected for session {session_id}")
+        sids = [sid] if sid else [
+            s for s, connected_session in self.active_connections.items()
+            if connected_session == session_id
+        ]
+        for connection_sid in sids:
+            self.active_connections.pop(connection_sid, None)
+            await presence_service.mark_disconnected(session_id, connection_sid)
+        logger.info(f"WebSocket disconnected for session {session_id}")
+
+    async def is_online(self, session_id: str) -> bool:
+        """Check if a session has a connected client on any worker."""
+        return await presence_service.is_online(session_id)
 
 
 # Global manager instance
@@ -49,175 +86,96 @@ async def handle_streaming_chat_message(
     """Handle incoming chat message and generate AI response with streaming.
 
     This function sends streaming events for real-time response updates.
+    The LLM stream (AIService.stream_response) starts before the user
+    message is persisted; see ChatTurnPipeline.
     """
-    session_service = SessionService(db)
-
-    # Get the session
-    session = await session_service.get_session(uuid.UUID(session_id))
-    if not session:
-        raise ValueError(f"Session {session_id} not found")
-
-    # Add user message to database
-    user_message = await session_service.add_message(
-        uuid.UUID(session_id),
-        MessageCreate(content=content),  # type: ignore[call-arg]
-        MessageRole.USER
-    )
-
-    # Update session activity
-    await session_service.update_session_activity(session)
-
-    # Build conversation history
-    conversation_history = []
-    for msg in session.messages:
-        conversation_history.append({
-            "role": msg.role,
-            "content": msg.content,
-        })
-
-    # Extract user information from their response FIRST
-    # This updates session data which is used for context
-    await session_service._extract_user_info(session, content)
-
-    # Check for ambiguous response AFTER extracting info
-    ambiguity_check = await session_service._check_ambiguity(content, session)
-    if ambiguity_check["is_ambiguous"]:
-        # Generate clarification response instead of normal flow
-        clarification_response = session_service._generate_clarification_response(
-            ambiguity_check, content, session
-        )
-
-        # Create and save AI message with clarification
-        ai_message = await session_service.add_message(
-            uuid.UUID(session_id),
-            MessageCreate(
-                content=clarification_response,
-                meta_data={"type": "clarification", "ambiguous_reason": ambiguity_check["reason"]}
-            ),
-            MessageRole.ASSISTANT,
-        )
-
-        # Get updated session data
-        session = await session_service.get_session(uuid.UUID(session_id))
-        assert session is not None  # Session must exist
-
-        return {
-            "user_message": {
-                "id": str(user_message.id),
-                "role": "user",
-                "content": user_message.content,
-                "created_at": user_message.created_at.isoformat(),
-            },
-            "ai_message": {
-                "id": str(ai_message.id),
-                "role": "assistant",
-                "content": ai_message.content,
-                "created_at": ai_message.created_at.isoformat(),
-                "meta_data": ai_message.meta_data,
-            },
-            "session": {
-                "current_phase": session.current_phase,
-                "client_info": session.client_info,
-                "business_context": session.business_context,
-                "qualification": session.qualification,
-                "lead_score": session.lead_score,
-                "recommended_service": session.recommended_service,
-                "matched_expert_id": str(session.matched_expert_id) if session.matched_expert_id else None,
-                "prd_id": str(session.prd_id) if session.prd_id else None,
-            }
-        }
-
-    # Calculate lead score and recommend service after each message
-    await session_service._calculate_lead_score(session)
-    await session_service._recommend_service(session)
-
-    # Build context with updated session data
-    context = {
-        "business_context": session.business_context,
-        "client_info": session.client_info,
-        "qualification": session.qualification,
-        "current_phase": session.current_phase,
-    }
-
-    # Generate AI response using streaming
-    full_response = ""
-    message_id = None
-
-    # Send streaming response chunks
-    async for chunk in session_service.ai_service.stream_response(
-        content, conversation_history, context
-    ):
-        full_response += chunk
-
-        # Send streaming event for each chunk
-        from src.main import sio
+    async def emit_chunk(message_id: str, offset: int, chunk: str) -> None:
         await sio.emit("streaming_message", {
             "chunk": chunk,
             "is_complete": False,
+            "message_id": message_id,
+            "offset": offset,
+        }, room=session_id)
+
+    async def emit_complete(message_id: str) -> None:
+        await sio.emit("streaming_message", {
+            "chunk": "",
+            "is_complete": True,
             "message_id": message_id
         }, room=session_id)
 
-    # Create and save final AI message
-    ai_message = await session_service.add_message(
-        uuid.UUID(session_id),
-        MessageCreate(content=full_response),
-        MessageRole.ASSISTANT,
+    return await ChatTurnPipeline(db).run(
+        session_id, content, on_chunk=emit_chunk, on_complete=emit_complete
     )
 
-    # Update message_id for the final message
-    message_id = str(ai_message.id)
 
-    # Determine and update phase based on collected data
-    new_phase = await session_service._determine_next_phase(session)
-    if new_phase and new_phase != session.current_phase:
-        await session_service.update_session_phase(session, new_phase)
+async def handle_resume_stream(
+    sid: str,
+    session_id: str,
+    resume: dict[str, Any],
+) -> int:
+    """Replay buffered response chunks to a reconnected client.
+
+    A finished stream ends with an `is_complete` event; one that failed or
+    was cancelled also has `failed` set and is followed by an `error` event.
+
+    Args:
+        sid: The Socket.IO client to replay to
+        session_id: The session ID
+        resume: `offset` of the first chunk the client has not received and
+            optionally the `message_id` of the stream (defaults to the
+            latest stream of the session)
+
+    Returns:
+        The number of chunks replayed
+    """
+    message_id = resume.get("message_id") or await stream_buffer.get_latest_message_id(session_id)
+    if not message_id:
+        return 0
 
-    # Get updated session data
-    session = await session_service.get_session(uuid.UUID(session_id))
-    assert session is not None  # Session must exist
+    stream = await stream_buffer.read(message_id, int(resume.get("offset") or 0))
+    if stream is None:
+        return 0
 
-    # Send final streaming event
-    from src.main import sio
-    await sio.emit("streaming_message", {
-        "chunk": "",
-        "is_complete": True,
-        "message_id": message_id
-    }, room=session_id)
+    for offset, chunk in stream.chunks:
+        await sio.emit("streaming_message", {
+            "chunk": chunk,
+            "is_complete": False,
+            "message_id": message_id,
+            "offset": offset,
+            "resumed": True,
+        }, room=sid)
 
-    return {
-        "user_message": {
-            "id": str(user_message.id),
-            "role": "user",
-            "content": user_message.content,
-            "created_at": user_message.created_at.isoformat(),
-        },
-        "ai_message": {
-            "id": str(ai_message.id),
-            "role": "assistant",
-            "content": ai_message.content,
-            "created_at": ai_message.created_at.isoformat(),
-            "meta_data": ai_message.meta_data,
-        },
-        "session": {
-            "current_phase": session.current_phase,
-            "client_info": session.client_info,
-            "business_context": session.business_context,
-            "qualification": session.qualification,
-            "lead_score": session.lead_score,
-            "recommended_service": session.recommended_service,
-            "matched_expert_id": str(session.matched_expert_id) if session.matched_expert_id else None,
-            "prd_id": str(session.prd_id) if session.prd_id else None,
-        }
-    }
+    if stream.complete:
+        await sio.emit("streaming_message", {
+            "chunk": "",
+            "is_complete": True,
+            "failed": stream.failed,
+            "message_id": message_id,
+            "resumed": True,
+        }, room=sid)
+    if stream.failed:
+        await sio.emit("error", {
+            "message": "The response was interrupted before it finished.",
+            "can_retry": True,
+            "message_id": message_id,
+        }, room=sid)
+
+    logger.info(f"Resumed stream {message_id} for {sid} with {len(stream.chunks)} chunks")
+    return len(stream.chunks)
 
 
 async def handle_generate_prd(
     session_id: str,
     db: AsyncSession,
 ) -> dict[str, Any]:
-    """Handle PRD generation request."""
+    """Handle PRD generation request.
+
+    Starts a background PRD job (or joins the one already running for the
+    session) and returns its state immediately. Progress is streamed to the
+    session room as `prd_progress`, followed by `prd_generated` or `prd_failed`.
+    """
     session_service = SessionService(db)
-    prd_service = PRDService(db)
 
     # Get the session
     session = await session_service.get_session(uuid.UUID(session_id))
@@ -231,20 +189,9 @@ async def handle_generate_prd(
     if not session.business_context.get("challenges"):
         raise ValueError("Business challenges are required for PRD generation")
 
-    # Generate PRD
-    prd = await prd_service.generate_prd(session)
-
-    # Get preview
-    filename = prd_service.generate_filename(prd)
-    preview_text = prd.content_markdown[:197] + "..." if len(prd.content_markdown) > 197 else prd.content_markdown
-
-    return {
-        "prd_id": str(prd.id),
-        "filename": filename,
-        "preview_text": preview_text,
-        "version": prd.version,
-        "storage_url": prd.storage_url,
-    }
+    # Start (or join) background generation
+    job = prd_job_manager.submit(session.id, session_factory=session_factory_for(db))
+    return job.to_dict()
 
 
 async def handle_match_experts(
@@ -1,5 +1,5 @@
 # Core configuration and settings
 from src.core.config import settings
-from src.core.database import Base, engine, get_db
+from src.core.database import Base, engine, get_db, get_read_db
 
-__all__ = ["settings", "get_db", "engine", "Base"]
+__all__ = ["settings", "get_db", "get_read_db", "engine", "Base"]
@@ -13,6 +13,8 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = False
     environment: str = "development"
+    # "json" (structured, one object per line) or "text"
+    log_format: str = "json"
 
     # Server
     backend_port: int = 8000
@@ -21,9 +23,71 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./unobot.db"
+    # Read replica for read-only sessions (analytics, admin and lookups)
+    database_read_replica_url: str | None = None
+    # SQLite deployment profile: "default", or "production" for WAL mode,
+    # tuned pragmas, a query-only read pool and a single batching writer
+    sqlite_profile: str = "default"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+    sqlite_read_pool_size: int = 8
+    # Most sessions whose writes are committed in one transaction
+    sqlite_write_batch_size: int = 64
 
     # Redis
     redis_url: str = "redis://localhost:6379"
+    # Connection pool per client; commands time out after
+    # redis_socket_timeout_seconds so a hung Redis fails fast
+    redis_max_connections: int = 50
+    redis_socket_timeout_seconds: float = 2.0
+    # While Redis is down the cache runs in memory (degraded mode); Redis is
+    # pinged every redis_health_check_seconds while up and every
+    # redis_reconnect_seconds while down, and cache_breaker_failure_threshold
+    # consecutive connection errors switch to memory without waiting
+    redis_health_check_seconds: float = 15.0
+    redis_reconnect_seconds: float = 2.0
+    cache_breaker_failure_threshold: int = 3
+    # Keys written while degraded are dropped from Redis on recovery; past
+    # this many, whole key prefixes are dropped instead
+    cache_degraded_max_tracked_keys: int = 10000
+    # Compression of cached sessions: "zstd", "lz4" or "none", applied to
+    # values of at least cache_compression_min_bytes once serialized
+    cache_compression: str = "zstd"
+    cache_compression_min_bytes: int = 1024
+    # In-process L1 cache in front of Redis, invalidated across workers
+    # through pub/sub; short TTLs bound staleness if a message is missed
+    cache_l1_enabled: bool = True
+    cache_l1_max_entries: int = 2048
+    cache_l1_ttl_seconds: float = 5.0
+    cache_invalidation_channel: str = "unobot-cache-invalidation"
+    # Cache-aside loads (CacheService.get_or_load): how long unknown IDs are
+    # remembered, and how eagerly entries are refreshed before they expire
+    # (probabilistic early refresh; 0 disables it)
+    cache_negative_ttl_seconds: int = 30
+    cache_early_refresh_beta: float = 1.0
+
+    # Socket.IO scaling
+    # "local" (single process), "redis" (multi-worker) or "inprocess" (tests)
+    socketio_client_manager: str = "local"
+    socketio_channel: str = "unobot-socketio"
+    # Comma-separated transports; "websocket" alone avoids the need for
+    # sticky sessions behind a load balancer
+    socketio_transports: str = "polling,websocket"
+    # Cookie set on the handshake for load balancer session affinity
+    socketio_sticky_cookie: str | None = None
+    presence_ttl_seconds: int = 86400
+
+    # Chat turns: per-session lock and idempotent replay of retried messages
+    turn_lock_ttl_seconds: int = 120
+    turn_lock_timeout_seconds: float = 60.0
+    turn_idempotency_ttl_seconds: int = 3600
+
+    # Buffered response streams, resumable after a reconnect
+    stream_buffer_ttl_seconds: int = 300
+    stream_buffer_max_chunks: int = 4096
+    # Idle interval between heartbeat comments on Server-Sent Events streams
+    sse_heartbeat_seconds: float = 15.0
 
     # Security
     secret_key: str = "change-this-to-a-secure-random-string"
@@ -33,6 +97,24 @@ class Settings(BaseSettings):
     # Anthropic AI
     anthropic_api_key: str | None = None
     anthropic_model: str = "claude-sonnet-4-20250514"
+    ai_response_cache_ttl_seconds: int = 86400
+    # LLM admission control: concurrent calls, then a bounded priority queue;
+    # calls beyond these limits get template fallback responses
+    llm_max_concurrency: int = 8
+    llm_max_queue_depth: int = 32
+    llm_max_queue_wait_seconds: float = 10.0
+    # LLM resilience: deadlines, hedged requests (disabled unless a delay is
+    # set) and a circuit breaker that fails fast to fallback templates
+    llm_timeout_seconds: float = 30.0
+    llm_first_token_timeout_seconds: float = 10.0
+    llm_hedge_delay_seconds: float | None = None
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_recovery_seconds: float = 30.0
+    # "anthropic", or "fake" for the fault-injecting fake LLM (local brownout tests)
+    llm_backend: str = "anthropic"
+    fake_llm_latency_seconds: float = 0.5
+    fake_llm_failure_rate: float = 0.0
+    fake_llm_stall_rate: float = 0.0
 
     # Google Calendar
     google_client_id: str | None = None
@@ -57,12 +139,16 @@ class Settings(BaseSettings):
 
     # PRD settings
     prd_expiry_days: int = 90
+    prd_download_flush_interval_seconds: int = 60
 
     # Calendar settings
     booking_buffer_minutes: int = 15
     availability_days_ahead: int = 14
     min_slots_to_show: int = 5
 
+    # Expert workload settings
+    workload_reconcile_interval_seconds: int = 600
+
     model_config = SettingsConfigDict(
         extra="ignore",
     )
@@ -1,8 +1,16 @@
 """Database connection and session management."""
 import os
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import text
 
@@ -15,32 +23,75 @@ class Base(DeclarativeBase):
     pass
 
 
-# Determine if using SQLite (for development/testing)
-is_sqlite = settings.database_url.startswith("sqlite")
+class ReadOnlySession(AsyncSession):
+    """Session for pure reads; it never flushes or commits."""
 
-# Create async engine with appropriate settings
-if is_sqlite:
-    engine = create_async_engine(
-        settings.database_url,
-        echo=settings.debug,
-        connect_args={"check_same_thread": False},
-    )
-else:
+    async def flush(self, objects: Any = None) -> None:
+        raise InvalidRequestError("Read-only session cannot flush changes")
+
+    async def commit(self) -> None:
+        raise InvalidRequestError("Read-only session cannot commit")
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with settings for the database type."""
+    if url.startswith("sqlite"):
+        return create_async_engine(
+            url,
+            echo=settings.debug,
+            connect_args={"check_same_thread": False},
+        )
     # PostgreSQL settings
-    engine = create_async_engine(
-        settings.database_url,
+    return create_async_engine(
+        url,
         echo=settings.debug,
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
     )
 
+
+# Determine if using SQLite (for development/testing)
+is_sqlite = settings.database_url.startswith("sqlite")
+sqlite_production = is_sqlite and settings.sqlite_profile == "production"
+
+# Create async engine with appropriate settings
+if sqlite_production:
+    # WAL mode with one batching writer connection and a read pool
+    from src.core.sqlite import create_sqlite_engines, queued_write_sessionmaker
+
+    engine, sqlite_read_engine = create_sqlite_engines(settings.database_url)
+    read_engine = sqlite_read_engine
+else:
+    engine = _create_engine(settings.database_url)
+    read_engine = engine
+
+# Read-only sessions go to the replica when one is configured
+if settings.database_read_replica_url:
+    read_engine = _create_engine(settings.database_read_replica_url)
+
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
+AsyncSessionLocal: async_sessionmaker[AsyncSession]
+if sqlite_production:
+    AsyncSessionLocal = queued_write_sessionmaker(  # type: ignore[assignment]
+        engine,
+        sqlite_read_engine,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+else:
+    AsyncSessionLocal = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=ReadOnlySession,
     expire_on_commit=False,
-    autocommit=False,
     autoflush=False,
 )
 
@@ -58,9 +109,47 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a read-only database session.
+
+    The session reads from the replica when one is configured and is
+    closed without a commit.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def get_migration_head() -> str | None:
+    """Get the head revision of the Alembic migration scripts."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(settings.base_dir / "alembic.ini"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def _schema_is_current(conn: Connection) -> bool:
+    """Check that the database is migrated to head and has every model table."""
+    from alembic.runtime.migration import MigrationContext
+
+    if not set(Base.metadata.tables).issubset(inspect(conn).get_table_names()):
+        return False
+    try:
+        head = get_migration_head()
+    except Exception:
+        return False
+    return head is not None and MigrationContext.configure(conn).get_current_revision() == head
+
+
 async def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables.
+
+    Schema creation is skipped when the database is already migrated to
+    the latest revision, which keeps startup to a single inspection query.
+    """
     async with engine.begin() as conn:
+        if await conn.run_sync(_schema_is_current):
+            return
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -92,3 +92,25 @@ class ExternalServiceError(UnoBotError):
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             error_code="EXTERNAL_SERVICE_ERROR",
         )
+
+
+class LLMOverloadedError(UnoBotError):
+    """LLM request rejected because the concurrency budget is exhausted."""
+
+    def __init__(self, message: str = "AI service is at capacity"):
+        super().__init__(
+            message=message,
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            error_code="LLM_OVERLOADED",
+        )
+
+
+class LLMUnavailableError(UnoBotError):
+    """LLM request rejected because the provider circuit breaker is open."""
+
+    def __init__(self, message: str = "AI service is temporarily unavailable"):
+        super().__init__(
+            message=message,
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            error_code="LLM_UNAVAILABLE",
+        )
@@ -0,0 +1,131 @@
+"""Non-blocking, secure logging pipeline.
+
+Log calls only render the message and enqueue the record; a listener
+thread masks sensitive data, formats and writes it, so no file I/O or
+masking happens on the event loop thread.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any
+
+from src.core.security import mask_sensitive_data
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_exception_formatter = logging.Formatter()
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records with their message rendered but not yet formatted.
+
+    Unlike QueueHandler, the exception is kept on the record so its
+    traceback is formatted by the listener thread (the queue is in-process).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        return record
+
+
+class SecureQueueListener(QueueListener):
+    """Queue listener that masks sensitive data before handing records on.
+
+    Records no handler accepts are dropped before masking.
+    """
+
+    def handle(self, record: logging.LogRecord) -> None:
+        handlers = [handler for handler in self.handlers if record.levelno >= handler.level]
+        if not handlers:
+            return
+        record = self.prepare(record)
+        for handler in handlers:
+            handler.handle(record)
+
+    def stop(self) -> None:
+        # Safe to call more than once, e.g. explicitly and again at exit
+        if self._thread is not None:
+            super().stop()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.message = mask_sensitive_data(str(record.msg))
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if record.exc_text:
+            record.exc_text = mask_sensitive_data(record.exc_text)
+        return record
+
+
+def configure_logging(level: int, log_file: Path, log_format: str = "json") -> QueueListener:
+    """Route all logging through a queue to console and file handlers.
+
+    Args:
+        level: Minimum level to log
+        log_file: File receiving all logs
+        log_format: "json" for structured output or "text"
+
+    Returns:
+        The started listener; it is stopped (and the queue flushed) at exit
+    """
+    if log_format == "json":
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    handlers: list[logging.Handler] = [
+        # Console handler
+        logging.StreamHandler(),
+        # File handler for all logs
+        logging.FileHandler(log_file),
+    ]
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.setLevel(level)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = SecureQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -187,6 +187,23 @@ def validate_sql_input(text: str) -> bool:
     return True
 
 
+# Sensitive data patterns, combined into one precompiled regex. At each
+# position the alternatives are tried in order, so API keys are matched
+# before phone numbers could claim their digits.
+_SENSITIVE_DATA_PATTERNS = {
+    "EMAIL": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    # Anthropic-style keys (16+ chars after sk-), public keys, AWS access keys
+    "API_KEY": r'sk-[A-Za-z0-9]{16,}|pk-[A-Za-z0-9]{16,}|AKIA[A-Z0-9]{16}',
+    # Handles formats like 555-123-4567, (555) 123-4567, 555.123.4567
+    "PHONE": r'\b\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',
+    # Credit card numbers (basic)
+    "CC": r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b',
+}
+_SENSITIVE_DATA_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _SENSITIVE_DATA_PATTERNS.items())
+)
+
+
 def mask_sensitive_data(text: str) -> str:
     """
     Mask sensitive data in logs and responses.
@@ -200,29 +217,7 @@ def mask_sensitive_data(text: str) -> str:
     if not text:
         return ""
 
-    # Mask email addresses
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    text = re.sub(email_pattern, '[EMAIL_MASKED]', text)
-
-    # Mask API keys (common patterns) - BEFORE phone numbers to avoid conflicts
-    api_key_patterns = [
-        r'sk-[A-Za-z0-9]{16,}',  # Anthropic-style keys (16+ chars after sk-)
-        r'pk-[A-Za-z0-9]{16,}',  # Public keys
-        r'AKIA[A-Z0-9]{16}',     # AWS access keys
-    ]
-    for pattern in api_key_patterns:
-        text = re.sub(pattern, '[API_KEY_MASKED]', text)
-
-    # Mask phone numbers (handles formats like 555-123-4567, (555) 123-4567, 555.123.4567)
-    # Use word boundaries to avoid matching parts of longer strings
-    phone_pattern = r'\b\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
-    text = re.sub(phone_pattern, '[PHONE_MASKED]', text)
-
-    # Mask credit card numbers (basic)
-    cc_pattern = r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b'
-    text = re.sub(cc_pattern, '[CC_MASKED]', text)
-
-    return text
+    return _SENSITIVE_DATA_RE.sub(lambda match: f"[{match.lastgroup}_MASKED]", text)
 
 
 def sign_data(data: str, secret: str | None = None) -> str:
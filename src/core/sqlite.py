@@ -0,0 +1,327 @@
+"""SQLite production profile: tuned pragmas, a read pool and a single writer.
+
+SQLite allows one writer at a time. Rather than letting concurrent sessions
+race for the database lock ("database is locked"), every write goes through
+the one connection owned by SQLiteWriteQueue, which commits the writes of
+many sessions in a single transaction (group commit). Each session writes
+inside its own savepoint, so a failing session only loses its own changes.
+Reads use a separate pool of query-only connections, which WAL mode lets
+run alongside the writer.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Connection, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+
+
+def _pragmas(query_only: bool) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        # Negative sizes are in KiB
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _configure(engine: AsyncEngine, query_only: bool) -> None:
+    """Set pragmas on every new connection and take over transaction control."""
+    pragmas = _pragmas(query_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        # Disable the driver's implicit BEGIN so savepoints work and the
+        # writer can take the lock up front
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if not query_only:
+        @event.listens_for(engine.sync_engine, "begin")
+        def begin_immediate(conn: Connection) -> None:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """Create the single-connection writer engine and the read pool engine.
+
+    Args:
+        url: SQLite database URL (a file; in-memory databases are per connection)
+
+    Returns:
+        Tuple of (writer engine, read engine)
+    """
+    writer = create_async_engine(
+        url,
+        echo=settings.debug,
+        pool_size=1,
+        max_overflow=0,
+        connect_args={"check_same_thread": False},
+    )
+    reader = create_async_engine(
+        url,
+        echo=settings.debug,
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=0,
+        connect_args={"check_same_thread": False},
+    )
+    _configure(writer, query_only=False)
+    _configure(reader, query_only=True)
+    return writer, reader
+
+
+class SQLiteRoutingSession(Session):
+    """Session reading from the read pool and writing on a lent writer connection.
+
+    Once a session holds the writer connection, its reads use it too so
+    they see its own uncommitted writes.
+    """
+
+    writer_connection: Connection | None = None
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kw: Any) -> Any:
+        if self.writer_connection is not None:
+            return self.writer_connection
+        if self._flushing or (clause is not None and clause.is_dml):
+            raise InvalidRequestError("SQLite writes must go through the write queue")
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@dataclass(eq=False)
+class _WriteRequest:
+    """A session waiting for the writer connection."""
+
+    session: "QueuedWriteSession"
+    # Held from the first write until commit or rollback, instead of only
+    # for the duration of the commit
+    lease: bool
+    granted: asyncio.Future[None] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    released: asyncio.Future[bool] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    # Resolved once the writes are durably committed
+    done: asyncio.Future[None] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+def _resolve(future: asyncio.Future[Any], error: BaseException | None = None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class SQLiteWriteQueue:
+    """Single writer that group-commits the writes of many sessions.
+
+    Sessions are served in arrival order. A session committing pending
+    changes is flushed by the writer itself; a session that writes before
+    committing (an explicit flush or an UPDATE/DELETE statement) is lent
+    the connection until it commits or rolls back. Committed writes are
+    made durable with one COMMIT per batch, when the queue drains or
+    `max_batch` sessions have written, and before a connection is lent.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_batch: int = 64):
+        self.engine = engine
+        self.max_batch = max_batch
+        self._requests: asyncio.Queue[_WriteRequest] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.commits = 0
+
+    def _submit(self, request: _WriteRequest) -> None:
+        loop = asyncio.get_running_loop()
+        if self._requests is None or self._loop is not loop:
+            self._requests = asyncio.Queue()
+            self._loop = loop
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(self._requests))
+        self._requests.put_nowait(request)
+
+    async def commit(self, session: "QueuedWriteSession") -> None:
+        """Flush and commit a session's pending changes in the next batch."""
+        request = _WriteRequest(session, lease=False)
+        self._submit(request)
+        try:
+            await asyncio.shield(request.done)
+        except asyncio.CancelledError:
+            # Don't hand the session back while the writer may still use it
+            await asyncio.wait([request.done])
+            raise
+
+    async def lease(self, session: "QueuedWriteSession") -> _WriteRequest:
+        """Wait for the writer connection and lend it to a session."""
+        request = _WriteRequest(session, lease=True)
+        self._submit(request)
+        try:
+            await request.granted
+        except asyncio.CancelledError:
+            if request.granted.done() and not request.granted.cancelled():
+                await self.release(request, committed=False)
+            raise
+        return request
+
+    async def release(self, request: _WriteRequest, committed: bool) -> None:
+        """Return a lent connection, waiting for durability if committed."""
+        request.session.sync_session.writer_connection = None
+        if not request.released.done():
+            request.released.set_result(committed)
+        if committed:
+            await request.done
+
+    async def _run(self, requests: asyncio.Queue[_WriteRequest]) -> None:
+        while True:
+            request = await requests.get()
+            try:
+                async with self.engine.connect() as connection:
+                    await self._run_batches(connection, request, requests)
+            except Exception as e:
+                # Connection failure: fail the request, keep serving
+                _resolve(request.done, e)
+                _resolve(request.granted, e)
+
+    async def _run_batches(
+        self,
+        connection: AsyncConnection,
+        request: _WriteRequest | None,
+        requests: asyncio.Queue[_WriteRequest],
+    ) -> None:
+        written: list[_WriteRequest] = []
+        while request is not None:
+            if not connection.in_transaction():
+                await connection.begin()
+            if request.lease:
+                if request.granted.cancelled():
+                    request = None if requests.empty() else requests.get_nowait()
+                    continue
+                # Make earlier writes durable before a potentially long lease
+                if written:
+                    await self._commit(connection, written)
+                    written = []
+                    await connection.begin()
+                request.session.sync_session.writer_connection = connection.sync_connection
+                request.granted.set_result(None)
+                if await request.released:
+                    written.append(request)
+            else:
+                try:
+                    await request.session._commit_on(connection)
+                    written.append(request)
+                except Exception as e:
+                    _resolve(request.done, e)
+            if len(written) >= self.max_batch:
+                await self._commit(connection, written)
+                written = []
+            request = None if requests.empty() else requests.get_nowait()
+        if connection.in_transaction():
+            await self._commit(connection, written)
+
+    async def _commit(self, connection: AsyncConnection, written: list[_WriteRequest]) -> None:
+        try:
+            await connection.commit()
+        except Exception as e:
+            await connection.rollback()
+            for request in written:
+                _resolve(request.done, e)
+            return
+        self.commits += 1
+        for request in written:
+            _resolve(request.done)
+
+
+class QueuedWriteSession(AsyncSession):
+    """AsyncSession whose writes go through an SQLiteWriteQueue.
+
+    Commits return once the writes are durable. A task must not commit one
+    session while another of its sessions holds the writer connection.
+    """
+
+    sync_session_class = SQLiteRoutingSession
+    sync_session: SQLiteRoutingSession
+
+    def __init__(self, *args: Any, write_queue: SQLiteWriteQueue, **kw: Any):
+        super().__init__(*args, join_transaction_mode="create_savepoint", **kw)
+        self.write_queue = write_queue
+        self._lease: _WriteRequest | None = None
+
+    async def _acquire_writer(self) -> None:
+        if self._lease is None:
+            self._lease = await self.write_queue.lease(self)
+
+    async def _release_writer(self, committed: bool) -> None:
+        lease, self._lease = self._lease, None
+        if lease is not None:
+            await self.write_queue.release(lease, committed)
+
+    async def _commit_on(self, connection: AsyncConnection) -> None:
+        """Commit into a savepoint on the writer connection (called by the queue)."""
+        self.sync_session.writer_connection = connection.sync_connection
+        try:
+            await super().commit()
+        except Exception:
+            await super().rollback()
+            raise
+        finally:
+            self.sync_session.writer_connection = None
+
+    async def execute(self, statement: Any, *args: Any, **kw: Any) -> Any:
+        if statement.is_dml:
+            await self._acquire_writer()
+        return await super().execute(statement, *args, **kw)
+
+    async def scalar(self, statement: Any, *args: Any, **kw: Any) -> Any:
+        if statement.is_dml:
+            await self._acquire_writer()
+        return await super().scalar(statement, *args, **kw)
+
+    async def flush(self, objects: Any = None) -> None:
+        await self._acquire_writer()
+        await super().flush(objects)
+
+    async def commit(self) -> None:
+        if self._lease is not None:
+            await super().commit()
+            await self._release_writer(committed=True)
+        elif self.new or self.dirty or self.deleted:
+            await self.write_queue.commit(self)
+        else:
+            await super().commit()
+
+    async def rollback(self) -> None:
+        try:
+            await super().rollback()
+        finally:
+            await self._release_writer(committed=False)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            await self._release_writer(committed=False)
+
+
+def queued_write_sessionmaker(
+    writer: AsyncEngine, reader: AsyncEngine, **kw: Any
+) -> async_sessionmaker[QueuedWriteSession]:
+    """Build a session factory reading from `reader` and writing through `writer`."""
+    write_queue = SQLiteWriteQueue(writer, settings.sqlite_write_batch_size)
+    return async_sessionmaker(reader, class_=QueuedWriteSession, write_queue=write_queue, **kw)
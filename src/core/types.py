@@ -1,11 +1,16 @@
 """Custom SQLAlchemy types for database compatibility."""
-import json
 import uuid
 from typing import Any, cast
 
-from sqlalchemy import Text, TypeDecorator
+from sqlalchemy import Text, TypeDecorator, literal
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+from src.utils import json_codec
 
 
 class JSONType(TypeDecorator[Any]):
@@ -37,7 +42,7 @@ class JSONType(TypeDecorator[Any]):
             # For PostgreSQL, return as-is (JSONB handles it)
             return cast(str | dict[str, Any] | list[Any], value)
         # For SQLite, serialize to JSON string
-        return json.dumps(value) if isinstance(value, (dict, list)) else value
+        return json_codec.dumps_str(value) if isinstance(value, (dict, list)) else value
 
     def process_result_value(self, value: str | None, dialect: Dialect) -> str | dict[str, Any] | list[Any] | None:
         """Convert database value to Python object."""
@@ -48,15 +53,55 @@ class JSONType(TypeDecorator[Any]):
         # For SQLite, deserialize from JSON string
         try:
             if isinstance(value, str):
-                parsed = json.loads(value)
+                parsed = json_codec.loads(value)
                 if isinstance(parsed, (dict, list)):
                     return parsed
                 return value
             return value
-        except (json.JSONDecodeError, TypeError):
+        except (ValueError, TypeError):
             return value
 
 
+class json_merge(FunctionElement[Any]):
+    """Merge top-level keys into a JSON object column, like {**column, **patch}.
+
+    Used as an UPDATE value so only the patch is sent to the database:
+    PostgreSQL uses the JSONB `||` operator, SQLite uses json_set().
+    """
+
+    name = "json_merge"
+    inherit_cache = True
+
+    def __init__(self, column: ColumnElement[Any], patch: dict[str, Any]) -> None:
+        args: list[ColumnElement[Any]] = [column]
+        for key, value in patch.items():
+            args += [literal(key, Text), literal(json_codec.dumps_str(value), Text)]
+        super().__init__(*args)
+        self.type = column.type
+
+
+def _json_merge_args(
+    element: json_merge, compiler: SQLCompiler, **kw: Any
+) -> tuple[str, list[tuple[str, str]]]:
+    column, *pairs = [compiler.process(clause, **kw) for clause in element.clauses]
+    return column, list(zip(pairs[::2], pairs[1::2], strict=True))
+
+
+@compiles(json_merge, "postgresql")
+def _compile_json_merge_postgresql(element: json_merge, compiler: SQLCompiler, **kw: Any) -> str:
+    column, pairs = _json_merge_args(element, compiler, **kw)
+    patch = ", ".join(f"{key}, CAST({value} AS JSONB)" for key, value in pairs)
+    return f"COALESCE({column}, '{{}}'::jsonb) || jsonb_build_object({patch})"
+
+
+@compiles(json_merge, "sqlite")
+def _compile_json_merge_sqlite(element: json_merge, compiler: SQLCompiler, **kw: Any) -> str:
+    column, pairs = _json_merge_args(element, compiler, **kw)
+    # json() marks the value as JSON rather than a string to quote
+    patch = "".join(f", '$.\"' || {key} || '\"', json({value})" for key, value in pairs)
+    return f"json_set(COALESCE({column}, '{{}}'){patch})"
+
+
 class UUIDType(TypeDecorator[uuid.UUID]):
     """A type that handles UUID storage with SQLite/PostgreSQL compatibility.
 
@@ -26,6 +26,7 @@ except ImportError:
     def get_cache_service() -> Any:
         return cache_service  # type: ignore[return-value]
 
+from src.api.responses import FastJSONResponse
 from src.api.routes import router
 from src.api.routes.monitoring import router as monitoring_router
 from src.api.routes.websocket import (
@@ -33,6 +34,7 @@ from src.api.routes.websocket import (
     handle_generate_prd,
     handle_get_availability,
     handle_match_experts,
+    handle_resume_stream,
     handle_streaming_chat_message,
     manager,
     sio,
@@ -40,54 +42,28 @@ from src.api.routes.websocket import (
 from src.core.config import settings
 from src.core.database import AsyncSessionLocal, init_db
 from src.core.exception_handlers import register_exception_handlers
-from src.core.security import mask_sensitive_data, rate_limit_middleware
-
-
-class SecureLogFilter(logging.Filter):
-    """Filter to mask sensitive data in logs."""
-
-    def filter(self, record):
-        # Mask sensitive data in log messages
-        if hasattr(record, 'msg'):
-            record.msg = mask_sensitive_data(str(record.msg))
-        if hasattr(record, 'args'):
-            record.args = tuple(
-                mask_sensitive_data(str(arg)) if isinstance(arg, str) else arg
-                for arg in record.args
-            )
-        return True
-
-
-# Configure logging
+from src.core.logging_config import configure_logging
+from src.core.security import rate_limit_middleware
+from src.services.expert_service import run_workload_reconciliation
+from src.services.prd_job_service import prd_job_manager
+from src.services.prd_service import flush_prd_download_counts
+from src.services.scheduler_service import scheduler_service
+from src.services.turn_service import turn_coordinator
+
+# Configure logging: records are masked, formatted and written by a
+# background listener thread
 log_level = logging.DEBUG if settings.debug else logging.INFO
-log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 # Create logs directory if it doesn't exist
 settings.logs_dir.mkdir(parents=True, exist_ok=True)
 
-# Configure root logger
-logging.basicConfig(
-    level=log_level,
-    format=log_format,
-    handlers=[
-        # Console handler
-        logging.StreamHandler(),
-        # File handler for all logs
-        logging.FileHandler(settings.logs_dir / "backend.log"),
-    ]
-)
+configure_logging(log_level, settings.logs_dir / "backend.log", settings.log_format)
 
 # Reduce verbosity of third-party loggers
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
 logging.getLogger("aiosqlite").setLevel(logging.WARNING)
 
-# Add secure filter to all loggers
-secure_filter = SecureLogFilter()
-for name in logging.root.manager.loggerDict:
-    logger_instance = logging.getLogger(name)
-    logger_instance.addFilter(secure_filter)
-
 logger = logging.getLogger(__name__)
 
 # Log important events at startup
@@ -108,17 +84,41 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     if CACHE_AVAILABLE:
         try:
             await cache_service.connect()
-            logger.info("Redis cache service initialized")
+            if cache_service.use_redis:
+                logger.info("Redis cache service initialized")
         except Exception as e:
             logger.warning(f"Redis cache service not available: {e}")
     else:
         logger.warning("Redis cache service not installed")
 
+    # Start periodic background jobs
+    scheduler_service.register(
+        "expert_workload_reconciliation",
+        settings.workload_reconcile_interval_seconds,
+        run_workload_reconciliation,
+        run_on_start=True,
+    )
+    scheduler_service.register(
+        "prd_download_count_flush",
+        settings.prd_download_flush_interval_seconds,
+        flush_prd_download_counts,
+    )
+    await scheduler_service.start()
+    logger.info("Background scheduler started")
+
     yield
 
     # Shutdown
     logger.info("Shutting down UnoBot API...")
 
+    # Stop background jobs
+    await scheduler_service.stop()
+    await prd_job_manager.shutdown()
+    try:
+        await flush_prd_download_counts()
+    except Exception as e:
+        logger.warning(f"Could not flush PRD download counts: {e}")
+
     # Close cache service
     if CACHE_AVAILABLE:
         try:
@@ -164,6 +164,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -209,6 +210,7 @@ async def handle_connect(sid: str, environ: dict) -> None:
     if session_id:
         # Store session_id with connection
         await sio.save_session(sid, {"session_id": session_id})
+        await manager.connect(session_id, sid)
         logger.info(f"Socket.IO client {sid} connected for session {session_id}")
     else:
         logger.warning(f"Socket.IO client {sid} connected without session_id")
@@ -220,7 +222,7 @@ async def handle_disconnect(sid: str) -> None:
     session_data = await sio.get_session(sid)
     if session_data and "session_id" in session_data:
         session_id = session_data["session_id"]
-        manager.disconnect(session_id)
+        await manager.disconnect(session_id, sid)
         logger.info(f"Socket.IO client {sid} disconnected from session {session_id}")
 
 
@@ -237,15 +239,27 @@ async def handle_join_session(sid: str, data: dict) -> None:
 
     # Join the room
     await sio.enter_room(sid, session_id)
+    await manager.connect(session_id, sid)
 
     # Send connected event back to client
     await sio.emit("connected", {"session_id": session_id}, room=sid)
     logger.info(f"Client {sid} joined session {session_id}")
 
+    # Replay the part of an interrupted response stream the client missed
+    resume = data.get("resume")
+    if isinstance(resume, dict):
+        await handle_resume_stream(sid, session_id, resume)
 
-@sio.on("send_message")
-async def handle_socket_message(sid: str, data: dict) -> None:
-    """Handle incoming chat message via WebSocket."""
+
+async def _handle_chat_turn(sid: str, data: dict) -> None:
+    """Process a chat message once per turn and broadcast the result.
+
+    Turns are serialized per session. A message carrying a
+    `client_message_id` that was already processed or is still in flight
+    (a client retry) is answered with the original result to the sending
+    client only, without calling the LLM again. Messages without one are
+    never deduplicated.
+    """
     session_data = await sio.get_session(sid)
     session_id = session_data.get("session_id") if session_data else None
 
@@ -258,65 +272,87 @@ async def handle_socket_message(sid: str, data: dict) -> None:
         await sio.emit("error", {"message": "content required"}, room=sid)
         return
 
-    # Get database session
-    async with AsyncSessionLocal() as db:
-        try:
+    client_message_id = data.get("client_message_id")
+
+    async def process_turn() -> dict:
+        async with AsyncSessionLocal() as db:
             # Send typing indicator
             await sio.emit("typing_start", {"from": "bot"}, room=session_id)
-
-            # Handle the message
-            result = await handle_streaming_chat_message(session_id, content, db)
-
-            # Stop typing indicator
-            await sio.emit("typing_stop", {"from": "bot"}, room=session_id)
-
-            # Send the complete response
+            try:
+                return await handle_streaming_chat_message(session_id, content, db)
+            finally:
+                # Stop typing indicator
+                await sio.emit("typing_stop", {"from": "bot"}, room=session_id)
+
+    try:
+        result, duplicate = await turn_coordinator.run_turn(
+            session_id, process_turn, idempotency_key=client_message_id
+        )
+
+        if duplicate:
+            # The session room already received this turn
             await sio.emit("message", {
                 "user_message": result["user_message"],
                 "ai_message": result["ai_message"],
-            }, room=session_id)
+                "client_message_id": client_message_id,
+                "duplicate": True,
+            }, room=sid)
+            return
 
-            # Send phase change if applicable
-            if result["session"].get("current_phase"):
-                await sio.emit("phase_change", {
-                    "phase": result["session"]["current_phase"]
-                }, room=session_id)
-
-            # Check if PRD is ready to be generated
-            session = result["session"]
-            if (session.get("client_info", {}).get("name") and
-                session.get("business_context", {}).get("challenges") and
-                not session.get("prd_id")):
-                await sio.emit("prd_ready", {
-                    "message": "PRD can now be generated"
-                }, room=session_id)
+        # Send the complete response
+        await sio.emit("message", {
+            "user_message": result["user_message"],
+            "ai_message": result["ai_message"],
+            "client_message_id": client_message_id,
+        }, room=session_id)
+
+        # Send phase change if applicable
+        if result["session"].get("current_phase"):
+            await sio.emit("phase_change", {
+                "phase": result["session"]["current_phase"]
+            }, room=session_id)
 
-        except Exception as e:
-            logger.error(f"Error handling message: {e}")
-            # Enhanced error handling for network interruptions
-            error_message = str(e)
-
-            # Categorize error types and provide appropriate responses
-            if "network" in error_message.lower() or "connection" in error_message.lower():
-                error_message = "Network connection issue detected. Please check your internet connection and try again."
-                # Don't disconnect session, allow retry
-            elif "timeout" in error_message.lower():
-                error_message = "Request timed out. The AI is processing your request. Please wait a moment and try again."
-            elif "database" in error_message.lower():
-                error_message = "Temporary database issue. Your session is preserved and will be restored shortly."
-            else:
-                error_message = f"An unexpected error occurred: {error_message}"
-
-            # Send error to client with retry guidance
-            await sio.emit("error", {
-                "message": error_message,
-                "can_retry": True,
-                "retry_instructions": "Please try sending your message again in a few seconds.",
-                "session_preserved": True
+        # Check if PRD is ready to be generated
+        session = result["session"]
+        if (session.get("client_info", {}).get("name") and
+            session.get("business_context", {}).get("challenges") and
+            not session.get("prd_id")):
+            await sio.emit("prd_ready", {
+                "message": "PRD can now be generated"
             }, room=session_id)
 
-            # Log the error with session context
-            logger.error(f"Session {session_id}: {error_message}")
+    except Exception as e:
+        logger.error(f"Error handling message: {e}")
+        # Enhanced error handling for network interruptions
+        error_message = str(e)
+
+        # Categorize error types and provide appropriate responses
+        if "network" in error_message.lower() or "connection" in error_message.lower():
+            error_message = "Network connection issue detected. Please check your internet connection and try again."
+            # Don't disconnect session, allow retry
+        elif "timeout" in error_message.lower():
+            error_message = "Request timed out. The AI is processing your request. Please wait a moment and try again."
+        elif "database" in error_message.lower():
+            error_message = "Temporary database issue. Your session is preserved and will be restored shortly."
+        else:
+            error_message = f"An unexpected error occurred: {error_message}"
+
+        # Send error to client with retry guidance
+        await sio.emit("error", {
+            "message": error_message,
+            "can_retry": True,
+            "retry_instructions": "Please try sending your message again in a few seconds.",
+            "session_preserved": True
+        }, room=session_id)
+
+        # Log the error with session context
+        logger.error(f"Session {session_id}: {error_message}")
+
+
+@sio.on("send_message")
+async def handle_socket_message(sid: str, data: dict) -> None:
+    """Handle incoming chat message via WebSocket."""
+    await _handle_chat_turn(sid, data)
 
 
 @sio.on("generate_prd")
@@ -331,8 +367,8 @@ async def handle_socket_prd(sid: str, data: dict) -> None:
 
     async with AsyncSessionLocal() as db:
         try:
-            result = await handle_generate_prd(session_id, db)
-            await sio.emit("prd_generated", result, room=session_id)
+            job = await handle_generate_prd(session_id, db)
+            await sio.emit("prd_job_started", job, room=session_id)
         except ValueError as e:
             await sio.emit("error", {"message": str(e)}, room=session_id)
         except Exception as e:
@@ -419,77 +455,7 @@ app.mount("/ws", socketio_app)
 @sio.on("send_streaming_message")
 async def handle_socket_streaming_message(sid: str, data: dict) -> None:
     """Handle incoming chat message via WebSocket with streaming response."""
-    session_data = await sio.get_session(sid)
-    session_id = session_data.get("session_id") if session_data else None
-
-    if not session_id:
-        await sio.emit("error", {"message": "Not connected to a session"}, room=sid)
-        return
-
-    content = data.get("content")
-    if not content:
-        await sio.emit("error", {"message": "content required"}, room=sid)
-        return
-
-    # Get database session
-    async with AsyncSessionLocal() as db:
-        try:
-            # Send typing indicator
-            await sio.emit("typing_start", {"from": "bot"}, room=session_id)
-
-            # Handle the message with streaming
-            result = await handle_streaming_chat_message(session_id, content, db)
-
-            # Stop typing indicator
-            await sio.emit("typing_stop", {"from": "bot"}, room=session_id)
-
-            # Send the complete response
-            await sio.emit("message", {
-                "user_message": result["user_message"],
-                "ai_message": result["ai_message"],
-            }, room=session_id)
-
-            # Send phase change if applicable
-            if result["session"].get("current_phase"):
-                await sio.emit("phase_change", {
-                    "phase": result["session"]["current_phase"]
-                }, room=session_id)
-
-            # Check if PRD is ready to be generated
-            session = result["session"]
-            if (session.get("client_info", {}).get("name") and
-                session.get("business_context", {}).get("challenges") and
-                not session.get("prd_id")):
-                await sio.emit("prd_ready", {
-                    "message": "PRD can now be generated"
-                }, room=session_id)
-
-        except Exception as e:
-            logger.error(f"Error handling streaming message: {e}")
-            # Enhanced error handling for network interruptions
-            error_message = str(e)
-
-            # Categorize error types and provide appropriate responses
-            if "network" in error_message.lower() or "connection" in error_message.lower():
-                error_message = "Network connection issue detected. Please check your internet connection and try again."
-                # Don't disconnect session, allow retry
-            elif "timeout" in error_message.lower():
-                error_message = "Request timed out. The AI is processing your request. Please wait a moment and try again."
-            elif "database" in error_message.lower():
-                error_message = "Temporary database issue. Your session is preserved and will be restored shortly."
-            else:
-                error_message = f"An unexpected error occurred: {error_message}"
-
-            # Send error to client with retry guidance
-            await sio.emit("error", {
-                "message": error_message,
-                "can_retry": True,
-                "retry_instructions": "Please try sending your message again in a few seconds.",
-                "session_preserved": True
-            }, room=session_id)
-
-            # Log the error with session context
-            logger.error(f"Session {session_id}: {error_message}")
+    await _handle_chat_turn(sid, data)
 
 
 @app.get("/", tags=["root"])
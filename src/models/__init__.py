@@ -2,6 +2,7 @@
 from src.models.booking import Booking
 from src.models.consent import Consent
 from src.models.expert import Expert
+from src.models.llm_usage import LLMUsageRecord
 from src.models.prd import PRDDocument
 from src.models.session import ConversationSession, Message
 from src.models.template import WelcomeMessageTemplate
@@ -14,4 +15,5 @@ __all__ = [
     "Booking",
     "WelcomeMessageTemplate",
     "Consent",
+    "LLMUsageRecord",
 ]
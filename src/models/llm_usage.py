@@ -0,0 +1,47 @@
+"""LLM usage accounting model."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.core.types import UUIDType
+
+
+class LLMUsageRecord(Base):
+    """Token and latency usage of one AI generation (a chat turn or a PRD)."""
+
+    __tablename__ = "llm_usage"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType, primary_key=True, default=uuid.uuid4
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType, ForeignKey("conversation_sessions.id"), nullable=False, index=True
+    )
+    # Conversation phase the generation was made in
+    phase: Mapped[str] = mapped_column(String(50), nullable=False)
+    operation: Mapped[str] = mapped_column(String(50), nullable=False, default="chat")
+
+    # Tokens as reported by the provider (0 for fallback and cached responses)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # LLM wall time
+    llm_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    time_to_first_token_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    generation_time_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    cache_hit: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    fallback: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, index=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LLMUsageRecord(session_id={self.session_id}, phase={self.phase}, "
+            f"tokens={self.prompt_tokens}+{self.completion_tokens})>"
+        )
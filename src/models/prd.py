@@ -1,8 +1,9 @@
 """PRD (Project Requirements Document) model."""
 import uuid
 from datetime import datetime, timedelta
+from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.config import settings
@@ -15,6 +16,22 @@ def default_expiry() -> datetime:
     return datetime.utcnow() + timedelta(days=settings.prd_expiry_days)
 
 
+def make_preview_text(content: str | None) -> str:
+    """Truncate PRD content to 197 chars + "..." for previews."""
+    content = content or ""
+    return content[:197] + "..." if len(content) > 197 else content
+
+
+def default_preview_text(context: Any) -> str:
+    """Derive the preview text from the inserted content."""
+    return make_preview_text(context.get_current_parameters().get("content_markdown"))
+
+
+def default_content_length(context: Any) -> int:
+    """Derive the content length from the inserted content."""
+    return len(context.get_current_parameters().get("content_markdown") or "")
+
+
 class PRDDocument(Base):
     """Project Requirements Document model."""
 
@@ -30,10 +47,23 @@ class PRDDocument(Base):
     # Version tracking
     version: Mapped[int] = mapped_column(Integer, default=1)
 
-    # Content
-    content_markdown: Mapped[str] = mapped_column(Text, nullable=False)
+    # Content (NULL for superseded versions stored as a delta;
+    # PRDService.get_prd restores it)
+    content_markdown: Mapped[str] = mapped_column(Text, nullable=True)
     conversation_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Delta storage: compressed delta against the next version's content
+    content_delta: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    delta_base_id: Mapped[uuid.UUID | None] = mapped_column(UUIDType, nullable=True)
+
+    # Lightweight metadata for previews and version listings
+    preview_text: Mapped[str | None] = mapped_column(
+        String(200), nullable=True, default=default_preview_text
+    )
+    content_length: Mapped[int] = mapped_column(
+        Integer, default=default_content_length, server_default="0"
+    )
+
     # Client info for PRD
     client_company: Mapped[str | None] = mapped_column(String(255), nullable=True)
     client_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
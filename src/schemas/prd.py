@@ -50,6 +50,31 @@ class PRDPreview(BaseModel):
     created_at: datetime
 
 
+class PRDVersionSummary(BaseModel):
+    """Metadata for one PRD version (without content)."""
+
+    id: UUID
+    version: int
+    preview_text: str = Field(..., max_length=200)
+    content_length: int
+    download_count: int
+    created_at: datetime
+
+
+class PRDJobResponse(BaseModel):
+    """Response schema for a background PRD generation job."""
+
+    job_id: str
+    session_id: UUID
+    status: str
+    stage: str
+    progress: int = Field(..., ge=0, le=100)
+    prd_id: UUID | None = None
+    error: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+
+
 class PRDDownloadResponse(BaseModel):
     """Response schema for PRD download."""
 
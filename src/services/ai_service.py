@@ -1,13 +1,55 @@
 """AI service for generating responses using LangChain/DeepAgents."""
 import asyncio
+import hashlib
+import time
 from collections.abc import AsyncIterator
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from pydantic import SecretStr
 
 from src.core.config import settings
+from src.services.cache_service import cache_ai_response, get_cached_ai_response
+from src.services.llm_resilience import guarded_stream, hedged_call, llm_circuit_breaker
+from src.services.llm_scheduler import BACKGROUND_PRIORITY, chat_priority, llm_scheduler
+from src.services.usage_service import (
+    record_llm_cache_hit,
+    record_llm_call,
+    record_llm_fallback,
+)
+from src.utils import json_codec
+
+# LangChain and the Anthropic SDK are imported on first use to keep them
+# out of the API process's cold start
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_core.messages import BaseMessage
+
+    from src.services.fake_llm import FaultInjectingLLM
+
+
+def hash_conversation_history(conversation_history: list[dict[str, Any]]) -> str:
+    """Hash the role/content sequence of a conversation."""
+    digest = hashlib.sha256()
+    for msg in conversation_history:
+        digest.update(str(msg.get("role", "")).encode())
+        digest.update(b"\x00")
+        digest.update(str(msg.get("content", "")).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def fingerprint_inputs(kind: str, **parts: Any) -> str:
+    """Build a stable cache key for an AI generation from its inputs.
+
+    Args:
+        kind: Type of generation (e.g. "prd", "summary")
+        **parts: Prompt inputs; dicts are serialized with sorted keys
+
+    Returns:
+        Fingerprint in format: {kind}:{sha256}
+    """
+    payload = json_codec.dumps(parts, sort_keys=True)
+    return f"{kind}:{hashlib.sha256(payload).hexdigest()}"
 
 
 class AIService:
@@ -17,12 +59,21 @@ class AIService:
         """Initialize the AI service with Anthropic Claude."""
         self.api_key = settings.anthropic_api_key
         self.model_name = settings.anthropic_model
+        self.circuit_breaker = llm_circuit_breaker
 
-        if not self.api_key:
+        self.llm: ChatAnthropic | FaultInjectingLLM | None
+        if settings.llm_backend == "fake":
+            # Fault-injecting fake for local brownout testing
+            from src.services import fake_llm
+
+            self.llm = fake_llm.FaultInjectingLLM()
+        elif not self.api_key:
             # For demo/testing without API key
-            self.llm: ChatAnthropic | None = None
+            self.llm = None
         else:
-            self.llm = ChatAnthropic(  # type: ignore[call-arg]
+            import langchain_anthropic
+
+            self.llm = langchain_anthropic.ChatAnthropic(  # type: ignore[call-arg]
                 model=self.model_name,
                 api_key=SecretStr(self.api_key),
                 temperature=0.7,
@@ -47,8 +98,11 @@ class AIService:
         """
         if not self.llm:
             # Fallback response when no API key is configured
+            record_llm_fallback()
             return self._fallback_response(user_message, context)
 
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
         # Build prompt with conversation history
         messages: list[BaseMessage] = [
             SystemMessage(content=self._get_system_prompt(context)),
@@ -66,11 +120,11 @@ class AIService:
         messages.append(HumanMessage(content=user_message))
 
         try:
-            # Generate response
-            response = await self.llm.ainvoke(messages)
-            return cast(str, response.content)
+            # Fall back when over capacity, past the deadline or the breaker is open
+            return await self.invoke_llm(messages, chat_priority(context))
         except Exception as e:
             print(f"AI service error: {e}")
+            record_llm_fallback()
             return self._fallback_response(user_message, context)
 
     async def stream_response(
@@ -91,12 +145,15 @@ class AIService:
         """
         if not self.llm:
             # Fallback - return chunks for demo
+            record_llm_fallback()
             response = self._fallback_response(user_message, context)
             for i in range(0, len(response), 10):
                 yield response[i:i+10]
                 await asyncio.sleep(0.05)  # Small delay for demo
             return
 
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
         # Build prompt with conversation history
         messages: list[BaseMessage] = [
             SystemMessage(content=self._get_system_prompt(context)),
@@ -113,17 +170,96 @@ class AIService:
 
         messages.append(HumanMessage(content=user_message))
 
+        streamed = False
         try:
-            # Stream response chunks
-            async for chunk in self.llm.astream(messages):
-                yield cast(str, chunk.content)
+            # Fall back when over capacity, past a deadline or the breaker is open
+            async for chunk in self.stream_llm(messages, chat_priority(context)):
+                streamed = True
+                yield chunk
         except Exception as e:
             print(f"AI streaming error: {e}")
+            if streamed:
+                # A fallback would be appended to the partial response
+                raise
+            record_llm_fallback()
             fallback = self._fallback_response(user_message, context)
             for i in range(0, len(fallback), 10):
                 yield fallback[i:i+10]
                 await asyncio.sleep(0.05)
 
+    async def invoke_llm(self, messages: "list[BaseMessage]", priority: int = BACKGROUND_PRIORITY) -> str:
+        """Call the LLM through the circuit breaker, scheduler and deadline.
+
+        Fails fast while the breaker is open, waits for a scheduler slot,
+        and hedges the call if llm_hedge_delay_seconds is set.
+
+        Args:
+            messages: Prompt messages
+            priority: Scheduling priority
+
+        Returns:
+            Response text
+
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
+            LLMOverloadedError: If the call is shed by the scheduler
+            TimeoutError: If the call misses llm_timeout_seconds
+        """
+        assert self.llm is not None
+        llm = self.llm
+        self.circuit_breaker.check()
+        async with self.circuit_breaker.track(), llm_scheduler.slot(priority):
+            started = time.perf_counter()
+            response = await asyncio.wait_for(
+                hedged_call(
+                    lambda: llm.ainvoke(messages),
+                    settings.llm_hedge_delay_seconds,
+                    llm_scheduler,
+                ),
+                settings.llm_timeout_seconds,
+            )
+        record_llm_call(getattr(response, "usage_metadata", None), time.perf_counter() - started)
+        return cast(str, response.content)
+
+    async def stream_llm(
+        self, messages: "list[BaseMessage]", priority: int = BACKGROUND_PRIORITY
+    ) -> AsyncIterator[str]:
+        """Stream from the LLM through the circuit breaker, scheduler and deadlines.
+
+        Like invoke_llm, with a separate llm_first_token_timeout_seconds
+        deadline; hedging races the first token.
+
+        Yields:
+            Response chunks
+
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
+            LLMOverloadedError: If the call is shed by the scheduler
+            TimeoutError: If a deadline is missed
+        """
+        assert self.llm is not None
+        llm = self.llm
+        self.circuit_breaker.check()
+        async with self.circuit_breaker.track(), llm_scheduler.slot(priority):
+            started = time.perf_counter()
+            time_to_first_token = None
+            usage: dict[str, int] = {}
+            async for chunk in guarded_stream(
+                lambda: llm.astream(messages),
+                settings.llm_first_token_timeout_seconds,
+                settings.llm_timeout_seconds,
+                settings.llm_hedge_delay_seconds,
+                llm_scheduler,
+            ):
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - started
+                # Streamed usage is reported incrementally across chunks
+                for key, value in (getattr(chunk, "usage_metadata", None) or {}).items():
+                    if isinstance(value, int):
+                        usage[key] = usage.get(key, 0) + value
+                yield cast(str, chunk.content)
+        record_llm_call(usage, time.perf_counter() - started, time_to_first_token)
+
     def _get_system_prompt(self, context: dict[str, Any] | None) -> str:
         """Get the system prompt for the AI assistant."""
         base_prompt = """You are UnoBot, an AI business consultant for UnoDigit, a digital transformation company.
@@ -294,10 +430,115 @@ This helps me match you with the right solutions!"""
         conversation_history: list[dict[str, Any]],
         feedback: str | None = None,
     ) -> str:
-        """Generate a Project Requirements Document."""
+        """Generate a Project Requirements Document.
+
+        Results are cached by a fingerprint of the inputs, so identical
+        requests return the previous document without calling the LLM.
+        """
         if not self.llm:
+            record_llm_fallback()
             return self._fallback_prd(business_context, client_info)
 
+        cache_key = self._prd_fingerprint(
+            business_context, client_info, conversation_history, feedback
+        )
+        cached = await get_cached_ai_response(cache_key)
+        if cached:
+            record_llm_cache_hit()
+            return cast(str, cached)
+
+        messages = self._build_prd_messages(
+            business_context, client_info, conversation_history, feedback
+        )
+
+        try:
+            content = await self.invoke_llm(messages, BACKGROUND_PRIORITY)
+        except Exception:
+            record_llm_fallback()
+            return self._fallback_prd(business_context, client_info, feedback)
+
+        await cache_ai_response(cache_key, content, settings.ai_response_cache_ttl_seconds)
+        return content
+
+    async def stream_prd(
+        self,
+        business_context: dict[str, Any],
+        client_info: dict[str, Any],
+        conversation_history: list[dict[str, Any]],
+        feedback: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a Project Requirements Document as Markdown chunks.
+
+        Yields:
+            PRD Markdown chunks as they become available
+        """
+        if not self.llm:
+            record_llm_fallback()
+            fallback = self._fallback_prd(business_context, client_info)
+            for i in range(0, len(fallback), 200):
+                yield fallback[i:i+200]
+            return
+
+        cache_key = self._prd_fingerprint(
+            business_context, client_info, conversation_history, feedback
+        )
+        cached = await get_cached_ai_response(cache_key)
+        if cached:
+            record_llm_cache_hit()
+            for i in range(0, len(cached), 200):
+                yield cached[i:i+200]
+            return
+
+        messages = self._build_prd_messages(
+            business_context, client_info, conversation_history, feedback
+        )
+
+        chunks: list[str] = []
+        try:
+            async for chunk in self.stream_llm(messages, BACKGROUND_PRIORITY):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"AI PRD streaming error: {e}")
+            if chunks:
+                raise
+            record_llm_fallback()
+            fallback = self._fallback_prd(business_context, client_info, feedback)
+            for i in range(0, len(fallback), 200):
+                yield fallback[i:i+200]
+            return
+
+        await cache_ai_response(
+            cache_key, "".join(chunks), settings.ai_response_cache_ttl_seconds
+        )
+
+    def _prd_fingerprint(
+        self,
+        business_context: dict[str, Any],
+        client_info: dict[str, Any],
+        conversation_history: list[dict[str, Any]],
+        feedback: str | None = None,
+    ) -> str:
+        """Build the cache fingerprint for a PRD generation."""
+        return fingerprint_inputs(
+            "prd",
+            model=self.model_name,
+            business_context=business_context,
+            client_info=client_info,
+            history=hash_conversation_history(conversation_history),
+            feedback=feedback or "",
+        )
+
+    def _build_prd_messages(
+        self,
+        business_context: dict[str, Any],
+        client_info: dict[str, Any],
+        conversation_history: list[dict[str, Any]],
+        feedback: str | None = None,
+    ) -> "list[BaseMessage]":
+        """Build the prompt messages for PRD generation."""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
         prompt = f"""Generate a detailed Project Requirements Document (PRD) for a digital transformation project.
 
 Client Information:
@@ -325,14 +566,10 @@ Please generate a comprehensive PRD including:
 Format the response in clear Markdown.
 """
 
-        try:
-            response = await self.llm.ainvoke([
-                SystemMessage(content="You are an expert technical product manager. Generate detailed PRDs."),
-                HumanMessage(content=prompt)
-            ])
-            return cast(str, response.content)
-        except Exception:
-            return self._fallback_prd(business_context, client_info, feedback)
+        return [
+            SystemMessage(content="You are an expert technical product manager. Generate detailed PRDs."),
+            HumanMessage(content=prompt)
+        ]
 
     def _fallback_prd(self, business_context: dict[str, Any], client_info: dict[str, Any], feedback: str | None = None) -> str:
         """Fallback PRD when AI service is unavailable."""
@@ -3,11 +3,12 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any, cast
 
-from sqlalchemy import func, select, text
+from sqlalchemy import case, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.booking import Booking, BookingStatus
 from src.models.expert import Expert
+from src.models.llm_usage import LLMUsageRecord
 from src.models.session import ConversationSession, SessionPhase, SessionStatus
 
 
@@ -205,6 +206,61 @@ class AnalyticsService:
             }
         }
 
+    async def get_llm_usage_analytics(self, days_back: int = 30, top_sessions: int = 10) -> dict[str, Any]:
+        """Get LLM token and latency usage analytics.
+
+        Args:
+            days_back: Number of days to look back for analytics
+            top_sessions: Number of most expensive sessions to list
+
+        Returns:
+            Dictionary containing usage totals, per-phase and per-day
+            rollups, and the sessions using the most tokens
+        """
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days_back)
+        in_period = (
+            LLMUsageRecord.created_at >= start_date,
+            LLMUsageRecord.created_at <= end_date,
+        )
+
+        totals = await self._get_llm_usage_rows(*in_period)
+        by_phase = await self._get_llm_usage_rows(*in_period, group_by=LLMUsageRecord.phase)
+        daily = await self._get_llm_usage_rows(*in_period, group_by=func.date(LLMUsageRecord.created_at))
+        by_session = await self._get_llm_usage_rows(
+            *in_period, group_by=LLMUsageRecord.session_id, top=top_sessions
+        )
+
+        return {
+            "time_period": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "days_back": days_back
+            },
+            "totals": totals[0][1],
+            "by_phase": {str(phase): usage for phase, usage in by_phase},
+            "daily": [{"date": str(day), **usage} for day, usage in daily],
+            "top_sessions": [{"session_id": str(session_id), **usage} for session_id, usage in by_session]
+        }
+
+    async def get_session_llm_usage(self, session_id: uuid.UUID) -> dict[str, Any]:
+        """Get LLM token and latency usage of one session.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            Dictionary containing the session's usage totals and per-phase usage
+        """
+        in_session = LLMUsageRecord.session_id == session_id
+        totals = await self._get_llm_usage_rows(in_session)
+        by_phase = await self._get_llm_usage_rows(in_session, group_by=LLMUsageRecord.phase)
+        return {
+            "session_id": str(session_id),
+            "totals": totals[0][1],
+            "by_phase": {str(phase): usage for phase, usage in by_phase}
+        }
+
     async def get_system_health(self) -> dict[str, Any]:
         """Get system health and performance metrics.
 
@@ -565,3 +621,56 @@ class AnalyticsService:
             )
         )
         return result.scalar_one()
+
+    async def _get_llm_usage_rows(
+        self, *conditions: Any, group_by: Any = None, top: int | None = None
+    ) -> list[tuple[Any, dict[str, Any]]]:
+        """Aggregate LLM usage records, optionally grouped.
+
+        Args:
+            *conditions: Filters on LLMUsageRecord
+            group_by: Column or expression to group by (None for one total row)
+            top: Only return the groups with the most tokens
+
+        Returns:
+            List of (group key, usage) pairs
+        """
+        total_tokens = func.coalesce(
+            func.sum(LLMUsageRecord.prompt_tokens + LLMUsageRecord.completion_tokens), 0
+        )
+        columns = [
+            func.count(LLMUsageRecord.id),
+            func.coalesce(func.sum(LLMUsageRecord.prompt_tokens), 0),
+            func.coalesce(func.sum(LLMUsageRecord.completion_tokens), 0),
+            func.coalesce(func.sum(LLMUsageRecord.generation_time_ms), 0),
+            func.avg(LLMUsageRecord.time_to_first_token_ms),
+            func.coalesce(func.sum(case((LLMUsageRecord.cache_hit, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((LLMUsageRecord.fallback, 1), else_=0)), 0),
+        ]
+        query = select(*([group_by] if group_by is not None else []), *columns).where(*conditions)
+        if group_by is not None:
+            query = query.group_by(group_by)
+            query = query.order_by(total_tokens.desc()) if top else query.order_by(group_by)
+        if top:
+            query = query.limit(top)
+
+        result = await self.db.execute(query)
+        rows = []
+        for row in result.fetchall():
+            key = row[0] if group_by is not None else None
+            generations, prompt, completion, generation_ms, avg_ttft, cache_hits, fallbacks = (
+                row[1:] if group_by is not None else row
+            )
+            rows.append((key, {
+                "generations": int(generations),
+                "prompt_tokens": int(prompt),
+                "completion_tokens": int(completion),
+                "total_tokens": int(prompt) + int(completion),
+                "generation_time_seconds": int(generation_ms) / 1000,
+                "average_time_to_first_token_seconds": (
+                    float(avg_ttft) / 1000 if avg_ttft is not None else None
+                ),
+                "cache_hits": int(cache_hits),
+                "fallbacks": int(fallbacks),
+            }))
+        return rows
@@ -17,6 +17,7 @@ from src.schemas.booking import (
 )
 from src.services.calendar_service import CalendarService
 from src.services.email_service import EmailService
+from src.services.expert_service import ExpertService
 from src.services.prd_service import PRDService
 
 logger = logging.getLogger(__name__)
@@ -189,6 +190,9 @@ class BookingService:
 
         logger.info(f"Booking created successfully: {booking.id} for {client_name} with {expert.name}")
 
+        # Update workload counters used by expert matching
+        await ExpertService(self.db).adjust_workload(expert_id, 1, booking.start_time)
+
         # Update session with booking ID
         session.booking_id = booking.id
         self.db.add(session)
@@ -277,10 +281,17 @@ class BookingService:
 
         try:
             # Update booking status
+            was_confirmed = booking.status == 'confirmed'
             booking.status = 'cancelled'
             self.db.add(booking)
             await self.db.commit()
 
+            # Update workload counters used by expert matching
+            if was_confirmed:
+                await ExpertService(self.db).adjust_workload(
+                    booking.expert_id, -1, booking.start_time
+                )
+
             # Get expert for notification
             expert = await self._get_expert(booking.expert_id)
             expert_name = expert.name if expert else "Expert"
@@ -1,10 +1,17 @@
 """Redis-based caching service for UnoBot with fallback to in-memory cache."""
 import asyncio
-import json
+import fnmatch
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from datetime import datetime, timedelta
 from typing import Any, TYPE_CHECKING
 
 from src.core.config import settings
+from src.utils import cache_codec, json_codec
 
 if TYPE_CHECKING:
     import redis.asyncio as redis_async
@@ -12,10 +19,36 @@ if TYPE_CHECKING:
 # Try to import Redis, fallback to in-memory if not available
 try:
     import redis.asyncio as redis_async
+    from redis.exceptions import ConnectionError as RedisConnectionError
+    from redis.exceptions import TimeoutError as RedisTimeoutError
     REDIS_AVAILABLE = True
+    # Errors meaning Redis is unreachable, as opposed to a failed command
+    CONNECTION_ERRORS: tuple[type[BaseException], ...] = (RedisConnectionError, RedisTimeoutError, OSError)
 except ImportError:
     REDIS_AVAILABLE = False
     redis_async = None  # type: ignore
+    CONNECTION_ERRORS = (OSError,)
+
+logger = logging.getLogger(__name__)
+
+# Keys per SCAN call, MGET, DEL and pipeline in bulk operations
+BATCH_SIZE = 500
+
+# Generation counters of cache namespaces (see CacheService.namespaced_key)
+GENERATION_PREFIX = "generation:"
+
+# Stored by get_or_load() for keys whose loader found nothing
+NEGATIVE_ENTRY = "__missing__"
+
+
+def _batches(keys: list[str]) -> list[list[str]]:
+    return [keys[start:start + BATCH_SIZE] for start in range(0, len(keys), BATCH_SIZE)]
+
+
+def _prefix_pattern(key: str) -> str:
+    """Pattern matching every key with the same prefix (up to the first colon)."""
+    prefix, separator, _ = key.partition(":")
+    return f"{prefix}:*" if separator else key
 
 
 class InMemoryCache:
@@ -111,6 +144,25 @@ class InMemoryCache:
                 deleted += 1
         return deleted
 
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values; missing keys are left out."""
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, mapping: dict[str, Any], ttl: int | None = None) -> bool:
+        """Set several values with the same TTL."""
+        for key, value in mapping.items():
+            await self.set(key, value, ttl)
+        return True
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """Delete several keys."""
+        return sum([await self.delete(key) for key in keys])
+
     async def increment(self, key: str, amount: int = 1) -> int:
         """Increment a numeric value in cache."""
         current = await self.get(key)
@@ -122,8 +174,12 @@ class InMemoryCache:
         return new_value
 
     async def set_hash(self, key: str, mapping: dict[str, Any]) -> bool:
-        """Set multiple fields in a hash."""
-        return await self.set(key, mapping)
+        """Set multiple fields in a hash (merged like Redis HSET)."""
+        value = await self.get(key)
+        if isinstance(value, dict):
+            value.update(mapping)
+            return True
+        return await self.set(key, dict(mapping))
 
     async def get_hash(self, key: str, field: str | None = None) -> dict[str, Any] | Any | None:
         """Get fields from a hash."""
@@ -144,48 +200,418 @@ class InMemoryCache:
             return True
         return False
 
+    async def acquire_lock(self, key: str, token: str, ttl: int) -> bool:
+        """Set a lock key to a token if no live lock holds it."""
+        if await self.get(key) is not None:
+            return False
+        # No cleanup task: a stale task would delete a later holder's lock
+        self.cache[key] = {
+            'value': token,
+            'expires_at': datetime.now() + timedelta(seconds=ttl),
+        }
+        return True
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Delete a lock key if it still holds the token."""
+        if await self.get(key) != token:
+            return False
+        return await self.delete(key)
+
     async def _schedule_cleanup(self, key: str, ttl: int):
         """Schedule cleanup of a key after TTL."""
         await asyncio.sleep(ttl)
         await self.delete(key)
 
 
+class LocalCache:
+    """Bounded in-process LRU cache whose entries expire after a short TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Get a live entry, marking it as recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store an entry, evicting the least recently used beyond max_entries."""
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop an entry."""
+        self.entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        """Drop the entries matching a pattern."""
+        for key in fnmatch.filter(list(self.entries), pattern):
+            del self.entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.entries.clear()
+
+
 class CacheService:
-    """Redis-based caching service with TTL support and fallback to in-memory."""
+    """Redis-based caching service with TTL support and fallback to in-memory.
+
+    With Redis, get() and get_packed() are served from an in-process LRU
+    (L1) in front of Redis (L2). Writes and deletes are published on a
+    Redis channel so every worker drops the key from its L1; L1 is only
+    used while this worker is subscribed, and never for keys marked as
+    strongly consistent (locks, counters and other shared state).
+
+    When Redis goes down (failed health check, or repeated connection
+    errors), operations switch to the in-memory cache instead of each
+    failing against Redis (degraded mode), and a background task switches
+    back once Redis answers again.
+    """
 
     def __init__(self):
         """Initialize cache service with Redis or fallback."""
         self.redis_url = settings.redis_url
         self.redis: Any | None = None
+        # Client for binary values (set_packed/get_packed), which must not
+        # be decoded as UTF-8
+        self.redis_binary: Any | None = None
         self.in_memory_cache: InMemoryCache = InMemoryCache()  # Always initialize
         self.use_redis: bool = False
+        self.local_cache = LocalCache(settings.cache_l1_max_entries, settings.cache_l1_ttl_seconds)
+        self.l1_active = False
+        self.tier_stats = {"l1": {"hits": 0, "misses": 0}, "l2": {"hits": 0, "misses": 0}}
+        self._consistent_prefixes: tuple[str, ...] = ()
+        # Counts invalidations, so reads racing with one don't fill L1
+        self._invalidations = 0
+        self._invalidation_task: asyncio.Task[None] | None = None
+        # get_or_load(): loads in progress by key, and the average load time
+        # by key prefix for early refreshes
+        self._loads: dict[str, asyncio.Future[Any]] = {}
+        self._load_seconds: dict[str, float] = {}
+        # Redis health: degraded while Redis is configured but down
+        self.degraded = False
+        self.degraded_since: datetime | None = None
+        self.switches = {"to_memory": 0, "to_redis": 0}
+        self._connection_failures = 0
+        self._health_check: asyncio.Event | None = None
+        self._monitor_task: asyncio.Task[None] | None = None
+        # Keys and patterns written in memory while degraded, to drop from
+        # Redis before switching back to it (only once Redis was reached:
+        # before that, Redis holds nothing this process cached)
+        self._redis_reached = False
+        self._degraded_keys: set[str] = set()
+        self._degraded_patterns: set[str] = set()
 
     async def connect(self) -> None:
-        """Connect to Redis or initialize in-memory cache."""
-        if REDIS_AVAILABLE:
-            try:
-                self.redis = redis_async.from_url(
-                    self.redis_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    socket_connect_timeout=5
-                )
-                # Test connection
-                await self.redis.ping()
-                self.use_redis = True
-                return
-            except Exception:
-                pass
+        """Connect to Redis, or run in memory until it becomes available.
+
+        Without the redis package or with an invalid URL the cache stays in
+        memory. Otherwise a background task health-checks Redis and switches
+        between Redis and the in-memory cache as it goes down and recovers.
+        """
+        if not REDIS_AVAILABLE:
+            self.use_redis = False
+            return
+        if self.redis is not None:
+            return
+
+        options = {
+            "socket_connect_timeout": 5,
+            "socket_timeout": settings.redis_socket_timeout_seconds,
+            "max_connections": settings.redis_max_connections,
+            "health_check_interval": settings.redis_health_check_seconds,
+        }
+        try:
+            self.redis = redis_async.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                **options
+            )
+            self.redis_binary = redis_async.from_url(self.redis_url, **options)
+        except Exception:
+            # Fallback to in-memory cache (already initialized)
+            self.redis = self.redis_binary = None
+            self.use_redis = False
+            return
 
-        # Fallback to in-memory cache (already initialized)
-        self.use_redis = False
+        try:
+            # Test connection
+            await self.redis.ping()
+            self.use_redis = True
+            self._redis_reached = True
+            self._start_invalidation_listener()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, caching in memory until it recovers: {e}")
+            self.use_redis = False
+            self.degraded = True
+            self.degraded_since = datetime.now()
+        self._health_check = asyncio.Event()
+        self._monitor_task = asyncio.create_task(self._monitor_connection())
 
     async def disconnect(self) -> None:
         """Disconnect from cache service."""
-        if self.use_redis and self.redis:
+        for task in (self._monitor_task, self._invalidation_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._monitor_task = self._invalidation_task = None
+        if self.redis:
             await self.redis.close()
+        if self.redis_binary:
+            await self.redis_binary.close()
+        self.redis = self.redis_binary = None
+        self.use_redis = self.degraded = False
         # In-memory cache doesn't need explicit disconnection
 
+    def _start_invalidation_listener(self) -> None:
+        if settings.cache_l1_enabled and (
+            self._invalidation_task is None or self._invalidation_task.done()
+        ):
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _monitor_connection(self) -> None:
+        """Ping Redis periodically (or when an operation fails) and switch on changes."""
+        health_check, redis = self._health_check, self.redis
+        assert health_check is not None and redis is not None  # Set by connect()
+        while True:
+            interval = settings.redis_health_check_seconds if self.use_redis else settings.redis_reconnect_seconds
+            try:
+                await asyncio.wait_for(health_check.wait(), interval)
+            except TimeoutError:
+                pass
+            health_check.clear()
+            try:
+                await redis.ping()
+            except Exception as e:
+                if self.use_redis:
+                    self._switch_to_memory(f"health check failed: {e}")
+                continue
+            self._connection_failures = 0
+            if not self.use_redis:
+                await self._switch_to_redis()
+
+    def _record_error(self, error: Exception) -> None:
+        """Count a failed Redis operation towards switching to memory.
+
+        Only connection errors and timeouts count; the first one triggers a
+        health check, and cache_breaker_failure_threshold consecutive ones
+        switch to memory right away.
+        """
+        if not self.use_redis or not isinstance(error, CONNECTION_ERRORS):
+            return
+        self._connection_failures += 1
+        if self._connection_failures >= settings.cache_breaker_failure_threshold:
+            self._switch_to_memory(f"{self._connection_failures} consecutive connection errors: {error}")
+        elif self._health_check:
+            self._health_check.set()
+
+    def _switch_to_memory(self, reason: str) -> None:
+        """Serve operations from the in-memory cache until Redis recovers."""
+        logger.warning(f"Redis cache unavailable ({reason}), switching to in-memory cache")
+        self.use_redis = False
+        self.degraded = True
+        self.degraded_since = datetime.now()
+        self.switches["to_memory"] += 1
+        self._connection_failures = 0
+        self.local_cache.clear()
+
+    async def _switch_to_redis(self) -> None:
+        """Switch back to Redis once values written during the outage are dropped from it."""
+        # Writes while degraded only reached memory; Redis may hold older
+        # values for those keys (keys written meanwhile are dropped in turn)
+        redis = self.redis
+        assert redis is not None
+        while self._degraded_keys or self._degraded_patterns:
+            keys, self._degraded_keys = self._degraded_keys, set()
+            patterns, self._degraded_patterns = self._degraded_patterns, set()
+            try:
+                for batch in _batches(list(keys)):
+                    await redis.delete(*batch)
+                for pattern in patterns:
+                    await self._delete_scanned(pattern)
+            except Exception as e:
+                logger.warning(f"Redis recovered but stale keys could not be dropped: {e}")
+                self._degraded_keys |= keys
+                self._degraded_patterns |= patterns
+                return
+
+        degraded_seconds = (datetime.now() - self.degraded_since).total_seconds() if self.degraded_since else 0.0
+        logger.info(f"Redis cache recovered after {degraded_seconds:.0f}s, switching back from in-memory cache")
+        self.use_redis = True
+        self._redis_reached = True
+        self.degraded = False
+        self.degraded_since = None
+        self.switches["to_redis"] += 1
+        # Values kept in memory would be stale by the next outage
+        self.in_memory_cache.cache.clear()
+        self._start_invalidation_listener()
+
+    def _track_degraded_write(self, *keys: str, pattern: str | None = None) -> None:
+        if not self.degraded or not self._redis_reached:
+            return
+        self._degraded_keys.update(keys)
+        if pattern:
+            self._degraded_patterns.add(pattern)
+        if len(self._degraded_keys) > settings.cache_degraded_max_tracked_keys:
+            # Bounded by the number of key prefixes; namespaced keys embed
+            # their generation, so only the generation in use is dropped
+            logger.warning(
+                f"Over {settings.cache_degraded_max_tracked_keys} keys written while degraded, "
+                "dropping their prefixes from Redis on recovery instead"
+            )
+            self._degraded_patterns.update(_prefix_pattern(key) for key in self._degraded_keys)
+            self._degraded_keys = set()
+
+    def get_connection_stats(self) -> dict[str, Any]:
+        """Get the cache backend in use and the switches between Redis and memory."""
+        return {
+            "backend": "redis" if self.use_redis else "memory",
+            "degraded": self.degraded,
+            "degraded_since": self.degraded_since.isoformat() if self.degraded_since else None,
+            "switches": dict(self.switches),
+            "pending_stale_keys": len(self._degraded_keys) + len(self._degraded_patterns),
+        }
+
+    def mark_strongly_consistent(self, prefix: str) -> None:
+        """Always read keys with a prefix from Redis, bypassing L1."""
+        self._consistent_prefixes += (prefix,)
+
+    def _uses_l1(self, key: str) -> bool:
+        return not key.startswith(self._consistent_prefixes)
+
+    async def _listen_for_invalidations(self) -> None:
+        """Apply keys invalidated by any worker to L1, resubscribing on errors.
+
+        Stops once the cache switches to memory; switching back to Redis
+        starts it again.
+        """
+        redis = self.redis
+        assert redis is not None  # Only started once connected
+        while self.use_redis:
+            pubsub = None
+            try:
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(settings.cache_invalidation_channel)
+                self.l1_active = True
+                while self.use_redis:
+                    # An explicit timeout overrides the client's socket_timeout,
+                    # so a quiet channel returns None instead of raising
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=settings.redis_health_check_seconds
+                    )
+                    if message is not None and message["type"] == "message":
+                        self._apply_invalidation(json_codec.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription failed: {e}")
+                self._record_error(e)
+            finally:
+                # Without invalidations L1 could serve stale values
+                self.l1_active = False
+                self.local_cache.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(settings.redis_reconnect_seconds)
+
+    def _apply_invalidation(self, message: dict[str, Any]) -> None:
+        self._invalidations += 1
+        if message.get("pattern"):
+            self.local_cache.delete_pattern(message["pattern"])
+        for key in message.get("keys") or ():
+            self.local_cache.delete(key)
+
+    async def _invalidate(self, *keys: str, pattern: str | None = None) -> None:
+        """Drop keys or a pattern from L1 in this and every other worker."""
+        if not settings.cache_l1_enabled:
+            return
+        keys = tuple(key for key in keys if self._uses_l1(key))
+        if not keys and not pattern:
+            return
+        message = {"keys": keys, "pattern": pattern}
+        self._apply_invalidation(message)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.publish(settings.cache_invalidation_channel, json_codec.dumps(message))
+        except Exception as e:
+            self._record_error(e)
+
+    async def _get_raw(self, client: Any, key: str, with_ttl: bool = False) -> tuple[Any | None, float | None]:
+        """Get a raw Redis value, from L1 when possible.
+
+        Returns:
+            The value and, if with_ttl is set and it was read from Redis, its
+            remaining TTL in seconds (read in the same round trip)
+        """
+        use_l1 = self.l1_active and self._uses_l1(key)
+        if use_l1:
+            value = self.local_cache.get(key)
+            self.tier_stats["l1"]["hits" if value is not None else "misses"] += 1
+            if value is not None:
+                return value, None
+        invalidations = self._invalidations
+        ttl = None
+        if with_ttl:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, pttl = await pipe.execute()
+            ttl = pttl / 1000 if pttl is not None and pttl >= 0 else None
+        else:
+            value = await client.get(key)
+        self.tier_stats["l2"]["hits" if value is not None else "misses"] += 1
+        if use_l1 and value is not None and invalidations == self._invalidations:
+            self.local_cache.set(key, value)
+        return value, ttl
+
+    async def _get_many_raw(self, client: Any, keys: list[str]) -> dict[str, Any]:
+        """Get raw Redis values, from L1 when possible and otherwise with MGET."""
+        values: dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            if self.l1_active and self._uses_l1(key):
+                value = self.local_cache.get(key)
+                self.tier_stats["l1"]["hits" if value is not None else "misses"] += 1
+                if value is not None:
+                    values[key] = value
+                    continue
+            missing.append(key)
+        use_l1 = self.l1_active
+        invalidations = self._invalidations
+        for batch in _batches(missing):
+            for key, value in zip(batch, await client.mget(batch), strict=True):
+                self.tier_stats["l2"]["hits" if value is not None else "misses"] += 1
+                if value is None:
+                    continue
+                values[key] = value
+                if use_l1 and self._uses_l1(key) and invalidations == self._invalidations:
+                    self.local_cache.set(key, value)
+        return values
+
+    def get_tier_stats(self) -> dict[str, Any]:
+        """Get hit counts and ratios per cache tier."""
+        stats: dict[str, Any] = {"l1_active": self.l1_active, "l1_entries": len(self.local_cache.entries)}
+        for tier, counts in self.tier_stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            stats[tier] = {**counts, "hit_ratio": round(counts["hits"] / lookups, 3) if lookups else 0.0}
+        return stats
+
     async def set(
         self,
         key: str,
@@ -196,50 +622,272 @@ class CacheService:
         if self.use_redis and self.redis:
             try:
                 # Serialize value to JSON
-                serialized_value = json.dumps(value, default=str)
+                serialized_value = json_codec.dumps(value)
 
                 if ttl:
                     await self.redis.setex(key, ttl, serialized_value)
                 else:
                     await self.redis.set(key, serialized_value)
+                await self._invalidate(key)
 
                 return True
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
+            self._track_degraded_write(key)
             return await self.in_memory_cache.set(key, value, ttl)
 
     async def get(self, key: str) -> Any | None:
         """Get a value from cache."""
         if self.use_redis and self.redis:
             try:
-                value = await self.redis.get(key)
+                value, _ = await self._get_raw(self.redis, key)
                 if value:
-                    return json.loads(value)
+                    return json_codec.loads(value)
                 return None
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return None
         else:
             return await self.in_memory_cache.get(key)
 
+    async def set_packed(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None
+    ) -> bool:
+        """Set a value in cache in the compact binary encoding (see cache_codec)."""
+        try:
+            encoded = cache_codec.encode(value)
+        except Exception:
+            return False
+        if self.use_redis and self.redis_binary:
+            try:
+                if ttl:
+                    await self.redis_binary.setex(key, ttl, encoded)
+                else:
+                    await self.redis_binary.set(key, encoded)
+                await self._invalidate(key)
+                return True
+            except Exception as e:
+                self._record_error(e)
+                return False
+        else:
+            self._track_degraded_write(key)
+            return await self.in_memory_cache.set(key, encoded, ttl)
+
+    async def get_packed(self, key: str) -> Any | None:
+        """Get a value set with set_packed()."""
+        if self.use_redis and self.redis_binary:
+            try:
+                value, _ = await self._get_raw(self.redis_binary, key)
+            except Exception as e:
+                self._record_error(e)
+                return None
+        else:
+            value = await self.in_memory_cache.get(key)
+        if value is None:
+            return None
+        try:
+            return cache_codec.decode(value)
+        except cache_codec.CacheDecodeError:
+            return None
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        *,
+        packed: bool = False,
+        negative_ttl: int | None = None,
+    ) -> Any | None:
+        """Get a value, loading and caching it on a miss.
+
+        Concurrent misses for a key share one call to the loader (single
+        flight) instead of each loading it. Hits are refreshed early, by
+        one caller, with a probability that grows as the entry nears expiry
+        and with how long loads take (see settings.cache_early_refresh_beta),
+        so popular keys don't expire for all readers at once.
+
+        Args:
+            key: Cache key
+            loader: Loads the value, returning None if it doesn't exist
+            ttl: TTL of loaded values, in seconds
+            packed: Cache values in the compact binary encoding (see set_packed)
+            negative_ttl: If set, remember for this many seconds that the
+                loader found nothing
+
+        Returns:
+            The cached or loaded value, or None if it doesn't exist
+        """
+        value, remaining = await self._get_with_ttl(key, packed)
+        if value == NEGATIVE_ENTRY:
+            return None
+        if value is not None and (key in self._loads or not self._refresh_early(key, remaining)):
+            return value
+        return await self._load_once(key, loader, ttl, packed, negative_ttl)
+
+    async def _get_with_ttl(self, key: str, packed: bool) -> tuple[Any | None, float | None]:
+        """Get a value and, unless it came from L1, its remaining TTL in seconds."""
+        client = self.redis_binary if packed else self.redis
+        if self.use_redis and client:
+            try:
+                value, ttl = await self._get_raw(client, key, with_ttl=True)
+            except Exception as e:
+                self._record_error(e)
+                return None, None
+            decode: Callable[[Any], Any] = cache_codec.decode if packed else json_codec.loads
+        else:
+            value = await self.in_memory_cache.get(key)
+            remaining = await self.in_memory_cache.ttl(key)
+            ttl = float(remaining) if remaining >= 0 else None
+            decode = cache_codec.decode if packed else (lambda raw: raw)
+        if value is None:
+            return None, None
+        try:
+            return decode(value), ttl
+        except ValueError:
+            return None, None
+
+    def _refresh_early(self, key: str, remaining: float | None) -> bool:
+        """Decide whether to reload a hit before it expires (XFetch)."""
+        load_seconds = self._load_seconds.get(key.split(":", 1)[0])
+        beta = settings.cache_early_refresh_beta
+        if remaining is None or load_seconds is None or not beta:
+            return False
+        return load_seconds * beta * -math.log(1.0 - random.random()) >= remaining
+
+    async def _load_once(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        packed: bool,
+        negative_ttl: int | None,
+    ) -> Any | None:
+        """Run the loader for a key, or wait for the load already in progress."""
+        while (load := self._loads.get(key)) is not None:
+            try:
+                return await asyncio.shield(load)
+            except asyncio.CancelledError:
+                # Load again if the caller running the loader was cancelled
+                task = asyncio.current_task()
+                if not load.cancelled() or (task is not None and task.cancelling()):
+                    raise
+
+        load = asyncio.get_running_loop().create_future()
+        self._loads[key] = load
+        set_value = self.set_packed if packed else self.set
+        try:
+            started = time.monotonic()
+            value = await loader()
+            elapsed = time.monotonic() - started
+            prefix = key.split(":", 1)[0]
+            previous = self._load_seconds.get(prefix)
+            self._load_seconds[prefix] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+
+            if value is not None:
+                await set_value(key, value, ttl)
+            elif negative_ttl:
+                await set_value(key, NEGATIVE_ENTRY, negative_ttl)
+            load.set_result(value)
+            return value
+        except Exception as e:
+            load.set_exception(e)
+            load.exception()  # Retrieved, so it isn't logged when no caller waits
+            raise
+        except BaseException:
+            load.cancel()
+            raise
+        finally:
+            del self._loads[key]
+
     async def delete(self, key: str) -> bool:
         """Delete a key from cache."""
         if self.use_redis and self.redis:
             try:
                 result = await self.redis.delete(key)
+                await self._invalidate(key)
                 return bool(result > 0)
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
+            self._track_degraded_write(key)
             return await self.in_memory_cache.delete(key)
 
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Get several values in one round trip per batch (MGET).
+
+        Returns:
+            Values by key; missing keys are left out
+        """
+        keys = list(dict.fromkeys(keys))
+        if self.use_redis and self.redis:
+            try:
+                values = await self._get_many_raw(self.redis, keys)
+                return {key: json_codec.loads(value) for key, value in values.items()}
+            except Exception as e:
+                self._record_error(e)
+                return {}
+        else:
+            return await self.in_memory_cache.get_many(keys)
+
+    async def set_many(self, mapping: dict[str, Any], ttl: int | None = None) -> bool:
+        """Set several values with the same TTL in one pipeline per batch."""
+        if self.use_redis and self.redis:
+            try:
+                keys = list(mapping)
+                for batch in _batches(keys):
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for key in batch:
+                            serialized_value = json_codec.dumps(mapping[key])
+                            if ttl:
+                                pipe.setex(key, ttl, serialized_value)
+                            else:
+                                pipe.set(key, serialized_value)
+                        await pipe.execute()
+                await self._invalidate(*keys)
+                return True
+            except Exception as e:
+                self._record_error(e)
+                return False
+        else:
+            self._track_degraded_write(*mapping)
+            return await self.in_memory_cache.set_many(mapping, ttl)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys in one round trip per batch.
+
+        Returns:
+            Number of keys deleted
+        """
+        keys = list(dict.fromkeys(keys))
+        if self.use_redis and self.redis:
+            try:
+                deleted = 0
+                for batch in _batches(keys):
+                    deleted += int(await self.redis.delete(*batch))
+                await self._invalidate(*keys)
+                return deleted
+            except Exception as e:
+                self._record_error(e)
+                return 0
+        else:
+            self._track_degraded_write(*keys)
+            return await self.in_memory_cache.delete_many(keys)
+
     async def exists(self, key: str) -> bool:
         """Check if a key exists in cache."""
         if self.use_redis and self.redis:
             try:
                 result = await self.redis.exists(key)
                 return bool(result > 0)
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
             return await self.in_memory_cache.exists(key)
@@ -250,7 +898,8 @@ class CacheService:
             try:
                 result = await self.redis.expire(key, ttl)
                 return bool(result > 0)
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
             return await self.in_memory_cache.expire(key, ttl)
@@ -260,61 +909,220 @@ class CacheService:
         if self.use_redis and self.redis:
             try:
                 return int(await self.redis.ttl(key))
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return -1
         else:
             return await self.in_memory_cache.ttl(key)
 
+    async def ttl_many(self, keys: list[str]) -> dict[str, int]:
+        """Get the remaining TTLs of several keys in one pipeline per batch.
+
+        Returns:
+            TTLs by key, as returned by ttl(); empty if they can't be read
+        """
+        if self.use_redis and self.redis:
+            try:
+                ttls: dict[str, int] = {}
+                for batch in _batches(keys):
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for key in batch:
+                            pipe.ttl(key)
+                        ttls.update(zip(batch, map(int, await pipe.execute()), strict=True))
+                return ttls
+            except Exception as e:
+                self._record_error(e)
+                return {}
+        else:
+            return {key: await self.in_memory_cache.ttl(key) for key in keys}
+
+    async def expire_many(self, keys: list[str], ttl: int) -> int:
+        """Set the expiration time of several keys in one pipeline per batch.
+
+        Returns:
+            Number of keys whose expiration was set
+        """
+        if self.use_redis and self.redis:
+            try:
+                updated = 0
+                for batch in _batches(keys):
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for key in batch:
+                            pipe.expire(key, ttl)
+                        updated += sum(map(bool, await pipe.execute()))
+                return updated
+            except Exception as e:
+                self._record_error(e)
+                return 0
+        else:
+            return sum([await self.in_memory_cache.expire(key, ttl) for key in keys])
+
+    async def scan_iter(self, pattern: str) -> AsyncIterator[str]:
+        """Iterate over the keys matching a pattern.
+
+        Uses SCAN, which walks the keyspace in batches without blocking
+        Redis the way KEYS does. Keys changed during the iteration may or
+        may not be returned.
+        """
+        if self.use_redis and self.redis:
+            async for key in self.redis.scan_iter(match=pattern, count=BATCH_SIZE):
+                yield key
+        else:
+            for key in await self.in_memory_cache.keys(pattern):
+                yield key
+
     async def keys(self, pattern: str) -> list[str]:
         """Get all keys matching a pattern."""
         if self.use_redis and self.redis:
             try:
-                result = await self.redis.keys(pattern)
-                return list(result) if result else []
-            except Exception:
+                return [key async for key in self.scan_iter(pattern)]
+            except Exception as e:
+                self._record_error(e)
                 return []
         else:
             return await self.in_memory_cache.keys(pattern)
 
     async def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching a pattern."""
+        """Delete all keys matching a pattern, one batch of scanned keys at a time."""
         if self.use_redis and self.redis:
             try:
-                keys = await self.keys(pattern)
-                if keys:
-                    result = await self.redis.delete(*keys)
-                    return int(result)
-                return 0
-            except Exception:
-                return 0
+                deleted = await self._delete_scanned(pattern)
+            except Exception as e:
+                self._record_error(e)
+                deleted = 0
+            await self._invalidate(pattern=pattern)
+            return deleted
         else:
+            self._track_degraded_write(pattern=pattern)
             return await self.in_memory_cache.delete_pattern(pattern)
 
+    async def _delete_scanned(self, pattern: str) -> int:
+        """Delete the keys matching a pattern from Redis as they are scanned."""
+        redis = self.redis
+        assert redis is not None
+        deleted = 0
+        batch: list[str] = []
+        async for key in redis.scan_iter(match=pattern, count=BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == BATCH_SIZE:
+                deleted += int(await redis.delete(*batch))
+                batch = []
+        if batch:
+            deleted += int(await redis.delete(*batch))
+        return deleted
+
+    async def memory_report(self, pattern: str) -> dict[str, Any]:
+        """Report the memory used by the keys matching a pattern.
+
+        With Redis, sizes are as reported by MEMORY USAGE (including Redis'
+        own overhead); in memory, they are the sizes of the encoded values.
+        """
+        sizes: list[int] = []
+        if self.use_redis and self.redis:
+            try:
+                async for key in self.scan_iter(pattern):
+                    usage = await self.redis.memory_usage(key)
+                    if usage:
+                        sizes.append(int(usage))
+            except Exception as e:
+                self._record_error(e)
+        else:
+            for key in await self.in_memory_cache.keys(pattern):
+                value = await self.in_memory_cache.get(key)
+                if isinstance(value, (bytes, str)):
+                    sizes.append(len(value))
+                elif value is not None:
+                    sizes.append(len(json_codec.dumps(value)))
+        return {
+            "keys": len(sizes),
+            "total_bytes": sum(sizes),
+            "bytes_per_key": round(sum(sizes) / len(sizes)) if sizes else 0,
+            "max_bytes": max(sizes, default=0),
+        }
+
     async def increment(self, key: str, amount: int = 1) -> int:
         """Increment a numeric value in cache."""
         if self.use_redis and self.redis:
             try:
                 result = await self.redis.incr(key, amount)
+                await self._invalidate(key)
                 return int(result)
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return 0
         else:
             return await self.in_memory_cache.increment(key, amount)
 
+    async def set_if_absent(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        """Set a value only if the key doesn't exist (SET NX).
+
+        Returns:
+            True if the value was set
+        """
+        if self.use_redis and self.redis:
+            try:
+                result = await self.redis.set(key, json_codec.dumps(value), nx=True, ex=ttl)
+                if result:
+                    await self._invalidate(key)
+                return bool(result)
+            except Exception as e:
+                self._record_error(e)
+                return False
+        else:
+            if await self.in_memory_cache.exists(key):
+                return False
+            self._track_degraded_write(key)
+            return await self.in_memory_cache.set(key, value, ttl)
+
+    async def get_generation(self, namespace: str) -> int:
+        """Get the current generation of a cache namespace.
+
+        A namespace without a generation starts at the current time in
+        milliseconds, so a counter lost to eviction can't go back to a
+        generation whose entries are still cached.
+        """
+        key = f"{GENERATION_PREFIX}{namespace}"
+        generation = await self.get(key)
+        if generation is None:
+            await self.set_if_absent(key, int(time.time() * 1000))
+            generation = await self.get(key)
+        return int(generation) if generation is not None else 0
+
+    async def bump_generation(self, namespace: str) -> int:
+        """Invalidate every entry of a namespace at once (see namespaced_key).
+
+        Entries of earlier generations are no longer read and age out by
+        their TTL.
+
+        Returns:
+            The new generation
+        """
+        key = f"{GENERATION_PREFIX}{namespace}"
+        await self.get_generation(namespace)
+        # Dropped from Redis on recovery if bumped while degraded
+        self._track_degraded_write(key)
+        return await self.increment(key)
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        """Build the key of an entry in the current generation of a namespace."""
+        return f"{namespace}{await self.get_generation(namespace)}:{key}"
+
     async def set_hash(self, key: str, mapping: dict[str, Any]) -> bool:
         """Set multiple fields in a hash."""
         if self.use_redis and self.redis:
             try:
                 # Serialize values to JSON
                 serialized_mapping = {
-                    field: json.dumps(value, default=str)
+                    field: json_codec.dumps(value)
                     for field, value in mapping.items()
                 }
                 await self.redis.hset(key, mapping=serialized_mapping)
                 return True
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
+            self._track_degraded_write(key)
             return await self.in_memory_cache.set_hash(key, mapping)
 
     async def get_hash(self, key: str, field: str | None = None) -> dict[str, Any] | Any | None:
@@ -324,15 +1132,16 @@ class CacheService:
                 if field:
                     value = await self.redis.hget(key, field)
                     if value:
-                        return json.loads(value)
+                        return json_codec.loads(value)
                     return None
                 else:
                     values = await self.redis.hgetall(key)
                     return {
-                        field: json.loads(value)
+                        field: json_codec.loads(value)
                         for field, value in values.items()
                     }
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return None if field else {}
         else:
             return await self.in_memory_cache.get_hash(key, field)
@@ -343,11 +1152,48 @@ class CacheService:
             try:
                 result = await self.redis.hdel(key, field)
                 return bool(result > 0)
-            except Exception:
+            except Exception as e:
+                self._record_error(e)
                 return False
         else:
+            self._track_degraded_write(key)
             return await self.in_memory_cache.delete_hash_field(key, field)
 
+    async def acquire_lock(self, key: str, token: str, ttl: int) -> bool:
+        """Acquire a lock key for a token (SET NX with expiry).
+
+        Returns:
+            True if the lock was acquired, False if another token holds it
+        """
+        if self.use_redis and self.redis:
+            try:
+                return bool(await self.redis.set(key, token, nx=True, px=ttl * 1000))
+            except Exception as e:
+                self._record_error(e)
+                return False
+        else:
+            return await self.in_memory_cache.acquire_lock(key, token, ttl)
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock key, only if it is still held by the token."""
+        if self.use_redis and self.redis:
+            try:
+                result = await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+                return bool(result)
+            except Exception as e:
+                self._record_error(e)
+                return False
+        else:
+            return await self.in_memory_cache.release_lock(key, token)
+
+
+# Compare-and-delete, so an expired lock re-acquired by another holder is kept
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 # Global cache service instance
 cache_service = CacheService()
@@ -366,8 +1212,30 @@ CACHE_PREFIXES = {
     "rate_limit": "rate_limit:",
     "api_response": "api:",
     "ai_response": "ai:",
+    "workload": "workload:",
+    "prd_download": "prd_download:",
+    "prd_downloads": "prd_downloads:",
+    "prd_downloads_flush_lock": "prd_downloads_flush_lock:",
+    "presence": "presence:",
+    "turn": "turn:",
+    "turn_lock": "turn_lock:",
+    "stream": "stream:",
+    "stream_session": "stream_session:",
+    "generation": GENERATION_PREFIX,
 }
 
+# Prefixes whose keys embed a generation, so all their entries are
+# invalidated at once by invalidate_namespace()
+NAMESPACES = ("expert", "api_response")
+
+# Locks, counters and state coordinated between workers are never served
+# from a worker's L1 cache
+for _prefix in (
+    "rate_limit", "workload", "prd_downloads", "prd_downloads_flush_lock",
+    "presence", "turn", "turn_lock", "stream", "stream_session",
+):
+    cache_service.mark_strongly_consistent(CACHE_PREFIXES[_prefix])
+
 
 # Convenience functions for common cache operations
 
@@ -376,15 +1244,31 @@ async def cache_session_data(
     data: dict[str, Any],
     ttl: int = 86400 * 7  # 7 days
 ) -> bool:
-    """Cache session data."""
+    """Cache session data (in the compact binary encoding)."""
     key = f"{CACHE_PREFIXES['session']}{session_id}"
-    return await cache_service.set(key, data, ttl)
+    return await cache_service.set_packed(key, data, ttl)
 
 
 async def get_cached_session_data(session_id: str) -> dict[str, Any] | None:
     """Get cached session data."""
     key = f"{CACHE_PREFIXES['session']}{session_id}"
-    return await cache_service.get(key)
+    value = await cache_service.get_packed(key)
+    return None if value == NEGATIVE_ENTRY else value
+
+
+async def get_or_load_session_data(
+    session_id: str,
+    loader: Callable[[], Awaitable[dict[str, Any] | None]],
+    ttl: int = 86400 * 7  # 7 days
+) -> dict[str, Any] | None:
+    """Get cached session data, loading it once for concurrent misses.
+
+    Unknown session IDs are remembered for settings.cache_negative_ttl_seconds.
+    """
+    key = f"{CACHE_PREFIXES['session']}{session_id}"
+    return await cache_service.get_or_load(
+        key, loader, ttl, packed=True, negative_ttl=settings.cache_negative_ttl_seconds
+    )
 
 
 async def delete_cached_session_data(session_id: str) -> bool:
@@ -393,19 +1277,129 @@ async def delete_cached_session_data(session_id: str) -> bool:
     return await cache_service.delete(key)
 
 
+async def get_session_cache_memory_report() -> dict[str, Any]:
+    """Report the memory used by cached sessions."""
+    return await cache_service.memory_report(f"{CACHE_PREFIXES['session']}*")
+
+
 async def cache_expert_data(
     expert_id: str,
     data: dict[str, Any],
     ttl: int = 3600  # 1 hour
 ) -> bool:
     """Cache expert data."""
-    key = f"{CACHE_PREFIXES['expert']}{expert_id}"
+    key = await cache_service.namespaced_key(CACHE_PREFIXES['expert'], expert_id)
     return await cache_service.set(key, data, ttl)
 
 
 async def get_cached_expert_data(expert_id: str) -> dict[str, Any] | None:
     """Get cached expert data."""
-    key = f"{CACHE_PREFIXES['expert']}{expert_id}"
+    key = await cache_service.namespaced_key(CACHE_PREFIXES['expert'], expert_id)
+    return await cache_service.get(key)
+
+
+async def get_or_load_expert_data(
+    expert_id: str,
+    loader: Callable[[], Awaitable[dict[str, Any] | None]],
+    ttl: int = 3600  # 1 hour
+) -> dict[str, Any] | None:
+    """Get cached expert data, loading it once for concurrent misses."""
+    key = await cache_service.namespaced_key(CACHE_PREFIXES['expert'], expert_id)
+    return await cache_service.get_or_load(key, loader, ttl)
+
+
+async def cache_expert_workload(
+    data: dict[str, Any],
+    ttl: int = 3600  # 1 hour
+) -> bool:
+    """Cache the expert workload map."""
+    key = f"{CACHE_PREFIXES['workload']}experts"
+    return await cache_service.set(key, data, ttl)
+
+
+async def get_cached_expert_workload() -> dict[str, Any] | None:
+    """Get the cached expert workload map."""
+    key = f"{CACHE_PREFIXES['workload']}experts"
+    return await cache_service.get(key)
+
+
+async def delete_cached_expert_workload() -> bool:
+    """Delete the cached expert workload map."""
+    key = f"{CACHE_PREFIXES['workload']}experts"
+    return await cache_service.delete(key)
+
+
+async def cache_prd_download(
+    prd_id: str,
+    data: dict[str, Any],
+    ttl: int = 86400  # 24 hours
+) -> bool:
+    """Cache a prepared PRD download (ETag and encoded variants)."""
+    key = f"{CACHE_PREFIXES['prd_download']}{prd_id}"
+    return await cache_service.set(key, data, ttl)
+
+
+async def get_cached_prd_download(prd_id: str) -> dict[str, Any] | None:
+    """Get a cached PRD download."""
+    key = f"{CACHE_PREFIXES['prd_download']}{prd_id}"
+    return await cache_service.get(key)
+
+
+async def increment_prd_download_count(prd_id: str, amount: int = 1) -> int:
+    """Add to the buffered (not yet persisted) download count of a PRD."""
+    key = f"{CACHE_PREFIXES['prd_downloads']}{prd_id}"
+    return await cache_service.increment(key, amount)
+
+
+async def get_pending_prd_download_count(prd_id: str) -> int:
+    """Get the buffered download count of a PRD."""
+    key = f"{CACHE_PREFIXES['prd_downloads']}{prd_id}"
+    value = await cache_service.get(key)
+    return int(value) if value else 0
+
+
+async def get_pending_prd_download_counts() -> dict[str, int]:
+    """Get all buffered PRD download counts keyed by PRD ID."""
+    prefix = CACHE_PREFIXES['prd_downloads']
+    values = await cache_service.get_many(await cache_service.keys(f"{prefix}*"))
+    return {key[len(prefix):]: int(value) for key, value in values.items() if value}
+
+
+async def delete_pending_prd_download_count(prd_id: str) -> bool:
+    """Delete the buffered download count of a PRD."""
+    key = f"{CACHE_PREFIXES['prd_downloads']}{prd_id}"
+    return await cache_service.delete(key)
+
+
+async def acquire_prd_download_flush_lock(token: str, ttl: int = 60) -> bool:
+    """Acquire the cross-worker lock serializing download count flushes."""
+    key = f"{CACHE_PREFIXES['prd_downloads_flush_lock']}all"
+    return await cache_service.acquire_lock(key, token, ttl)
+
+
+async def release_prd_download_flush_lock(token: str) -> bool:
+    """Release the download count flush lock."""
+    key = f"{CACHE_PREFIXES['prd_downloads_flush_lock']}all"
+    return await cache_service.release_lock(key, token)
+
+
+async def cache_turn_result(
+    session_id: str,
+    idempotency_key: str,
+    result: dict[str, Any],
+    ttl: int | None = None
+) -> bool:
+    """Cache the result of a chat turn under its idempotency key."""
+    key = f"{CACHE_PREFIXES['turn']}{session_id}:{idempotency_key}"
+    return await cache_service.set(key, result, ttl or settings.turn_idempotency_ttl_seconds)
+
+
+async def get_cached_turn_result(
+    session_id: str,
+    idempotency_key: str
+) -> dict[str, Any] | None:
+    """Get the cached result of a chat turn by idempotency key."""
+    key = f"{CACHE_PREFIXES['turn']}{session_id}:{idempotency_key}"
     return await cache_service.get(key)
 
 
@@ -417,9 +1411,9 @@ async def cache_api_response(
 ) -> bool:
     """Cache API response."""
     import hashlib
-    params_str = json.dumps(params, sort_keys=True)
-    cache_key = hashlib.md5(f"{endpoint}:{params_str}".encode()).hexdigest()
-    key = f"{CACHE_PREFIXES['api_response']}{cache_key}"
+    params_json = json_codec.dumps(params, sort_keys=True)
+    cache_key = hashlib.md5(endpoint.encode() + b":" + params_json).hexdigest()
+    key = await cache_service.namespaced_key(CACHE_PREFIXES['api_response'], cache_key)
     return await cache_service.set(key, response, ttl)
 
 
@@ -429,12 +1423,21 @@ async def get_cached_api_response(
 ) -> Any | None:
     """Get cached API response."""
     import hashlib
-    params_str = json.dumps(params, sort_keys=True)
-    cache_key = hashlib.md5(f"{endpoint}:{params_str}".encode()).hexdigest()
-    key = f"{CACHE_PREFIXES['api_response']}{cache_key}"
+    params_json = json_codec.dumps(params, sort_keys=True)
+    cache_key = hashlib.md5(endpoint.encode() + b":" + params_json).hexdigest()
+    key = await cache_service.namespaced_key(CACHE_PREFIXES['api_response'], cache_key)
     return await cache_service.get(key)
 
 
+async def invalidate_namespace(namespace: str) -> int:
+    """Invalidate all cache entries of a namespace (see NAMESPACES) at once.
+
+    Returns:
+        The namespace's new generation
+    """
+    return await cache_service.bump_generation(CACHE_PREFIXES[namespace])
+
+
 async def cache_ai_response(
     prompt_hash: str,
     response: Any,
@@ -464,20 +1467,24 @@ async def increment_rate_limit(identifier: str, window_seconds: int = 60) -> int
 
 
 async def clear_expired_cache(pattern: str) -> int:
-    """Clear expired cache entries."""
+    """Clear expired cache entries.
+
+    TTLs are read, and keys deleted or given an expiration, in batches, so
+    the number of Redis round trips grows with batches rather than keys.
+    """
     keys = await cache_service.keys(pattern)
-    cleared = 0
+    ttls = await cache_service.ttl_many(keys)
+
+    expired = [key for key, ttl in ttls.items() if ttl == -1]  # Key doesn't exist (expired)
+    if expired:
+        await cache_service.delete_many(expired)
 
-    for key in keys:
-        ttl = await cache_service.ttl(key)
-        if ttl == -1:  # Key doesn't exist (expired)
-            await cache_service.delete(key)
-            cleared += 1
-        elif ttl == -2:  # No expiration set
-            # Set default expiration
-            await cache_service.expire(key, 3600)
+    # No expiration set: set default expiration
+    persistent = [key for key, ttl in ttls.items() if ttl == -2]
+    if persistent:
+        await cache_service.expire_many(persistent, 3600)
 
-    return cleared
+    return len(expired)
 
 
 __all__ = [
@@ -486,14 +1493,31 @@ __all__ = [
     "cache_service",
     "cache_session_data",
     "get_cached_session_data",
+    "get_or_load_session_data",
     "delete_cached_session_data",
     "cache_expert_data",
     "get_cached_expert_data",
+    "get_or_load_expert_data",
+    "cache_expert_workload",
+    "get_cached_expert_workload",
+    "delete_cached_expert_workload",
+    "cache_prd_download",
+    "get_cached_prd_download",
+    "increment_prd_download_count",
+    "get_pending_prd_download_count",
+    "get_pending_prd_download_counts",
+    "delete_pending_prd_download_count",
+    "acquire_prd_download_flush_lock",
+    "release_prd_download_flush_lock",
+    "cache_turn_result",
+    "get_cached_turn_result",
     "cache_api_response",
     "get_cached_api_response",
+    "invalidate_namespace",
     "cache_ai_response",
     "get_cached_ai_response",
     "increment_rate_limit",
     "clear_expired_cache",
     "CACHE_PREFIXES",
+    "NAMESPACES",
 ]
@@ -1,16 +1,15 @@
 """Google Calendar integration service for appointment booking."""
 from datetime import datetime, timedelta
-from typing import Any
-
-from google.auth.exceptions import RefreshError
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from typing import TYPE_CHECKING, Any
 
 from src.core.config import settings
 
+# The Google client libraries are imported on first use; test and
+# development environments never load them
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
 
 class CalendarService:
     """Service for managing Google Calendar integration and availability."""
@@ -25,7 +24,7 @@ class CalendarService:
         self.google_client_secret = settings.google_client_secret
         self.google_redirect_uri = settings.google_redirect_uri
 
-    def create_oauth_flow(self) -> InstalledAppFlow:
+    def create_oauth_flow(self) -> "InstalledAppFlow":
         """Create OAuth2 flow for expert authentication."""
         # For testing and development, create a mock OAuth flow that simulates Google OAuth
         # In production, this would use actual Google credentials
@@ -44,6 +43,8 @@ class CalendarService:
             return mock_flow
 
         # Production flow
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         flow = InstalledAppFlow.from_client_secrets_file(
             'credentials.json',  # This should be the path to OAuth credentials
             scopes=self.SCOPES,
@@ -51,8 +52,12 @@ class CalendarService:
         )
         return flow
 
-    def get_credentials_from_token(self, refresh_token: str) -> Credentials:
+    def get_credentials_from_token(self, refresh_token: str) -> "Credentials":
         """Get Google credentials from stored refresh token."""
+        from google.auth.exceptions import RefreshError
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
         try:
             creds = Credentials(
                 None,
@@ -71,6 +76,8 @@ class CalendarService:
 
     def get_calendar_service(self, refresh_token: str) -> Any:
         """Get authenticated Google Calendar service."""
+        from googleapiclient.discovery import build
+
         creds = self.get_credentials_from_token(refresh_token)
         return build('calendar', 'v3', credentials=creds)
 
@@ -96,6 +103,8 @@ class CalendarService:
         if settings.environment in ["test", "development"]:
             return await self._get_mock_availability(timezone, days_ahead, min_slots_to_show)
 
+        from googleapiclient.errors import HttpError
+
         try:
             service = self.get_calendar_service(refresh_token)
 
@@ -235,6 +244,8 @@ class CalendarService:
             import random
             return f"mock-event-{random.randint(10000, 99999)}"
 
+        from googleapiclient.errors import HttpError
+
         try:
             service = self.get_calendar_service(refresh_token)
 
@@ -301,6 +312,8 @@ class CalendarService:
         if settings.environment in ["test", "development"]:
             return True
 
+        from googleapiclient.errors import HttpError
+
         try:
             service = self.get_calendar_service(refresh_token)
             service.events().delete(
@@ -0,0 +1,225 @@
+"""Pipelined chat turn handling shared by the streaming transports."""
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.security import sanitize_input, validate_sql_input
+from src.models.session import ConversationSession, Message, MessageRole
+from src.schemas.session import MessageCreate
+from src.services.monitoring_service import monitoring_service
+from src.services.session_service import SessionService
+from src.services.stream_buffer_service import stream_buffer
+from src.services.usage_service import save_llm_usage, track_llm_usage
+
+logger = logging.getLogger(__name__)
+
+# Called with (message_id, offset, chunk)
+ChunkCallback = Callable[[str, int, str], Awaitable[None]]
+CompleteCallback = Callable[[str], Awaitable[None]]
+
+
+class ChatTurnPipeline:
+    """Processes a chat turn, streaming the AI response as early as possible.
+
+    The LLM prompt only depends on the conversation history and the session
+    data extracted from the new message, both known without touching the
+    database. The stream therefore starts right away, while the user message
+    insert, the activity update and the extracted data are persisted
+    concurrently (the database session is used by that one task only until
+    the stream ends).
+
+    The AI message ID is allocated before streaming, and every chunk is
+    buffered under it with its offset once it has been sent, so a client
+    that reconnects can resume the stream from the buffer (see StreamBuffer).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.session_service = SessionService(db)
+
+    async def run(
+        self,
+        session_id: str,
+        content: str,
+        on_chunk: ChunkCallback | None = None,
+        on_complete: CompleteCallback | None = None,
+    ) -> dict[str, Any]:
+        """Process a user message and generate the AI response.
+
+        Args:
+            session_id: The session ID
+            content: The user message content
+            on_chunk: Called with the AI message ID, offset and text of each
+                response chunk as it streams
+            on_complete: Called with the AI message ID once the streamed
+                response is saved (not called for clarification replies)
+
+        Returns:
+            Dict with user_message, ai_message and session data
+
+        Raises:
+            ValueError: If the session does not exist or the content is invalid
+        """
+        started = time.perf_counter()
+        session_service = self.session_service
+
+        session = await session_service.get_session(uuid.UUID(session_id))
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+
+        # Reject invalid content before any response is streamed
+        if not validate_sql_input(sanitize_input(content)):
+            raise ValueError("Invalid content detected")
+
+        conversation_history = [
+            {"role": msg.role, "content": msg.content} for msg in session.messages
+        ]
+
+        # Update session data in memory; it is persisted with the user message
+        session_service.defer_writes = True
+        try:
+            await session_service._extract_user_info(session, content)
+            ambiguity_check = await session_service._check_ambiguity(content, session)
+            if not ambiguity_check["is_ambiguous"]:
+                await session_service._calculate_lead_score(session)
+                await session_service._recommend_service(session)
+        finally:
+            session_service.defer_writes = False
+
+        if ambiguity_check["is_ambiguous"]:
+            user_message = await self._persist_user_turn(session, content)
+            clarification_response = session_service._generate_clarification_response(
+                ambiguity_check, content, session
+            )
+            ai_message = await session_service.add_message(
+                uuid.UUID(session_id),
+                MessageCreate(
+                    content=clarification_response,
+                    meta_data={"type": "clarification", "ambiguous_reason": ambiguity_check["reason"]}
+                ),
+                MessageRole.ASSISTANT,
+            )
+            session = await session_service.get_session(uuid.UUID(session_id))
+            assert session is not None  # Session must exist
+            monitoring_service.record_chat_turn(time.perf_counter() - started)
+            return self._turn_result(user_message, ai_message, session)
+
+        context = {
+            "business_context": session.business_context,
+            "client_info": session.client_info,
+            "qualification": session.qualification,
+            "current_phase": session.current_phase,
+            "lead_score": session.lead_score,
+        }
+
+        persist_task = asyncio.create_task(self._persist_user_turn(session, content))
+        ai_message_id = uuid.uuid4()
+        # Chunks are sent first and buffered in the background
+        buffered = stream_buffer.writer(session_id, str(ai_message_id))
+        full_response = ""
+        offset = 0
+        time_to_first_token = None
+        try:
+            try:
+                with track_llm_usage() as usage:
+                    async for chunk in session_service.ai_service.stream_response(
+                        content, conversation_history, context
+                    ):
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - started
+                        full_response += chunk
+                        if on_chunk:
+                            await on_chunk(str(ai_message_id), offset, chunk)
+                        buffered.append(offset, chunk)
+                        offset += 1
+            except BaseException:
+                # Keep the user message even when the response fails
+                await asyncio.gather(persist_task, return_exceptions=True)
+                raise
+            user_message = await persist_task
+
+            # Saved with the AI message
+            save_llm_usage(self.db, session.id, session.current_phase, usage)
+            ai_message = await session_service.add_message(
+                uuid.UUID(session_id),
+                MessageCreate(content=full_response, meta_data=None),
+                MessageRole.ASSISTANT,
+                message_id=ai_message_id,
+            )
+
+            # Determine and update phase based on collected data
+            new_phase = await session_service._determine_next_phase(session)
+            if new_phase and new_phase != session.current_phase:
+                await session_service.update_session_phase(session, new_phase)
+
+            # Skip the cache: its messages may have been loaded before the AI
+            # message was added, and must not be cached again
+            session = await session_service.get_session(uuid.UUID(session_id), skip_cache=True)
+            assert session is not None  # Session must exist
+
+            await buffered.close()
+        except BaseException:
+            # A client resuming the stream gets a terminal event instead of
+            # waiting for the buffer to expire
+            await buffered.close(failed=True)
+            raise
+        if on_complete:
+            await on_complete(str(ai_message.id))
+
+        total_time = time.perf_counter() - started
+        monitoring_service.record_chat_turn(total_time, time_to_first_token)
+        logger.debug(
+            f"Chat turn for session {session_id}: "
+            f"ttft={time_to_first_token or 0:.3f}s total={total_time:.3f}s"
+        )
+        return self._turn_result(user_message, ai_message, session)
+
+    async def _persist_user_turn(self, session: ConversationSession, content: str) -> Message:
+        """Save the user message, activity and deferred session updates."""
+        session_service = self.session_service
+        user_message = await session_service.add_message(
+            session.id, MessageCreate(content=content, meta_data=None), MessageRole.USER
+        )
+        # Patch the session data first so the activity update only writes
+        # last_activity
+        await session_service.flush_deferred_writes()
+        await session_service.update_session_activity(session)
+        return user_message
+
+    @staticmethod
+    def _turn_result(
+        user_message: Message,
+        ai_message: Message,
+        session: ConversationSession,
+    ) -> dict[str, Any]:
+        """Build the serializable result of a chat turn."""
+        return {
+            "user_message": {
+                "id": str(user_message.id),
+                "role": "user",
+                "content": user_message.content,
+                "created_at": user_message.created_at.isoformat(),
+            },
+            "ai_message": {
+                "id": str(ai_message.id),
+                "role": "assistant",
+                "content": ai_message.content,
+                "created_at": ai_message.created_at.isoformat(),
+                "meta_data": ai_message.meta_data,
+            },
+            "session": {
+                "current_phase": session.current_phase,
+                "client_info": session.client_info,
+                "business_context": session.business_context,
+                "qualification": session.qualification,
+                "lead_score": session.lead_score,
+                "recommended_service": session.recommended_service,
+                "matched_expert_id": str(session.matched_expert_id) if session.matched_expert_id else None,
+                "prd_id": str(session.prd_id) if session.prd_id else None,
+            }
+        }
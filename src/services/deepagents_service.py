@@ -5,9 +5,6 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend
-from deepagents.middleware import FilesystemMiddleware, SubAgentMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
@@ -35,6 +32,15 @@ class DeepAgentsService:
 
     def _create_deep_agents(self):
         """Create the main DeepAgents agent with subagents and tools."""
+        # Imported here so the framework only loads when an agent is built
+        from deepagents import create_deep_agent
+        from deepagents.backends import (
+            CompositeBackend,
+            FilesystemBackend,
+            StateBackend,
+        )
+        from deepagents.middleware import FilesystemMiddleware, SubAgentMiddleware
+
         # Create PRD storage directory
         prd_storage_dir = "prd_documents"
         os.makedirs(prd_storage_dir, exist_ok=True)
@@ -1,15 +1,25 @@
 """Expert service for business logic."""
+import logging
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.database import AsyncSessionLocal
 from src.models.booking import Booking
 from src.models.expert import Expert
 from src.schemas.expert import ExpertCreate, ExpertResponse, ExpertUpdate
-from src.services.cache_service import cache_expert_data, get_cached_expert_data
+from src.services.cache_service import (
+    cache_expert_workload,
+    delete_cached_expert_workload,
+    get_cached_expert_workload,
+    get_or_load_expert_data,
+    invalidate_namespace,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ExpertService:
@@ -76,24 +86,16 @@ class ExpertService:
         Returns:
             The expert or None if not found
         """
-        # Try to get from cache first
-        cached_expert = await get_cached_expert_data(str(expert_id))
-        if cached_expert:
-            # Reconstruct the ExpertResponse from cached data
-            return ExpertResponse(**cached_expert)
+        async def load() -> dict[str, Any] | None:
+            result = await self.db.execute(
+                select(Expert).where(Expert.id == expert_id)
+            )
+            expert = result.scalar_one_or_none()
+            return ExpertResponse.model_validate(expert).model_dump() if expert else None
 
-        # If not cached, get from database
-        result = await self.db.execute(
-            select(Expert).where(Expert.id == expert_id)
-        )
-        expert = result.scalar_one_or_none()
-        if expert:
-            expert_response = ExpertResponse.model_validate(expert)
-            expert_data = expert_response.model_dump()
-            # Cache the expert data
-            await cache_expert_data(str(expert_id), expert_data)
-            return expert_response
-        return None
+        # Concurrent misses share one database load
+        expert_data = await get_or_load_expert_data(str(expert_id), load)
+        return ExpertResponse(**expert_data) if expert_data else None
 
     async def get_expert_model(self, expert_id: uuid.UUID) -> Expert | None:
         """Get an expert model by ID (internal helper for updates).
@@ -133,10 +135,10 @@ class ExpertService:
         if not experts_models:
             return []
 
-        # Get workload counts for all experts
+        # Get workload counts for all experts (incrementally maintained map)
         workload_map = {}
         if workload_balancing:
-            workload_map = await self._get_expert_workload_counts()
+            workload_map = await self.get_workload_map()
 
         # Calculate match scores for each expert
         scored_experts = []
@@ -186,6 +188,112 @@ class ExpertService:
 
         return workload_map
 
+    async def get_workload_map(self) -> dict[uuid.UUID, int]:
+        """Get active booking counts per expert from the cached workload map.
+
+        The map is dropped by adjust_workload() on booking creation and
+        cancellation. It is rebuilt from the database when missing, or when the
+        earliest counted booking has passed its start time.
+
+        Returns:
+            Dictionary mapping expert_id to number of active bookings
+        """
+        cached = await get_cached_expert_workload()
+        if cached and not self._is_workload_stale(cached):
+            return {uuid.UUID(k): int(v) for k, v in cached["counts"].items()}
+
+        return await self.reconcile_workload_counts()
+
+    async def reconcile_workload_counts(self) -> dict[uuid.UUID, int]:
+        """Recompute workload counts from bookings and sync cache and column.
+
+        Returns:
+            Dictionary mapping expert_id to number of active bookings
+        """
+        workload_map = await self._get_expert_workload_counts()
+
+        # Earliest future booking: the next point at which a count drops
+        result = await self.db.execute(
+            select(func.min(Booking.start_time))
+            .where(Booking.status == 'confirmed')
+            .where(Booking.start_time >= datetime.utcnow())
+        )
+        next_transition = result.scalar_one_or_none()
+
+        # Sync the denormalized column where it has drifted
+        stored_counts = await self.db.execute(
+            select(Expert.id, Expert.active_booking_count)
+        )
+        drifted = 0
+        for expert_id, stored_count in stored_counts.all():
+            actual_count = workload_map.get(expert_id, 0)
+            if stored_count != actual_count:
+                await self.db.execute(
+                    update(Expert)
+                    .where(Expert.id == expert_id)
+                    .values(
+                        active_booking_count=actual_count,
+                        updated_at=Expert.updated_at,  # Not a profile edit
+                    )
+                )
+                drifted += 1
+        if drifted:
+            await self.db.commit()
+            logger.info(f"Workload reconciliation corrected {drifted} expert counts")
+
+        await cache_expert_workload({
+            "counts": {str(k): v for k, v in workload_map.items()},
+            "next_transition": (
+                self._to_naive_utc(next_transition).isoformat()
+                if next_transition else None
+            ),
+        })
+
+        return workload_map
+
+    async def adjust_workload(
+        self, expert_id: uuid.UUID, delta: int, start_time: datetime
+    ) -> None:
+        """Apply a booking change to the workload counters.
+
+        Args:
+            expert_id: The expert whose workload changed
+            delta: +1 for a new confirmed booking, -1 for a cancellation
+            start_time: Start time of the affected booking
+        """
+        start_time = self._to_naive_utc(start_time)
+        if start_time < datetime.utcnow():
+            # Past bookings are not part of the active workload
+            return
+
+        await self.db.execute(
+            update(Expert)
+            .where(Expert.id == expert_id)
+            .values(
+                active_booking_count=Expert.active_booking_count + delta,
+                updated_at=Expert.updated_at,
+            )
+        )
+        await self.db.commit()
+
+        # Rebuilt on the next read; updating the cached map in place would
+        # lose concurrent changes
+        await delete_cached_expert_workload()
+
+    def _is_workload_stale(self, cached: dict[str, Any]) -> bool:
+        """Check whether a counted booking has started since the map was built."""
+        next_transition = cached.get("next_transition")
+        if not next_transition:
+            return False
+        return datetime.utcnow() >= datetime.fromisoformat(next_transition)
+
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        """Normalize a datetime to naive UTC (SQLite returns naive values)."""
+        if value.tzinfo is not None:
+            return value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
     def _calculate_workload_penalty(self, expert_id: uuid.UUID, workload_map: dict[uuid.UUID, int]) -> float:
         """Calculate workload penalty based on active bookings.
 
@@ -363,6 +471,7 @@ class ExpertService:
         self.db.add(expert)
         await self.db.commit()
         await self.db.refresh(expert)
+        await invalidate_namespace("expert")
 
         return ExpertResponse.model_validate(expert)
 
@@ -379,6 +488,7 @@ class ExpertService:
         self.db.add(expert)
         await self.db.commit()
         await self.db.refresh(expert)
+        await invalidate_namespace("expert")
         return ExpertResponse.model_validate(expert)
 
     async def delete_expert(self, expert: Expert) -> None:
@@ -389,3 +499,15 @@ class ExpertService:
         """
         await self.db.delete(expert)
         await self.db.commit()
+        await invalidate_namespace("expert")
+
+
+async def run_workload_reconciliation() -> int:
+    """Periodic job: reconcile expert workload counters against bookings.
+
+    Returns:
+        Number of experts with active bookings
+    """
+    async with AsyncSessionLocal() as db:
+        workload_map = await ExpertService(db).reconcile_workload_counts()
+        return len(workload_map)
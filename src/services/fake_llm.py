@@ -0,0 +1,85 @@
+"""Fault-injecting fake LLM for benchmarking provider brownouts locally."""
+import asyncio
+import random
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+
+from src.core.config import settings
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure."""
+
+
+class FaultInjectingLLM:
+    """Stand-in for the chat model with configurable latency and faults.
+
+    Implements the `ainvoke`/`astream` subset AIService uses. Each call
+    independently fails (after the first-token latency) with probability
+    failure_rate, or stalls forever with probability stall_rate, which
+    simulates a provider brownout. Token usage is estimated at four
+    characters per token and reported like the real provider does.
+    """
+
+    def __init__(
+        self,
+        response: str = "Thanks for sharing! Could you tell me more about your project?",
+        first_token_latency: float | None = None,
+        chunk_latency: float = 0.01,
+        failure_rate: float | None = None,
+        stall_rate: float | None = None,
+        seed: int | None = None,
+    ):
+        self.response = response
+        self.first_token_latency = (
+            settings.fake_llm_latency_seconds if first_token_latency is None else first_token_latency
+        )
+        self.chunk_latency = chunk_latency
+        self.failure_rate = settings.fake_llm_failure_rate if failure_rate is None else failure_rate
+        self.stall_rate = settings.fake_llm_stall_rate if stall_rate is None else stall_rate
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    async def _start_call(self) -> None:
+        """Wait out the first-token latency, injecting a fault if drawn."""
+        self.calls += 1
+        draw = self._random.random()
+        await asyncio.sleep(self.first_token_latency)
+        if draw < self.stall_rate:
+            await asyncio.Event().wait()
+        if draw < self.stall_rate + self.failure_rate:
+            raise FakeLLMError("Injected LLM provider failure")
+
+    def _usage(self, messages: Sequence[BaseMessage]) -> UsageMetadata:
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4 + 1
+        output_tokens = len(self.response) // 4 + 1
+        return UsageMetadata(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+
+    def _chunks(self) -> list[str]:
+        words = self.response.split(" ")
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    async def ainvoke(self, messages: Sequence[BaseMessage], **kwargs: Any) -> AIMessage:
+        """Return the canned response."""
+        await self._start_call()
+        await asyncio.sleep(self.chunk_latency * len(self._chunks()))
+        return AIMessage(content=self.response, usage_metadata=self._usage(messages))
+
+    async def astream(
+        self, messages: Sequence[BaseMessage], **kwargs: Any
+    ) -> AsyncIterator[AIMessageChunk]:
+        """Stream the canned response word by word, with usage on the last chunk."""
+        await self._start_call()
+        chunks = self._chunks()
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(self.chunk_latency)
+            usage = self._usage(messages) if i == len(chunks) - 1 else None
+            yield AIMessageChunk(content=chunk, usage_metadata=usage)
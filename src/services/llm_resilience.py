@@ -0,0 +1,288 @@
+"""Circuit breaker, deadlines and hedged requests for LLM calls."""
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from src.core.config import settings
+from src.core.exceptions import LLMOverloadedError, LLMUnavailableError
+from src.services.llm_scheduler import LLMScheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """Fails LLM calls fast after repeated provider failures.
+
+    The breaker is closed while calls succeed. After failure_threshold
+    consecutive failures it opens, and calls are rejected immediately with
+    LLMUnavailableError (callers answer from their fallback templates).
+    After recovery_timeout seconds it is half-open: one probe call is let
+    through, which closes the breaker on success or reopens it on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int | None = None,
+        recovery_timeout: float | None = None,
+    ):
+        self.failure_threshold = failure_threshold or settings.llm_breaker_failure_threshold
+        self.recovery_timeout = recovery_timeout or settings.llm_breaker_recovery_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Metrics
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def check(self) -> None:
+        """Admit a call, or reject it while the breaker is open.
+
+        Raises:
+            LLMUnavailableError: If the breaker is open, or half-open with a
+                probe call already in flight
+        """
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info("LLM circuit breaker half-open, probing provider")
+
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+
+        self.rejected += 1
+        raise LLMUnavailableError()
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self.state != self.CLOSED:
+            logger.info("LLM circuit breaker closed")
+        self.state = self.CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker past the threshold."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"LLM circuit breaker opened after {self.consecutive_failures} "
+                    f"consecutive failures"
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Record the outcome of the call made in the block.
+
+        Exceptions count as failures, except shedding by the scheduler.
+        Cancellation and generator close (BaseException) are not recorded,
+        but release a half-open probe.
+        """
+        try:
+            yield
+        except LLMOverloadedError:
+            self._probe_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self._probe_in_flight = False
+            raise
+        self.record_success()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+async def _next_chunk(stream: AsyncIterator[T]) -> tuple[bool, T | None]:
+    """Await the next chunk of a stream as (has_chunk, chunk)."""
+    try:
+        return True, await stream.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _close_stream(stream: AsyncIterator[Any]) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+async def _cancel_all(tasks: Any) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def hedged_call(
+    call: Callable[[], Awaitable[T]],
+    hedge_delay: float | None,
+    scheduler: LLMScheduler | None = None,
+) -> T:
+    """Run a call, hedging it with a second attempt if it is slow.
+
+    If the first attempt has not finished after hedge_delay seconds, a
+    second identical attempt is started and the first result wins; the
+    other attempt is cancelled. The hedge needs a free scheduler slot, so
+    hedging never queues or adds load beyond the concurrency budget.
+
+    Args:
+        call: Factory starting one attempt
+        hedge_delay: Seconds before hedging, or None to disable hedging
+        scheduler: Scheduler the hedge takes its slot from
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        Exception: The last error if every attempt failed
+    """
+    attempts = {asyncio.ensure_future(call())}
+    hedge_slot = False
+    try:
+        if hedge_delay is not None:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+            if not done and (scheduler is None or scheduler.try_acquire()):
+                hedge_slot = scheduler is not None
+                logger.info(f"Hedging LLM call after {hedge_delay:.2f}s")
+                attempts.add(asyncio.ensure_future(call()))
+
+        error: BaseException | None = None
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = attempt.exception()
+        assert error is not None
+        raise error
+    finally:
+        await _cancel_all(attempts)
+        if hedge_slot and scheduler is not None:
+            scheduler.release()
+
+
+async def guarded_stream(
+    open_stream: Callable[[], AsyncIterator[T]],
+    first_token_timeout: float,
+    timeout: float,
+    hedge_delay: float | None = None,
+    scheduler: LLMScheduler | None = None,
+) -> AsyncIterator[T]:
+    """Stream with a first-token deadline, an overall deadline and hedging.
+
+    If no chunk has arrived after hedge_delay seconds, a second stream is
+    opened (given a free scheduler slot) and whichever produces the first
+    chunk is used; the other is closed.
+
+    Args:
+        open_stream: Factory opening one stream
+        first_token_timeout: Seconds allowed until the first chunk
+        timeout: Seconds allowed for the whole stream
+        hedge_delay: Seconds before hedging, or None to disable hedging
+        scheduler: Scheduler the hedge takes its slot from
+
+    Raises:
+        TimeoutError: If a deadline is missed
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    first_token_deadline = started + min(first_token_timeout, timeout)
+    deadline = started + timeout
+
+    primary = open_stream()
+    streams = [primary]
+    pending = {asyncio.ensure_future(_next_chunk(primary)): primary}
+    winner: AsyncIterator[T] | None = None
+    first: tuple[bool, T | None] = (False, None)
+    hedge_slot = False
+    try:
+        if hedge_delay is not None and hedge_delay < first_token_timeout:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done and (scheduler is None or scheduler.try_acquire()):
+                hedge_slot = scheduler is not None
+                logger.info(f"Hedging LLM stream after {hedge_delay:.2f}s without a first token")
+                hedge = open_stream()
+                streams.append(hedge)
+                pending[asyncio.ensure_future(_next_chunk(hedge))] = hedge
+
+        error: BaseException | None = None
+        while pending and winner is None:
+            remaining = first_token_deadline - loop.time()
+            done, _ = await asyncio.wait(
+                pending, timeout=max(remaining, 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                raise TimeoutError(
+                    f"No first token within {first_token_timeout:.1f}s"
+                )
+            for attempt in done:
+                stream = pending.pop(attempt)
+                if attempt.exception() is None:
+                    winner, first = stream, attempt.result()
+                    break
+                error = attempt.exception()
+        if winner is None:
+            assert error is not None
+            raise error
+    finally:
+        await _cancel_all(list(pending))
+        for stream in streams:
+            if stream is not winner:
+                await _close_stream(stream)
+        if hedge_slot and scheduler is not None:
+            scheduler.release()
+
+    try:
+        has_chunk, chunk = first
+        while has_chunk:
+            yield chunk  # type: ignore[misc]
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"LLM stream exceeded {timeout:.1f}s")
+            has_chunk, chunk = await asyncio.wait_for(_next_chunk(winner), remaining)
+    finally:
+        await _close_stream(winner)
+
+
+# Global LLM circuit breaker instance
+llm_circuit_breaker = CircuitBreaker()
+
+
+def get_llm_circuit_breaker() -> CircuitBreaker:
+    """Get the LLM circuit breaker instance."""
+    return llm_circuit_breaker
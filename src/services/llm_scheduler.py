@@ -0,0 +1,181 @@
+"""Admission control and priority scheduling for LLM calls."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from src.core.config import settings
+from src.core.exceptions import LLMOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# Priority boost by conversation phase: turns closer to a booking go first
+PHASE_PRIORITY = {
+    "greeting": 0,
+    "discovery": 10,
+    "qualification": 30,
+    "prd_generation": 40,
+    "expert_matching": 50,
+    "booking": 60,
+    "confirmation": 60,
+}
+
+# Priority of background generations (PRDs, summaries)
+BACKGROUND_PRIORITY = 0
+
+
+def chat_priority(context: dict[str, Any] | None) -> int:
+    """Get the scheduling priority of a chat turn from its session context.
+
+    Higher values are served first: the phase boost plus the lead score.
+    """
+    if not context:
+        return 0
+    phase = context.get("current_phase") or ""
+    return PHASE_PRIORITY.get(phase, 0) + int(context.get("lead_score") or 0)
+
+
+class LLMScheduler:
+    """Limits concurrent LLM calls and queues the rest by priority.
+
+    Up to max_concurrency calls run at once. Further calls wait in a
+    priority queue (highest priority first, FIFO within a priority). A call
+    is shed with LLMOverloadedError when the queue is full or it has waited
+    longer than max_queue_wait; callers answer with their fallback
+    templates instead.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_queue_depth: int | None = None,
+        max_queue_wait: float | None = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.max_queue_depth = max_queue_depth or settings.llm_max_queue_depth
+        self.max_queue_wait = max_queue_wait or settings.llm_max_queue_wait_seconds
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        # Metrics
+        self.admitted = 0
+        self.shed = 0
+        self._wait_times: deque[float] = deque(maxlen=1000)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, priority: int = 0) -> None:
+        """Wait for an LLM slot.
+
+        Raises:
+            LLMOverloadedError: If the queue is full or the wait times out
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self._record_admission(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue_depth:
+            self._shed(f"queue full ({len(self._waiters)} waiting)")
+
+        started = time.monotonic()
+        slot: asyncio.Future = asyncio.get_running_loop().create_future()
+        entry = (-priority, next(self._sequence), slot)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(slot), self.max_queue_wait)
+        except TimeoutError:
+            # Unless the slot was handed over just as the wait timed out
+            if not (slot.done() and not slot.cancelled()):
+                self._remove_waiter(entry)
+                self._shed(f"waited {self.max_queue_wait:.1f}s")
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # The slot was handed over as the caller was cancelled
+                self.release()
+            else:
+                self._remove_waiter(entry)
+            raise
+        self._record_admission(time.monotonic() - started)
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now, without queueing.
+
+        Returns:
+            True if a slot was taken (release it with release())
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Release an LLM slot, handing it to the highest-priority waiter."""
+        while self._waiters:
+            _, _, slot = heapq.heappop(self._waiters)
+            if not slot.done():
+                slot.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0) -> AsyncIterator[None]:
+        """Hold an LLM slot for the duration of the block.
+
+        Raises:
+            LLMOverloadedError: If the call is shed
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get scheduler metrics (budget use, queue depth, wait times)."""
+        waits = sorted(self._wait_times)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "wait_time": {
+                "average": sum(waits) / len(waits) if waits else 0.0,
+                "p95": waits[int(0.95 * len(waits))] if waits else 0.0,
+                "max": waits[-1] if waits else 0.0,
+            },
+        }
+
+    def _remove_waiter(self, entry: tuple[int, int, asyncio.Future]) -> None:
+        entry[2].cancel()
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+    def _record_admission(self, wait: float) -> None:
+        self.admitted += 1
+        self._wait_times.append(wait)
+
+    def _shed(self, reason: str) -> None:
+        self.shed += 1
+        logger.warning(f"Shedding LLM call: {reason}")
+        raise LLMOverloadedError()
+
+
+# Global LLM scheduler instance
+llm_scheduler = LLMScheduler()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the LLM scheduler instance."""
+    return llm_scheduler
@@ -68,6 +68,10 @@ class MonitoringService:
         self._booking_count: int = 0
         self._expert_match_count: int = 0
 
+        # Chat turn latency (seconds)
+        self._chat_turn_times: deque[float] = deque(maxlen=1000)
+        self._chat_ttft_times: deque[float] = deque(maxlen=1000)
+
         # Health checks
         self._last_health_check: Optional[datetime] = None
         self._health_status: Dict[str, Any] = {}
@@ -138,6 +142,37 @@ class MonitoringService:
         """Record an expert match."""
         self._expert_match_count += 1
 
+    def record_chat_turn(self, total_time: float, time_to_first_token: float | None = None) -> None:
+        """Record the latency of a chat turn.
+
+        Args:
+            total_time: Seconds from receiving the message to the turn being persisted
+            time_to_first_token: Seconds until the first response chunk, if streamed
+        """
+        self._chat_turn_times.append(total_time)
+        if time_to_first_token is not None:
+            self._chat_ttft_times.append(time_to_first_token)
+
+    def get_chat_turn_metrics(self) -> dict[str, Any]:
+        """Get chat turn latency metrics (time to first token and total)."""
+        return {
+            "turns": len(self._chat_turn_times),
+            "time_to_first_token": self._latency_summary(self._chat_ttft_times),
+            "total_turn_time": self._latency_summary(self._chat_turn_times),
+        }
+
+    @staticmethod
+    def _latency_summary(samples: deque) -> dict[str, float]:
+        """Summarize latency samples as average, p50 and p95."""
+        if not samples:
+            return {"average": 0.0, "p50": 0.0, "p95": 0.0}
+        ordered = sorted(samples)
+        return {
+            "average": sum(ordered) / len(ordered),
+            "p50": ordered[int(0.5 * len(ordered))],
+            "p95": ordered[int(0.95 * len(ordered))],
+        }
+
     def get_system_metrics(self) -> SystemMetrics:
         """Get current system metrics."""
         now = datetime.now()
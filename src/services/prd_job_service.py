@@ -0,0 +1,251 @@
+"""Background PRD generation jobs with progress streaming over Socket.IO."""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.database import AsyncSessionLocal
+from src.core.sqlite import QueuedWriteSession
+from src.models.prd import PRDDocument, make_preview_text
+from src.models.session import ConversationSession
+from src.services.prd_service import PRDService
+
+logger = logging.getLogger(__name__)
+
+
+class PRDJobStatus(StrEnum):
+    """PRD generation job status."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class PRDJob:
+    """State of a single PRD generation job."""
+    id: str
+    session_id: uuid.UUID
+    status: PRDJobStatus = PRDJobStatus.PENDING
+    stage: str = "queued"
+    progress: int = 0
+    partial_markdown: str = ""
+    prd_id: uuid.UUID | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: datetime | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    @property
+    def is_active(self) -> bool:
+        """Check if the job is still queued or running."""
+        return self.status in (PRDJobStatus.PENDING, PRDJobStatus.RUNNING)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize job state for API and Socket.IO payloads."""
+        return {
+            "job_id": self.id,
+            "session_id": str(self.session_id),
+            "status": self.status.value,
+            "stage": self.stage,
+            "progress": self.progress,
+            "prd_id": str(self.prd_id) if self.prd_id else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
+
+def build_prd_payload(prd: PRDDocument, prd_service: PRDService) -> dict[str, Any]:
+    """Build the `prd_generated` payload for a PRD document."""
+    filename = prd_service.generate_filename(prd)
+    preview_text = prd.preview_text or make_preview_text(prd.content_markdown)
+
+    return {
+        "prd_id": str(prd.id),
+        "filename": filename,
+        "preview_text": preview_text,
+        "version": prd.version,
+        "storage_url": prd.storage_url,
+    }
+
+
+def session_factory_for(db: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    """Build a job session factory on the same engine as an existing session."""
+    if isinstance(db, QueuedWriteSession):
+        # Writes must go through the shared SQLite write queue
+        return AsyncSessionLocal
+    return async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+class PRDJobManager:
+    """Runs PRD generation as background jobs, one active job per session."""
+
+    def __init__(self, max_finished_jobs: int = 500):
+        self.jobs: dict[str, PRDJob] = {}
+        self._active_by_session: dict[uuid.UUID, str] = {}
+        self.max_finished_jobs = max_finished_jobs
+
+    def submit(
+        self,
+        session_id: uuid.UUID,
+        conversation_summary: str | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> PRDJob:
+        """Start PRD generation for a session, or join the job already running.
+
+        Args:
+            session_id: The conversation session ID
+            conversation_summary: Optional pre-approved conversation summary
+            session_factory: Database session factory for the job
+                (defaults to the application session factory)
+
+        Returns:
+            The new or already active job for the session
+        """
+        active_job_id = self._active_by_session.get(session_id)
+        if active_job_id:
+            active_job = self.jobs.get(active_job_id)
+            if active_job and active_job.is_active:
+                logger.info(f"Joining active PRD job {active_job.id} for session {session_id}")
+                return active_job
+
+        job = PRDJob(id=str(uuid.uuid4()), session_id=session_id)
+        self.jobs[job.id] = job
+        self._active_by_session[session_id] = job.id
+        self._prune_finished_jobs()
+
+        job.task = asyncio.create_task(
+            self._run(job, conversation_summary, session_factory or AsyncSessionLocal)
+        )
+        logger.info(f"Started PRD job {job.id} for session {session_id}")
+        return job
+
+    def get_job(self, job_id: str) -> PRDJob | None:
+        """Get a job by ID."""
+        return self.jobs.get(job_id)
+
+    def get_active_job_for_session(self, session_id: uuid.UUID) -> PRDJob | None:
+        """Get the queued or running job for a session, if any."""
+        job_id = self._active_by_session.get(session_id)
+        job = self.jobs.get(job_id) if job_id else None
+        return job if job and job.is_active else None
+
+    async def wait(self, job: PRDJob, timeout: float | None = None) -> PRDJob:
+        """Wait for a job to finish.
+
+        Raises:
+            asyncio.TimeoutError: If the job does not finish within timeout
+        """
+        if job.task and not job.task.done():
+            await asyncio.wait_for(asyncio.shield(job.task), timeout)
+        return job
+
+    async def shutdown(self) -> None:
+        """Cancel all running jobs."""
+        tasks = [job.task for job in self.jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(
+        self,
+        job: PRDJob,
+        conversation_summary: str | None,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Run a PRD generation job and stream its progress."""
+        job.status = PRDJobStatus.RUNNING
+        await self._update(job, "started", 5)
+
+        async def on_progress(stage: str, progress: int, chunk: str) -> None:
+            job.partial_markdown += chunk
+            await self._update(job, stage, progress, chunk)
+
+        try:
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(ConversationSession).where(ConversationSession.id == job.session_id)
+                )
+                session = result.scalar_one_or_none()
+                if not session:
+                    raise ValueError(f"Session {job.session_id} not found")
+
+                prd_service = PRDService(db)
+                prd = await prd_service.generate_prd(
+                    session, conversation_summary, progress_callback=on_progress
+                )
+                job.prd_id = prd.id
+                job.result = build_prd_payload(prd, prd_service)
+
+            job.status = PRDJobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            job.partial_markdown = ""
+            await self._update(job, "completed", 100)
+            await self._emit("prd_generated", job, job.result)
+            logger.info(f"PRD job {job.id} completed: PRD {job.prd_id}")
+        except asyncio.CancelledError:
+            job.status = PRDJobStatus.FAILED
+            job.error = "cancelled"
+            job.completed_at = datetime.utcnow()
+            raise
+        except Exception as e:
+            job.status = PRDJobStatus.FAILED
+            job.error = str(e)
+            job.completed_at = datetime.utcnow()
+            logger.error(f"PRD job {job.id} failed: {e}")
+            await self._emit("prd_failed", job, {
+                "job_id": job.id,
+                "message": "Failed to generate PRD",
+            })
+        finally:
+            if self._active_by_session.get(job.session_id) == job.id:
+                del self._active_by_session[job.session_id]
+
+    async def _update(self, job: PRDJob, stage: str, progress: int, chunk: str = "") -> None:
+        """Record job progress and stream it to the session room."""
+        job.stage = stage
+        job.progress = max(job.progress, progress)
+        await self._emit("prd_progress", job, {
+            "job_id": job.id,
+            "stage": job.stage,
+            "progress": job.progress,
+            "chunk": chunk,
+        })
+
+    async def _emit(self, event: str, job: PRDJob, payload: dict[str, Any] | None) -> None:
+        """Emit a Socket.IO event to the job's session room (best effort)."""
+        try:
+            from src.api.routes.websocket import sio
+            await sio.emit(event, payload, room=str(job.session_id))
+        except Exception as e:
+            logger.debug(f"Could not emit {event} for PRD job {job.id}: {e}")
+
+    def _prune_finished_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit."""
+        finished = [job for job in self.jobs.values() if not job.is_active]
+        excess = len(finished) - self.max_finished_jobs
+        if excess <= 0:
+            return
+        finished.sort(key=lambda j: j.completed_at or j.created_at)
+        for job in finished[:excess]:
+            del self.jobs[job.id]
+
+
+# Global job manager instance
+prd_job_manager = PRDJobManager()
+
+
+def get_prd_job_manager() -> PRDJobManager:
+    """Get the PRD job manager instance."""
+    return prd_job_manager
@@ -1,13 +1,71 @@
 """PRD (Project Requirements Document) service for generation and management."""
+import base64
+import gzip
+import hashlib
+import logging
 import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC
+from email.utils import format_datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
 from src.models.prd import PRDDocument
 from src.models.session import ConversationSession, Message
-from src.services.ai_service import AIService
+from src.services.ai_service import (
+    AIService,
+    fingerprint_inputs,
+    hash_conversation_history,
+)
+from src.services.cache_service import (
+    acquire_prd_download_flush_lock,
+    cache_ai_response,
+    cache_prd_download,
+    delete_pending_prd_download_count,
+    get_cached_ai_response,
+    get_cached_prd_download,
+    get_pending_prd_download_count,
+    get_pending_prd_download_counts,
+    increment_prd_download_count,
+    release_prd_download_flush_lock,
+)
+from src.services.usage_service import save_llm_usage, track_llm_usage
+from src.utils.text_delta import apply_delta, encode_delta
+
+# Brotli is optional; downloads fall back to gzip without it
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Callback receiving (stage, progress percent, markdown chunk)
+PRDProgressCallback = Callable[[str, int, str], Awaitable[None]]
+
+# Typical PRD length, used to estimate streaming progress
+EXPECTED_PRD_LENGTH = 4000
+
+# Columns loaded for previews and version listings (no content)
+PRD_METADATA_COLUMNS = (
+    PRDDocument.session_id,
+    PRDDocument.version,
+    PRDDocument.preview_text,
+    PRDDocument.content_length,
+    PRDDocument.client_company,
+    PRDDocument.client_name,
+    PRDDocument.storage_url,
+    PRDDocument.download_count,
+    PRDDocument.created_at,
+)
 
 
 class PRDService:
@@ -46,6 +104,20 @@ class PRDService:
             # Fallback summary
             return self._fallback_summary(session)
 
+        # Identical inputs reuse the previous summary
+        cache_key = fingerprint_inputs(
+            "summary",
+            model=self.ai_service.model_name,
+            client_info=session.client_info,
+            business_context=session.business_context,
+            qualification=session.qualification,
+            recommended_service=session.recommended_service,
+            history=hash_conversation_history(conversation_history),
+        )
+        cached = await get_cached_ai_response(cache_key)
+        if cached:
+            return str(cached)
+
         prompt = f"""Generate a concise summary of this business discovery conversation.
 
 Client Info:
@@ -71,18 +143,18 @@ Format as a clear, professional summary (3-5 bullet points)."""
 
         from langchain_core.messages import HumanMessage, SystemMessage
         try:
-            response = await self.ai_service.llm.ainvoke([
+            content = await self.ai_service.invoke_llm([
                 SystemMessage(content="You are an expert at summarizing business discovery conversations. Create concise, professional summaries."),
                 HumanMessage(content=prompt)
             ])
-            content = response.content
-            # Ensure content is a string
-            if isinstance(content, list):
-                return str(content)
-            return str(content)
         except Exception:
             return self._fallback_summary(session)
 
+        # Ensure content is a string
+        summary = str(content)
+        await cache_ai_response(cache_key, summary, settings.ai_response_cache_ttl_seconds)
+        return summary
+
     def _fallback_summary(self, session: ConversationSession) -> str:
         """Fallback summary when AI service is unavailable."""
         name = session.client_info.get("name", "N/A")
@@ -102,12 +174,19 @@ Format as a clear, professional summary (3-5 bullet points)."""
 • **Timeline:** {timeline}
 • **Recommended Service:** {service}"""
 
-    async def generate_prd(self, session: ConversationSession, conversation_summary: str | None = None) -> PRDDocument:
+    async def generate_prd(
+        self,
+        session: ConversationSession,
+        conversation_summary: str | None = None,
+        progress_callback: PRDProgressCallback | None = None,
+    ) -> PRDDocument:
         """Generate a PRD for a session.
 
         Args:
             session: The conversation session to generate PRD for
             conversation_summary: Optional pre-approved conversation summary
+            progress_callback: Optional callback for progress and partial
+                Markdown; when set, the PRD content is streamed
 
         Returns:
             The generated PRD document
@@ -133,16 +212,26 @@ Format as a clear, professional summary (3-5 bullet points)."""
                 "content": msg.content
             })
 
-        # Use provided summary or generate one
-        if not conversation_summary:
-            conversation_summary = await self.generate_conversation_summary(session)
-
-        # Generate PRD content using AI service
-        prd_content = await self.ai_service.generate_prd(
-            business_context=session.business_context,
-            client_info=session.client_info,
-            conversation_history=conversation_history
-        )
+        with track_llm_usage() as usage:
+            # Use provided summary or generate one
+            if not conversation_summary:
+                if progress_callback:
+                    await progress_callback("summarizing", 10, "")
+                conversation_summary = await self.generate_conversation_summary(session)
+
+            # Generate PRD content using AI service
+            if progress_callback:
+                prd_content = await self._stream_prd_content(
+                    session, conversation_history, progress_callback
+                )
+            else:
+                prd_content = await self.ai_service.generate_prd(
+                    business_context=session.business_context,
+                    client_info=session.client_info,
+                    conversation_history=conversation_history
+                )
+        # Saved with the PRD
+        save_llm_usage(self.db, session.id, session.current_phase, usage, operation="prd")
 
         # Create PRD document
         prd = PRDDocument(
@@ -176,6 +265,29 @@ Format as a clear, professional summary (3-5 bullet points)."""
 
         return prd
 
+    async def _stream_prd_content(
+        self,
+        session: ConversationSession,
+        conversation_history: list[dict[str, str]],
+        progress_callback: PRDProgressCallback,
+    ) -> str:
+        """Stream PRD content from the AI service, reporting each chunk."""
+        await progress_callback("generating", 30, "")
+
+        prd_content = ""
+        async for chunk in self.ai_service.stream_prd(
+            business_context=session.business_context,
+            client_info=session.client_info,
+            conversation_history=conversation_history,
+        ):
+            prd_content += chunk
+            # Generation spans 30-90%, estimated from typical PRD length
+            progress = 30 + min(60, int(60 * len(prd_content) / EXPECTED_PRD_LENGTH))
+            await progress_callback("generating", progress, chunk)
+
+        await progress_callback("saving", 95, "")
+        return prd_content
+
     async def get_prd(self, prd_id: uuid.UUID) -> PRDDocument | None:
         """Get a PRD by ID.
 
@@ -190,10 +302,13 @@ Format as a clear, professional summary (3-5 bullet points)."""
             .where(PRDDocument.id == prd_id)
             .options(selectinload(PRDDocument.expert))
         )
-        return result.scalar_one_or_none()
+        prd = result.scalar_one_or_none()
+        if prd:
+            await self._restore_content(prd)
+        return prd
 
     async def get_prd_by_session(self, session_id: uuid.UUID) -> PRDDocument | None:
-        """Get PRD by session ID.
+        """Get the latest PRD version for a session.
 
         Args:
             session_id: The session ID
@@ -204,10 +319,86 @@ Format as a clear, professional summary (3-5 bullet points)."""
         result = await self.db.execute(
             select(PRDDocument)
             .where(PRDDocument.session_id == session_id)
+            .order_by(PRDDocument.version.desc())
+            .limit(1)
             .options(selectinload(PRDDocument.expert))
         )
+        prd = result.scalar_one_or_none()
+        if prd:
+            await self._restore_content(prd)
+        return prd
+
+    async def get_prd_metadata(self, prd_id: uuid.UUID) -> PRDDocument | None:
+        """Get a PRD's metadata and preview without loading its content.
+
+        Args:
+            prd_id: The PRD ID
+
+        Returns:
+            The PRD document with only metadata columns loaded, or None
+        """
+        result = await self.db.execute(
+            select(PRDDocument)
+            .where(PRDDocument.id == prd_id)
+            .options(load_only(*PRD_METADATA_COLUMNS, raiseload=True))
+        )
         return result.scalar_one_or_none()
 
+    async def list_versions(self, session_id: uuid.UUID) -> list[PRDDocument]:
+        """List all PRD versions of a session without loading their content.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            PRD documents with only metadata columns loaded, oldest first
+        """
+        result = await self.db.execute(
+            select(PRDDocument)
+            .where(PRDDocument.session_id == session_id)
+            .order_by(PRDDocument.version)
+            .options(load_only(*PRD_METADATA_COLUMNS, raiseload=True))
+        )
+        return list(result.scalars().all())
+
+    async def _restore_content(self, prd: PRDDocument) -> None:
+        """Rebuild the content of a delta-stored version from newer versions."""
+        if prd.content_markdown is not None or prd.content_delta is None:
+            return
+
+        deltas = [prd.content_delta]
+        base_id = prd.delta_base_id
+        while True:
+            result = await self.db.execute(
+                select(
+                    PRDDocument.content_markdown,
+                    PRDDocument.content_delta,
+                    PRDDocument.delta_base_id,
+                ).where(PRDDocument.id == base_id)
+            )
+            base = result.one_or_none()
+            if base is None:
+                raise ValueError(f"Base version {base_id} of PRD {prd.id} not found")
+            if base.content_markdown is not None:
+                content = base.content_markdown
+                break
+            deltas.append(base.content_delta)
+            base_id = base.delta_base_id
+
+        for delta in reversed(deltas):
+            content = apply_delta(content, delta)
+        set_committed_value(prd, "content_markdown", content)
+
+    async def _store_as_delta(self, prd: PRDDocument, base: PRDDocument) -> None:
+        """Replace a superseded version's content with a delta against its successor."""
+        delta = encode_delta(base.content_markdown, prd.content_markdown)
+        await self.db.execute(
+            update(PRDDocument)
+            .where(PRDDocument.id == prd.id)
+            .values(content_markdown=None, content_delta=delta, delta_base_id=base.id)
+        )
+        await self.db.commit()
+
     async def increment_download_count(self, prd: PRDDocument) -> None:
         """Increment download count for a PRD.
 
@@ -219,6 +410,127 @@ Format as a clear, professional summary (3-5 bullet points)."""
         await self.db.commit()
         await self.db.refresh(prd)
 
+    async def record_download(self, prd_id: uuid.UUID) -> None:
+        """Record a PRD download in the cache-buffered download counter.
+
+        Buffered counts are persisted by `flush_download_counts`.
+
+        Args:
+            prd_id: The PRD ID
+        """
+        await increment_prd_download_count(str(prd_id))
+
+    async def get_download_count(self, prd: PRDDocument) -> int:
+        """Get the download count of a PRD, including unflushed downloads.
+
+        Args:
+            prd: The PRD document
+
+        Returns:
+            Total download count
+        """
+        return prd.download_count + await get_pending_prd_download_count(str(prd.id))
+
+    async def flush_download_counts(self) -> int:
+        """Persist buffered download counts to the database.
+
+        Flushes are serialized across workers by a cache lock, so a count
+        is never added to the database twice.
+
+        Returns:
+            Number of downloads flushed (0 if another worker is flushing)
+        """
+        token = uuid.uuid4().hex
+        if not await acquire_prd_download_flush_lock(token):
+            return 0
+        try:
+            return await self._flush_download_counts()
+        finally:
+            await release_prd_download_flush_lock(token)
+
+    async def _flush_download_counts(self) -> int:
+        """Persist buffered download counts while holding the flush lock."""
+        counts = {
+            prd_id: count
+            for prd_id, count in (await get_pending_prd_download_counts()).items()
+            if count > 0
+        }
+        if not counts:
+            return 0
+
+        for prd_id, count in counts.items():
+            await self.db.execute(
+                update(PRDDocument)
+                .where(PRDDocument.id == uuid.UUID(prd_id))
+                .values(download_count=PRDDocument.download_count + count)
+            )
+        await self.db.commit()
+
+        # Subtract only what was persisted; downloads during the flush stay buffered
+        for prd_id, count in counts.items():
+            remaining = await increment_prd_download_count(prd_id, -count)
+            if remaining <= 0:
+                await delete_pending_prd_download_count(prd_id)
+
+        return sum(counts.values())
+
+    async def get_download(self, prd_id: uuid.UUID) -> dict[str, Any] | None:
+        """Get a prepared PRD download, building and caching it on first use.
+
+        PRD documents are immutable (regeneration creates a new version with
+        a new ID), so the prepared download is cached per PRD ID.
+
+        Args:
+            prd_id: The PRD ID
+
+        Returns:
+            Download data (filename, etag, last_modified, size and base64
+            encoded variants by content coding) or None if not found
+        """
+        download = await get_cached_prd_download(str(prd_id))
+        if download:
+            return download
+
+        prd = await self.get_prd(prd_id)
+        if not prd:
+            return None
+
+        download = self.build_download(prd)
+        await cache_prd_download(str(prd_id), download)
+        return download
+
+    def build_download(self, prd: PRDDocument) -> dict[str, Any]:
+        """Build the download representation of a PRD.
+
+        Args:
+            prd: The PRD document
+
+        Returns:
+            Download data with a content-hash ETag and precompressed variants
+        """
+        content = prd.content_markdown.encode("utf-8")
+        created_at = prd.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+
+        encoded = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            encoded["br"] = brotli.compress(content, quality=11)
+
+        variants = {"identity": base64.b64encode(content).decode("ascii")}
+        for coding, body in encoded.items():
+            # Tiny documents can grow when compressed
+            if len(body) < len(content):
+                variants[coding] = base64.b64encode(body).decode("ascii")
+
+        return {
+            "filename": self.generate_filename(prd),
+            "etag": f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+            "last_modified": format_datetime(created_at, usegmt=True),
+            "size": len(content),
+            "variants": variants,
+        }
+
     async def regenerate_prd(
         self,
         session: ConversationSession,
@@ -236,6 +548,7 @@ Format as a clear, professional summary (3-5 bullet points)."""
         # Get existing PRD version if any
         existing_version = 1
         existing_summary = None
+        existing_prd = None
         if session.prd_id:
             existing_prd = await self.get_prd(session.prd_id)
             if existing_prd:
@@ -258,12 +571,15 @@ Format as a clear, professional summary (3-5 bullet points)."""
             })
 
         # Generate new PRD content using AI service
-        prd_content = await self.ai_service.generate_prd(
-            business_context=session.business_context,
-            client_info=session.client_info,
-            conversation_history=conversation_history,
-            feedback=feedback
-        )
+        with track_llm_usage() as usage:
+            prd_content = await self.ai_service.generate_prd(
+                business_context=session.business_context,
+                client_info=session.client_info,
+                conversation_history=conversation_history,
+                feedback=feedback
+            )
+        # Saved with the new PRD
+        save_llm_usage(self.db, session.id, session.current_phase, usage, operation="prd")
 
         # Create new PRD document with incremented version
         new_prd = PRDDocument(
@@ -287,6 +603,10 @@ Format as a clear, professional summary (3-5 bullet points)."""
         await self.db.commit()
         await self.db.refresh(new_prd)
 
+        # Keep only the latest version in full
+        if existing_prd and existing_prd.content_delta is None:
+            await self._store_as_delta(existing_prd, new_prd)
+
         # Update session with new PRD ID
         session.prd_id = new_prd.id
         await self.db.merge(session)
@@ -310,3 +630,16 @@ Format as a clear, professional summary (3-5 bullet points)."""
         company = prd.client_company or "Project"
         date = prd.created_at.strftime("%Y%m%d")
         return f"PRD_{company}_{date}_v{prd.version}.md"
+
+
+async def flush_prd_download_counts() -> int:
+    """Periodic job: persist buffered PRD download counts.
+
+    Returns:
+        Number of downloads flushed
+    """
+    async with AsyncSessionLocal() as db:
+        flushed = await PRDService(db).flush_download_counts()
+        if flushed:
+            logger.info(f"Flushed {flushed} buffered PRD downloads")
+        return flushed
@@ -0,0 +1,122 @@
+"""Lightweight in-process scheduler for periodic background jobs."""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """A coroutine function run on a fixed interval."""
+    name: str
+    interval_seconds: float
+    func: Callable[[], Awaitable[Any]]
+    run_on_start: bool = False
+    last_run_at: datetime | None = None
+    last_error: str | None = None
+    run_count: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class SchedulerService:
+    """Runs registered periodic jobs as asyncio tasks for the process lifetime."""
+
+    def __init__(self):
+        self.jobs: dict[str, PeriodicJob] = {}
+        self._running: bool = False
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Awaitable[Any]],
+        run_on_start: bool = False,
+    ) -> PeriodicJob:
+        """Register a periodic job (replaces any job with the same name)."""
+        job = PeriodicJob(
+            name=name,
+            interval_seconds=interval_seconds,
+            func=func,
+            run_on_start=run_on_start,
+        )
+        existing = self.jobs.get(name)
+        if existing and existing.task:
+            existing.task.cancel()
+        self.jobs[name] = job
+        if self._running:
+            job.task = asyncio.create_task(self._run_job(job))
+        return job
+
+    async def run_job_now(self, name: str) -> Any:
+        """Run a registered job immediately, outside its schedule."""
+        job = self.jobs[name]
+        return await self._execute(job)
+
+    async def start(self) -> None:
+        """Start all registered jobs."""
+        if self._running:
+            return
+        self._running = True
+        for job in self.jobs.values():
+            job.task = asyncio.create_task(self._run_job(job))
+
+    async def stop(self) -> None:
+        """Cancel all running jobs and wait for them to finish."""
+        self._running = False
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
+
+    def get_status(self) -> dict[str, dict[str, Any]]:
+        """Get status of all registered jobs."""
+        return {
+            name: {
+                "interval_seconds": job.interval_seconds,
+                "run_count": job.run_count,
+                "last_run_at": job.last_run_at.isoformat() if job.last_run_at else None,
+                "last_error": job.last_error,
+                "running": job.task is not None and not job.task.done(),
+            }
+            for name, job in self.jobs.items()
+        }
+
+    async def _run_job(self, job: PeriodicJob) -> None:
+        """Loop for a single job."""
+        if not job.run_on_start:
+            await asyncio.sleep(job.interval_seconds)
+        while True:
+            await self._execute(job)
+            await asyncio.sleep(job.interval_seconds)
+
+    async def _execute(self, job: PeriodicJob) -> Any:
+        """Execute a job once, recording the outcome."""
+        try:
+            result = await job.func()
+            job.last_error = None
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.last_error = str(e)
+            logger.error(f"Background job {job.name} failed: {e}")
+            return None
+        finally:
+            job.last_run_at = datetime.utcnow()
+            job.run_count += 1
+
+
+# Global scheduler instance
+scheduler_service = SchedulerService()
+
+
+def get_scheduler_service() -> SchedulerService:
+    """Get the scheduler service instance."""
+    return scheduler_service
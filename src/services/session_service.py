@@ -4,11 +4,13 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.core.security import sanitize_input, validate_sql_input
+from src.core.types import json_merge
 from src.models.session import (
     ConversationSession,
     Message,
@@ -19,15 +21,18 @@ from src.models.session import (
 from src.schemas.session import MessageCreate, SessionCreate
 from src.services.ai_service import AIService
 from src.services.cache_service import (
-    cache_session_data,
     delete_cached_session_data,
-    get_cached_session_data,
+    get_or_load_session_data,
 )
 from src.services.expert_service import ExpertService
 from src.services.template_service import TemplateService
+from src.services.usage_service import save_llm_usage, track_llm_usage
 
 logger = logging.getLogger(__name__)
 
+# Session fields holding JSON objects, updated by merging in new keys
+_JSON_FIELDS = frozenset({"client_info", "business_context", "qualification"})
+
 
 class SessionService:
     """Service for managing conversation sessions and messages."""
@@ -36,6 +41,11 @@ class SessionService:
         self.db = db
         self.ai_service = AIService()
         self.template_service = TemplateService(db)
+        # When set, update_session_data only updates the session in memory;
+        # flush_deferred_writes() persists the changes in one commit
+        self.defer_writes = False
+        self._deferred_session: ConversationSession | None = None
+        self._deferred_updates: dict[str, Any] = {}
 
     async def create_session(self, session_create: SessionCreate) -> ConversationSession:
         """Create a new conversation session with sanitized inputs."""
@@ -102,61 +112,74 @@ class SessionService:
             session_id: The session ID to retrieve
             skip_cache: If True, bypass the cache and fetch from database directly
         """
-        # Try to get from cache first (unless skipped)
-        if not skip_cache:
-            cached_session = await get_cached_session_data(str(session_id))
-            if cached_session:
-                # Reconstruct the session object from cached data
-                return self._reconstruct_session_from_cache(cached_session)
-
-        # If not cached (or cache skipped), get from database
+        if skip_cache:
+            return await self._load_session(session_id, populate_existing=True)
+
+        # Concurrent misses share one database load; a session loaded by
+        # this call is returned as loaded, others are rebuilt from the cache
+        loaded: ConversationSession | None = None
+
+        async def load() -> dict[str, Any] | None:
+            nonlocal loaded
+            loaded = await self._load_session(session_id)
+            return self._session_cache_data(loaded) if loaded else None
+
+        cached_session = await get_or_load_session_data(str(session_id), load)
+        if loaded is not None:
+            return loaded
+        if cached_session:
+            # Reconstruct the session object from cached data
+            return self._reconstruct_session_from_cache(cached_session)
+        return None
+
+    async def _load_session(
+        self, session_id: uuid.UUID, populate_existing: bool = False
+    ) -> ConversationSession | None:
+        """Load a session with its messages from the database."""
         result = await self.db.execute(
             select(ConversationSession)
             .where(ConversationSession.id == session_id)
             .options(
                 selectinload(ConversationSession.messages),
             )
+            # A fresh read must also reload a session already in the session
+            .execution_options(populate_existing=populate_existing)
         )
-        session = result.scalar_one_or_none()
-
-        # Cache the session data if found (and cache not skipped)
-        if session and not skip_cache:
-            await cache_session_data(
-                str(session_id),
+        return result.scalar_one_or_none()
+
+    def _session_cache_data(self, session: ConversationSession) -> dict[str, Any]:
+        """Build the cached representation of a session."""
+        return {
+            "id": str(session.id),
+            "visitor_id": session.visitor_id,
+            "status": session.status,
+            "current_phase": session.current_phase,
+            "client_info": session.client_info,
+            "business_context": session.business_context,
+            "qualification": session.qualification,
+            "email_opt_in": session.email_opt_in,
+            "email_preferences": session.email_preferences,
+            "started_at": session.started_at.isoformat() if session.started_at else None,
+            "last_activity": session.last_activity.isoformat() if session.last_activity else None,
+            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+            "source_url": session.source_url,
+            "user_agent": session.user_agent,
+            "lead_score": session.lead_score,
+            "recommended_service": session.recommended_service,
+            "matched_expert_id": str(session.matched_expert_id) if session.matched_expert_id else None,
+            "prd_id": str(session.prd_id) if session.prd_id else None,
+            "booking_id": str(session.booking_id) if session.booking_id else None,
+            "messages": [
                 {
-                    "id": str(session.id),
-                    "visitor_id": session.visitor_id,
-                    "status": session.status,
-                    "current_phase": session.current_phase,
-                    "client_info": session.client_info,
-                    "business_context": session.business_context,
-                    "qualification": session.qualification,
-                    "email_opt_in": session.email_opt_in,
-                    "email_preferences": session.email_preferences,
-                    "started_at": session.started_at.isoformat() if session.started_at else None,
-                    "last_activity": session.last_activity.isoformat() if session.last_activity else None,
-                    "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-                    "source_url": session.source_url,
-                    "user_agent": session.user_agent,
-                    "lead_score": session.lead_score,
-                    "recommended_service": session.recommended_service,
-                    "matched_expert_id": str(session.matched_expert_id) if session.matched_expert_id else None,
-                    "prd_id": str(session.prd_id) if session.prd_id else None,
-                    "booking_id": str(session.booking_id) if session.booking_id else None,
-                    "messages": [
-                        {
-                            "id": str(m.id),
-                            "role": m.role,
-                            "content": m.content,
-                            "meta_data": m.meta_data,
-                            "created_at": m.created_at.isoformat()
-                        }
-                        for m in session.messages
-                    ]
+                    "id": str(m.id),
+                    "role": m.role,
+                    "content": m.content,
+                    "meta_data": m.meta_data,
+                    "created_at": m.created_at.isoformat()
                 }
-            )
-
-        return session
+                for m in session.messages
+            ]
+        }
 
     def _reconstruct_session_from_cache(self, cached_data: dict) -> ConversationSession:
         """Reconstruct a ConversationSession object from cached data."""
@@ -216,9 +239,17 @@ class SessionService:
         await delete_cached_session_data(str(merged_session.id))
 
     async def add_message(
-        self, session_id: uuid.UUID, message_create: MessageCreate, role: MessageRole
+        self,
+        session_id: uuid.UUID,
+        message_create: MessageCreate,
+        role: MessageRole,
+        message_id: uuid.UUID | None = None,
     ) -> Message:
-        """Add a message to a session with input sanitization."""
+        """Add a message to a session with input sanitization.
+
+        A message_id can be given when the ID must be known before the
+        message is saved (e.g. to label streamed response chunks).
+        """
         # Sanitize content to prevent XSS
         sanitized_content = sanitize_input(message_create.content)
 
@@ -233,6 +264,8 @@ class SessionService:
             meta_data=message_create.meta_data or {},
             created_at=datetime.utcnow(),
         )
+        if message_id:
+            message.id = message_id
         self.db.add(message)
         await self.db.commit()
         await self.db.refresh(message)
@@ -294,29 +327,67 @@ class SessionService:
     ) -> ConversationSession:
         """Update session data fields.
 
+        The JSON fields are patched key by key in the database with a single
+        UPDATE ... RETURNING, rather than rewriting the whole documents.
+
         Returns the updated session.
         """
+        updates: dict[str, Any] = {}
         if client_info:
-            session.client_info = {**session.client_info, **client_info}
+            updates["client_info"] = client_info
         if business_context:
-            session.business_context = {**session.business_context, **business_context}
+            updates["business_context"] = business_context
         if qualification:
-            session.qualification = {**session.qualification, **qualification}
+            updates["qualification"] = qualification
         if lead_score is not None:
-            session.lead_score = lead_score
+            updates["lead_score"] = lead_score
         if recommended_service:
-            session.recommended_service = recommended_service
+            updates["recommended_service"] = recommended_service
+
+        # Update the session in memory without marking it dirty, so a later
+        # commit doesn't write the whole row again
+        for field, value in updates.items():
+            if field in _JSON_FIELDS:
+                value = {**(getattr(session, field) or {}), **value}
+            set_committed_value(session, field, value)
+
+        if self.defer_writes:
+            for field, value in updates.items():
+                if field in _JSON_FIELDS:
+                    value = {**self._deferred_updates.get(field, {}), **value}
+                self._deferred_updates[field] = value
+            self._deferred_session = session
+            return session
+
+        await self._patch_session(session, updates)
+        return session
 
-        # Use merge() to handle both attached and detached objects
-        # This is needed because cached sessions are detached
-        merged_session = await self.db.merge(session)
+    async def _patch_session(self, session: ConversationSession, updates: dict[str, Any]) -> None:
+        """Write session field updates, merging JSON fields in the database."""
+        if not updates:
+            return
+        values = {
+            field: json_merge(getattr(ConversationSession, field), value) if field in _JSON_FIELDS else value
+            for field, value in updates.items()
+        }
+        columns = [getattr(ConversationSession, field) for field in updates]
+        result = await self.db.execute(
+            update(ConversationSession)
+            .where(ConversationSession.id == session.id)
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
         await self.db.commit()
-        await self.db.refresh(merged_session)
 
-        # Invalidate cache after update
-        await delete_cached_session_data(str(merged_session.id))
+        # The database may hold keys written by other requests
+        if row is not None:
+            for field, value in zip(updates, row, strict=True):
+                set_committed_value(session, field, value)
 
-        return merged_session
+        # Invalidate cache after update
+        await delete_cached_session_data(str(session.id))
 
     async def generate_ai_response(
         self, session: ConversationSession, user_message: str
@@ -367,12 +438,16 @@ class SessionService:
             "client_info": session.client_info,
             "qualification": session.qualification,
             "current_phase": session.current_phase,
+            "lead_score": session.lead_score,
         }
 
         # Generate AI response using streaming
-        ai_content = await self._generate_streaming_response(
-            user_message, conversation_history, context
-        )
+        with track_llm_usage() as usage:
+            ai_content = await self._generate_streaming_response(
+                user_message, conversation_history, context
+            )
+        # Saved with the AI message
+        save_llm_usage(self.db, session.id, session.current_phase, usage)
 
         # Determine and update phase based on collected data
         new_phase = await self._determine_next_phase(session)
@@ -397,6 +472,13 @@ class SessionService:
 
         return ai_message
 
+    async def flush_deferred_writes(self) -> None:
+        """Persist session updates made while defer_writes was set."""
+        session, self._deferred_session = self._deferred_session, None
+        updates, self._deferred_updates = self._deferred_updates, {}
+        if session is not None:
+            await self._patch_session(session, updates)
+
     async def _extract_user_info(self, session: ConversationSession, user_message: str) -> None:
         """Extract user information from their responses and update session."""
         import re
@@ -713,7 +795,7 @@ class SessionService:
 
         # Phase 8: PRD Generation
         if current_phase == SessionPhase.PRD_GENERATION and not session.prd_id:
-            # Generate PRD
+            # Start PRD generation in the background (progress streams via Socket.IO)
             await self._generate_prd_for_session(session)
             # Move to expert matching phase
             if current_phase != SessionPhase.EXPERT_MATCHING:
@@ -727,12 +809,14 @@ class SessionService:
         return None
 
     async def _generate_prd_for_session(self, session: ConversationSession) -> None:
-        """Generate a PRD for the session."""
-        from src.services.prd_service import PRDService
+        """Start a background PRD generation job for the session.
+
+        Does not wait for the PRD so the chat turn is not blocked by the LLM;
+        duplicate requests for the same session join the running job.
+        """
+        from src.services.prd_job_service import prd_job_manager, session_factory_for
 
-        # Use PRDService for consistent PRD generation
-        prd_service = PRDService(self.db)
-        await prd_service.generate_prd(session)
+        prd_job_manager.submit(session.id, session_factory=session_factory_for(self.db))
 
     async def match_experts_for_session(self, session: ConversationSession) -> list[dict[str, Any]]:
         """Match experts to a session based on business context and recommended service.
@@ -0,0 +1,131 @@
+"""Socket.IO scaling support: client managers and shared presence."""
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from socketio import AsyncManager, AsyncRedisManager
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from src.core.config import settings
+from src.services.cache_service import CACHE_PREFIXES, cache_service
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker process in presence records
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class InProcessPubSubManager(AsyncPubSubManager):
+    """Pub/sub client manager backed by in-process queues.
+
+    Stand-in for the Redis manager when several Socket.IO servers run in one
+    process (tests, local multi-worker simulation). Messages are serialized
+    like they are on a real message queue.
+    """
+
+    name = "inprocess"
+
+    # Subscriber queues per channel, shared by all instances in the process
+    _subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    def __init__(self, channel: str = "socketio", write_only: bool = False, logger: Any = None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self._queue: asyncio.Queue | None = None
+
+    def initialize(self) -> None:
+        if not self.write_only:
+            self._queue = asyncio.Queue()
+            self._subscribers.setdefault(self.channel, []).append(self._queue)
+        super().initialize()
+
+    async def _publish(self, data: Any) -> None:
+        message = json.dumps(data)
+        for queue in self._subscribers.get(self.channel, []):
+            queue.put_nowait(message)
+
+    async def _listen(self) -> AsyncIterator[Any]:
+        while self._queue is not None:
+            yield await self._queue.get()
+
+    def close(self) -> None:
+        """Unsubscribe this manager from its channel."""
+        subscribers = self._subscribers.get(self.channel, [])
+        if self._queue in subscribers:
+            subscribers.remove(self._queue)
+        self._queue = None
+
+
+def create_client_manager(
+    backend: str | None = None,
+    channel: str | None = None,
+) -> AsyncManager | None:
+    """Create the Socket.IO client manager for the configured backend.
+
+    Args:
+        backend: "local" (single process), "redis" or "inprocess";
+            defaults to settings.socketio_client_manager
+        channel: Pub/sub channel name; defaults to settings.socketio_channel
+
+    Returns:
+        A client manager, or None for the default single-process manager
+    """
+    backend = backend or settings.socketio_client_manager
+    channel = channel or settings.socketio_channel
+
+    if backend == "redis":
+        logger.info(f"Socket.IO using Redis client manager on channel {channel}")
+        return AsyncRedisManager(settings.redis_url, channel=channel)
+    if backend == "inprocess":
+        return InProcessPubSubManager(channel=channel)
+    if backend != "local":
+        raise ValueError(f"Unknown Socket.IO client manager: {backend}")
+    return None
+
+
+class PresenceService:
+    """Tracks which sessions have connected clients, shared across workers.
+
+    Presence is stored as a cache hash per session (Redis when available),
+    mapping Socket.IO sid to the worker holding the connection.
+    """
+
+    def __init__(self, ttl: int | None = None):
+        self.ttl = ttl or settings.presence_ttl_seconds
+
+    def _key(self, session_id: str) -> str:
+        return f"{CACHE_PREFIXES['presence']}{session_id}"
+
+    async def mark_connected(self, session_id: str, sid: str) -> None:
+        """Record a client connection for a session."""
+        key = self._key(session_id)
+        await cache_service.set_hash(key, {
+            sid: {"worker": WORKER_ID, "connected_at": datetime.utcnow().isoformat()},
+        })
+        await cache_service.expire(key, self.ttl)
+
+    async def mark_disconnected(self, session_id: str, sid: str) -> None:
+        """Remove a client connection for a session."""
+        await cache_service.delete_hash_field(self._key(session_id), sid)
+
+    async def get_connections(self, session_id: str) -> dict[str, Any]:
+        """Get all connections for a session, keyed by sid."""
+        connections = await cache_service.get_hash(self._key(session_id))
+        return connections if isinstance(connections, dict) else {}
+
+    async def is_online(self, session_id: str) -> bool:
+        """Check if any worker holds a connection for a session."""
+        return bool(await self.get_connections(session_id))
+
+
+# Global presence service instance
+presence_service = PresenceService()
+
+
+def get_presence_service() -> PresenceService:
+    """Get the presence service instance."""
+    return presence_service
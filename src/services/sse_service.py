@@ -0,0 +1,109 @@
+"""Server-Sent Events streaming of chat turns over plain HTTP."""
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.services.chat_pipeline import ChatTurnPipeline
+from src.services.turn_service import turn_coordinator
+from src.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+
+class DisconnectAware(Protocol):
+    """Anything that can report a client disconnect (e.g. a Starlette Request)."""
+
+    async def is_disconnected(self) -> bool: ...
+
+
+def format_sse_event(event: str, data: dict[str, Any], event_id: str | None = None) -> str:
+    """Format a Server-Sent Events frame.
+
+    Args:
+        event: The event name
+        data: JSON-serializable event data (sent on a single data line)
+        event_id: Optional event ID, sent back by clients as Last-Event-ID
+
+    Returns:
+        The frame, terminated by a blank line
+    """
+    frame = f"event: {event}\n"
+    if event_id:
+        frame += f"id: {event_id}\n"
+    return frame + f"data: {json_codec.dumps_str(data)}\n\n"
+
+
+async def chat_turn_event_stream(
+    request: DisconnectAware,
+    session_id: str,
+    content: str,
+    session_factory: async_sessionmaker[AsyncSession],
+    idempotency_key: str | None = None,
+    heartbeat_interval: float | None = None,
+) -> AsyncIterator[str]:
+    """Run a chat turn and yield it as Server-Sent Events.
+
+    Events are `chunk` (one per response chunk, with ID
+    `{message_id}:{offset}`), then `message` with the completed turn, or
+    `error`. A heartbeat comment is sent whenever the stream is idle for
+    heartbeat_interval seconds. If the client disconnects, the turn (and
+    the upstream LLM call) is cancelled; the user message is still saved.
+
+    Args:
+        request: The HTTP request, polled for disconnects
+        session_id: The session ID
+        content: The user message content
+        session_factory: Factory for the turn's database session
+        idempotency_key: Optional key identifying retries of the message
+        heartbeat_interval: Seconds between heartbeats when idle
+    """
+    heartbeat_interval = heartbeat_interval or settings.sse_heartbeat_seconds
+    frames: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def on_chunk(message_id: str, offset: int, chunk: str) -> None:
+        frames.put_nowait(format_sse_event(
+            "chunk",
+            {"chunk": chunk, "message_id": message_id, "offset": offset},
+            event_id=f"{message_id}:{offset}",
+        ))
+
+    async def process_turn() -> dict[str, Any]:
+        async with session_factory() as db:
+            return await ChatTurnPipeline(db).run(session_id, content, on_chunk=on_chunk)
+
+    async def run_turn() -> None:
+        try:
+            result, duplicate = await turn_coordinator.run_turn(
+                session_id, process_turn, idempotency_key=idempotency_key
+            )
+            frames.put_nowait(format_sse_event("message", {**result, "duplicate": duplicate}))
+        except Exception as e:
+            logger.error(f"Error streaming message for session {session_id}: {e}")
+            frames.put_nowait(format_sse_event("error", {"message": str(e), "can_retry": True}))
+        finally:
+            frames.put_nowait(None)
+
+    turn = asyncio.create_task(run_turn())
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(frames.get(), heartbeat_interval)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    logger.info(f"SSE client disconnected from session {session_id}")
+                    break
+                yield HEARTBEAT_FRAME
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        if not turn.done():
+            turn.cancel()
+            await asyncio.gather(turn, return_exceptions=True)
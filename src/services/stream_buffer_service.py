@@ -0,0 +1,153 @@
+"""Short-lived buffers of streamed AI responses, for resuming after reconnects."""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.config import settings
+from src.services.cache_service import CACHE_PREFIXES, cache_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BufferedStream:
+    """Chunks of a buffered response stream."""
+
+    message_id: str
+    chunks: list[tuple[int, str]] = field(default_factory=list)
+    next_offset: int = 0
+    complete: bool = False
+    # Set with complete when the stream ended in an error or was cancelled
+    failed: bool = False
+
+
+class StreamBuffer:
+    """Ring buffer of response chunks per AI message, stored in the cache.
+
+    Each streamed message is a cache hash (Redis when available, so any
+    worker can serve a resume) holding chunks by offset plus the stream
+    state. Only the last `max_chunks` chunks are kept, and the whole
+    buffer expires `ttl` seconds after the stream's last update (every
+    write refreshes the TTL).
+    """
+
+    def __init__(self, ttl: int | None = None, max_chunks: int | None = None):
+        self.ttl = ttl or settings.stream_buffer_ttl_seconds
+        self.max_chunks = max_chunks or settings.stream_buffer_max_chunks
+
+    def _key(self, message_id: str) -> str:
+        return f"{CACHE_PREFIXES['stream']}{message_id}"
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{CACHE_PREFIXES['stream_session']}{session_id}"
+
+    async def append(self, session_id: str, message_id: str, offset: int, chunk: str) -> None:
+        """Buffer a chunk of a message stream."""
+        await self.append_many(session_id, message_id, {offset: chunk})
+
+    async def append_many(self, session_id: str, message_id: str, chunks: dict[int, str]) -> None:
+        """Buffer consecutive chunks of a message stream in one write."""
+        key = self._key(message_id)
+        mapping: dict[str, Any] = {str(offset): chunk for offset, chunk in chunks.items()}
+        mapping["next_offset"] = max(chunks) + 1
+        await cache_service.set_hash(key, mapping)
+        await cache_service.expire(key, self.ttl)
+        if 0 in chunks:
+            await cache_service.set(self._session_key(session_id), message_id, self.ttl)
+        else:
+            await cache_service.expire(self._session_key(session_id), self.ttl)
+        for offset in chunks:
+            if offset >= self.max_chunks:
+                await cache_service.delete_hash_field(key, str(offset - self.max_chunks))
+
+    def writer(self, session_id: str, message_id: str) -> "StreamWriter":
+        """Create a writer buffering a stream's chunks in the background."""
+        return StreamWriter(self, session_id, message_id)
+
+    async def complete(self, session_id: str, message_id: str, failed: bool = False) -> None:
+        """Mark a message stream as complete, or as failed if it ended in an error."""
+        key = self._key(message_id)
+        await cache_service.set_hash(key, {"complete": True, "failed": failed})
+        await cache_service.expire(key, self.ttl)
+        await cache_service.expire(self._session_key(session_id), self.ttl)
+
+    async def get_latest_message_id(self, session_id: str) -> str | None:
+        """Get the ID of the most recent buffered stream of a session."""
+        return await cache_service.get(self._session_key(session_id))
+
+    async def read(self, message_id: str, offset: int = 0) -> BufferedStream | None:
+        """Read buffered chunks from an offset.
+
+        Args:
+            message_id: The AI message ID
+            offset: The first chunk offset the client has not received
+
+        Returns:
+            The buffered chunks at or after offset, or None if the stream
+            is not (or no longer) buffered
+        """
+        data = await cache_service.get_hash(self._key(message_id))
+        if not data:
+            return None
+
+        chunks = sorted(
+            (int(field_name), chunk) for field_name, chunk in data.items()
+            if field_name.isdigit() and int(field_name) >= offset
+        )
+        return BufferedStream(
+            message_id=message_id,
+            chunks=chunks,
+            next_offset=int(data.get("next_offset", 0)),
+            complete=bool(data.get("complete")),
+            failed=bool(data.get("failed")),
+        )
+
+
+class StreamWriter:
+    """Buffers the chunks of one stream without delaying them.
+
+    append() returns immediately; a background task writes the chunks to
+    the cache, and chunks appended while a write is in flight go out
+    together in the next write.
+    """
+
+    def __init__(self, buffer: StreamBuffer, session_id: str, message_id: str):
+        self.buffer = buffer
+        self.session_id = session_id
+        self.message_id = message_id
+        self._pending: dict[int, str] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def append(self, offset: int, chunk: str) -> None:
+        """Queue a chunk to be buffered."""
+        self._pending[offset] = chunk
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            chunks, self._pending = self._pending, {}
+            await self.buffer.append_many(self.session_id, self.message_id, chunks)
+
+    async def close(self, failed: bool = False) -> None:
+        """Write the queued chunks, then mark the stream complete (or failed).
+
+        Only the first call has an effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.buffer.complete(self.session_id, self.message_id, failed)
+
+
+# Global stream buffer instance
+stream_buffer = StreamBuffer()
+
+
+def get_stream_buffer() -> StreamBuffer:
+    """Get the stream buffer instance."""
+    return stream_buffer
@@ -0,0 +1,148 @@
+"""Per-session chat turn serialization, idempotency and request coalescing."""
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from src.core.config import settings
+from src.core.exceptions import ConflictError
+from src.services.cache_service import (
+    CACHE_PREFIXES,
+    cache_service,
+    cache_turn_result,
+    get_cached_turn_result,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TurnCoordinator:
+    """Serializes chat turns per session and deduplicates repeated requests.
+
+    - Turns for one session run one at a time: an asyncio lock within the
+      process, plus a cache lock (Redis when available) across workers.
+    - Requests carrying an idempotency key return the stored result of an
+      earlier turn with the same key instead of running again.
+    - Requests arriving while a turn with the same key is in flight share
+      that turn's result. Requests without a key are never deduplicated: a
+      user may well send the same short reply ("yes") twice.
+    """
+
+    def __init__(
+        self,
+        lock_ttl: int | None = None,
+        lock_timeout: float | None = None,
+        poll_interval: float = 0.05,
+    ):
+        self.lock_ttl = lock_ttl or settings.turn_lock_ttl_seconds
+        self.lock_timeout = lock_timeout or settings.turn_lock_timeout_seconds
+        self.poll_interval = poll_interval
+        self._local_locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+    @asynccontextmanager
+    async def session_turn(self, session_id: str) -> AsyncIterator[None]:
+        """Hold the turn lock of a session.
+
+        Raises:
+            ConflictError: If the lock cannot be acquired within lock_timeout
+        """
+        lock = self._local_locks.setdefault(session_id, asyncio.Lock())
+        self._lock_users[session_id] = self._lock_users.get(session_id, 0) + 1
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), self.lock_timeout)
+            except TimeoutError:
+                raise ConflictError(
+                    "Another message is still being processed for this session"
+                ) from None
+            try:
+                key = f"{CACHE_PREFIXES['turn_lock']}{session_id}"
+                token = await self._acquire_shared_lock(key)
+                try:
+                    yield
+                finally:
+                    await cache_service.release_lock(key, token)
+            finally:
+                lock.release()
+        finally:
+            self._lock_users[session_id] -= 1
+            if not self._lock_users[session_id]:
+                del self._lock_users[session_id]
+                self._local_locks.pop(session_id, None)
+
+    async def run_turn(
+        self,
+        session_id: str,
+        handler: Callable[[], Awaitable[dict[str, Any]]],
+        idempotency_key: str | None = None,
+    ) -> tuple[dict[str, Any], bool]:
+        """Run a chat turn, deduplicating retries that carry an idempotency key.
+
+        Args:
+            session_id: The session ID
+            handler: Coroutine function that processes the turn
+            idempotency_key: Optional client-supplied key for the message
+
+        Returns:
+            Tuple of (turn result, whether the request was a duplicate)
+        """
+        if not idempotency_key:
+            async with self.session_turn(session_id):
+                return await handler(), False
+
+        cached = await get_cached_turn_result(session_id, idempotency_key)
+        if cached is not None:
+            logger.info(f"Replaying turn {idempotency_key} for session {session_id}")
+            return cached, True
+
+        flight_key = (session_id, idempotency_key)
+        in_flight = self._in_flight.get(flight_key)
+        if in_flight:
+            logger.info(f"Coalescing duplicate turn for session {session_id}")
+            return await asyncio.shield(in_flight), True
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved when no duplicate is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[flight_key] = future
+        try:
+            async with self.session_turn(session_id):
+                # Another worker may have completed the turn while we waited
+                cached = await get_cached_turn_result(session_id, idempotency_key)
+                if cached is not None:
+                    result, duplicate = cached, True
+                else:
+                    result, duplicate = await handler(), False
+                    await cache_turn_result(session_id, idempotency_key, result)
+            future.set_result(result)
+            return result, duplicate
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            del self._in_flight[flight_key]
+
+    async def _acquire_shared_lock(self, key: str) -> str:
+        """Acquire the cross-worker lock, polling until lock_timeout."""
+        token = uuid.uuid4().hex
+        deadline = asyncio.get_running_loop().time() + self.lock_timeout
+        while not await cache_service.acquire_lock(key, token, self.lock_ttl):
+            if asyncio.get_running_loop().time() >= deadline:
+                raise ConflictError(
+                    "Another message is still being processed for this session"
+                )
+            await asyncio.sleep(self.poll_interval)
+        return token
+
+# Global turn coordinator instance
+turn_coordinator = TurnCoordinator()
+
+
+def get_turn_coordinator() -> TurnCoordinator:
+    """Get the turn coordinator instance."""
+    return turn_coordinator
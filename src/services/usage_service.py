@@ -0,0 +1,115 @@
+"""Token and latency accounting for AI generations."""
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.llm_usage import LLMUsageRecord
+
+
+@dataclass
+class LLMUsage:
+    """Usage accumulated by the LLM calls of one generation."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    time_to_first_token: float | None = None
+    generation_time: float = 0.0
+    cache_hit: bool = False
+    fallback: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+_current_usage: ContextVar[LLMUsage | None] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsage]:
+    """Collect the usage of the LLM calls made in the block.
+
+    AIService reports into the innermost tracker of the current context,
+    so callers need not thread usage through return values.
+    """
+    usage = LLMUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_llm_call(
+    usage_metadata: dict[str, Any] | None,
+    generation_time: float,
+    time_to_first_token: float | None = None,
+) -> None:
+    """Report a completed LLM call to the current tracker, if any.
+
+    Args:
+        usage_metadata: The response's usage_metadata (input/output tokens)
+        generation_time: Seconds the call took
+        time_to_first_token: Seconds until the first streamed chunk
+    """
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    usage.llm_calls += 1
+    if usage_metadata:
+        usage.prompt_tokens += int(usage_metadata.get("input_tokens") or 0)
+        usage.completion_tokens += int(usage_metadata.get("output_tokens") or 0)
+    usage.generation_time += generation_time
+    if usage.time_to_first_token is None:
+        usage.time_to_first_token = time_to_first_token
+
+
+def record_llm_fallback() -> None:
+    """Report that a template response replaced the LLM."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.fallback = True
+
+
+def record_llm_cache_hit() -> None:
+    """Report that a cached response replaced the LLM."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.cache_hit = True
+
+
+def save_llm_usage(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    phase: str,
+    usage: LLMUsage,
+    operation: str = "chat",
+) -> LLMUsageRecord:
+    """Add a usage record to the database session.
+
+    The record is written with the caller's next commit, typically the
+    one saving the AI message.
+    """
+    record = LLMUsageRecord(
+        session_id=session_id,
+        phase=phase,
+        operation=operation,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        llm_calls=usage.llm_calls,
+        time_to_first_token_ms=(
+            round(usage.time_to_first_token * 1000)
+            if usage.time_to_first_token is not None else None
+        ),
+        generation_time_ms=round(usage.generation_time * 1000),
+        cache_hit=usage.cache_hit,
+        fallback=usage.fallback,
+    )
+    db.add(record)
+    return record
@@ -0,0 +1,159 @@
+"""Compact binary encoding for cached values.
+
+Values are serialized with MessagePack (ormsgpack or msgpack, whichever is
+installed) and compressed with zstd or lz4 once they exceed a size
+threshold. Every encoded value starts with a three-byte header: a magic
+byte that is never valid at the start of MessagePack or JSON, a format
+version and a byte recording the serializer and compression used, so
+values remain readable when settings or installed packages change.
+Without a MessagePack package, values are encoded with the JSON codec.
+"""
+from typing import Any, cast
+
+from src.core.config import settings
+from src.utils import json_codec
+
+# Serializers and compressors are optional; the best installed one is used
+try:
+    import ormsgpack
+    ORMSGPACK_AVAILABLE = True
+except ImportError:
+    ORMSGPACK_AVAILABLE = False
+    ormsgpack = None  # type: ignore
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None  # type: ignore
+
+try:
+    import lz4.frame as lz4_frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+    lz4_frame = None
+
+MAGIC = 0xC1  # Unused by MessagePack, invalid as the first byte of JSON
+VERSION = 1
+HEADER_SIZE = 3
+
+SERIALIZER_JSON = 0
+SERIALIZER_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+
+class CacheDecodeError(ValueError):
+    """Raised when a cached value can't be decoded."""
+
+
+def _serialize(value: Any) -> tuple[int, bytes]:
+    if ORMSGPACK_AVAILABLE:
+        return SERIALIZER_MSGPACK, ormsgpack.packb(
+            value, default=json_codec.to_serializable, option=ormsgpack.OPT_NON_STR_KEYS
+        )
+    if MSGPACK_AVAILABLE:
+        return SERIALIZER_MSGPACK, msgpack.packb(value, default=json_codec.to_serializable)
+    return SERIALIZER_JSON, json_codec.dumps(value)
+
+
+def _deserialize(serializer: int, data: bytes) -> Any:
+    if serializer == SERIALIZER_JSON:
+        return json_codec.loads(data)
+    if serializer == SERIALIZER_MSGPACK:
+        if ORMSGPACK_AVAILABLE:
+            return ormsgpack.unpackb(data)
+        if MSGPACK_AVAILABLE:
+            return msgpack.unpackb(data, strict_map_key=False)
+    raise CacheDecodeError(f"Unsupported serializer {serializer}")
+
+
+def _compression(name: str) -> int:
+    """Resolve a compression setting to an installed algorithm, preferring the one named."""
+    if name == "none":
+        return COMPRESSION_NONE
+    available = {COMPRESSION_ZSTD: ZSTD_AVAILABLE, COMPRESSION_LZ4: LZ4_AVAILABLE}
+    preferred = [COMPRESSION_LZ4, COMPRESSION_ZSTD] if name == "lz4" else [COMPRESSION_ZSTD, COMPRESSION_LZ4]
+    return next((compression for compression in preferred if available[compression]), COMPRESSION_NONE)
+
+
+# Reused (creating them costs more than compressing a session); they are
+# only used from the event loop thread
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+
+def _compress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        assert _zstd_compressor is not None
+        return cast(bytes, _zstd_compressor.compress(data))
+    return cast(bytes, lz4_frame.compress(data))
+
+
+def _decompress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZSTD and ZSTD_AVAILABLE:
+        assert _zstd_decompressor is not None
+        return cast(bytes, _zstd_decompressor.decompress(data))
+    if compression == COMPRESSION_LZ4 and LZ4_AVAILABLE:
+        return cast(bytes, lz4_frame.decompress(data))
+    raise CacheDecodeError(f"Unsupported compression {compression}")
+
+
+def encode(value: Any, compression: str | None = None, min_size: int | None = None) -> bytes:
+    """Encode a value for the cache.
+
+    Args:
+        value: Value to encode
+        compression: "zstd", "lz4" or "none" (defaults to settings.cache_compression)
+        min_size: Smallest serialized size to compress, in bytes (defaults
+            to settings.cache_compression_min_bytes)
+
+    Returns:
+        Header followed by the serialized, possibly compressed, value
+    """
+    serializer, data = _serialize(value)
+    algorithm = COMPRESSION_NONE
+    if len(data) >= (settings.cache_compression_min_bytes if min_size is None else min_size):
+        algorithm = _compression(settings.cache_compression if compression is None else compression)
+        if algorithm != COMPRESSION_NONE:
+            data = _compress(algorithm, data)
+    return bytes((MAGIC, VERSION, serializer | algorithm << 4)) + data
+
+
+def decode(data: bytes | str) -> Any:
+    """Decode a value encoded by encode().
+
+    Values without a header are decoded as JSON, as written by earlier
+    versions of the cache.
+
+    Raises:
+        CacheDecodeError: If the value uses a format that can't be read here
+    """
+    if isinstance(data, str) or not data or data[0] != MAGIC:
+        try:
+            return json_codec.loads(data)
+        except ValueError as e:
+            raise CacheDecodeError("Invalid cached value") from e
+    if len(data) < HEADER_SIZE or data[1] != VERSION:
+        raise CacheDecodeError("Unsupported cache encoding version")
+    serializer, compression = data[2] & 0x0F, data[2] >> 4
+    payload = data[HEADER_SIZE:]
+    try:
+        if compression != COMPRESSION_NONE:
+            payload = _decompress(compression, payload)
+        return _deserialize(serializer, payload)
+    except CacheDecodeError:
+        raise
+    except Exception as e:
+        raise CacheDecodeError("Invalid cached value") from e
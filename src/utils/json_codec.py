@@ -0,0 +1,66 @@
+"""Fast JSON encoding and decoding.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+encode UUIDs, datetimes, dates and enums natively (datetimes in ISO 8601
+format) and fall back to str() for other objects, so callers don't need
+`default=str`.
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+
+# orjson is optional; the standard library is used without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+
+def to_serializable(value: Any) -> Any:
+    """Convert an object the encoders don't support natively to a JSON value."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+if ORJSON_AVAILABLE:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value as compact UTF-8 JSON."""
+        option = _OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _OPTIONS
+        return orjson.dumps(value, default=to_serializable, option=option)
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode JSON from bytes or a string."""
+        return orjson.loads(data)
+
+else:
+    def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+        """Encode a value as compact UTF-8 JSON."""
+        return json.dumps(
+            value,
+            default=to_serializable,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode JSON from bytes or a string."""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+def dumps_str(value: Any, *, sort_keys: bool = False) -> str:
+    """Encode a value as a compact JSON string."""
+    return dumps(value, sort_keys=sort_keys).decode("utf-8")
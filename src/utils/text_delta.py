@@ -0,0 +1,51 @@
+"""Compact line-based text deltas for version storage."""
+import difflib
+import json
+import zlib
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """Encode a text as a compressed delta against a base text.
+
+    The delta is a list of operations: `[start, end]` copies base lines
+    and a string inserts literal text.
+
+    Args:
+        base: The text the delta is applied to
+        target: The text the delta reconstructs
+
+    Returns:
+        zlib-compressed JSON delta
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    ops: list[list[int] | str] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(target_lines[j1:j2]))
+
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Reconstruct a text from its base and a delta from `encode_delta`.
+
+    Args:
+        base: The base text
+        delta: Compressed delta
+
+    Returns:
+        The reconstructed text
+    """
+    base_lines = base.splitlines(keepends=True)
+    parts: list[str] = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
@@ -7,12 +7,12 @@ Tests that session data is properly stored and retrieved from Redis:
 - Session data matches database content
 """
 
-import json
-
 import pytest
 import redis
 import requests
 
+from src.utils import cache_codec
+
 
 class TestRedisSessionStorage:
     """Test Redis session storage functionality"""
@@ -58,7 +58,7 @@ class TestRedisSessionStorage:
             session_data_redis = redis_client.get(redis_key)
 
             if session_data_redis:
-                session_json = json.loads(session_data_redis)
+                session_json = cache_codec.decode(session_data_redis)
                 print(f"✅ Session found in Redis: {redis_key}")
                 print(f"   Data: {session_json}")
             else:
@@ -152,7 +152,7 @@ class TestRedisSessionStorage:
         session_data_redis = redis_client.get(redis_key)
 
         if session_data_redis:
-            session_json = json.loads(session_data_redis)
+            session_json = cache_codec.decode(session_data_redis)
             print(f"✅ Session data retrieved from Redis: {redis_key}")
             print(f"   Visitor ID: {session_json.get('visitor_id')}")
             print(f"   Source URL: {session_json.get('source_url')}")
@@ -205,7 +205,7 @@ class TestRedisSessionStorage:
         session_data_redis = redis_client.get(redis_key)
 
         if session_data_redis:
-            session_from_redis = json.loads(session_data_redis)
+            session_from_redis = cache_codec.decode(session_data_redis)
 
             # Compare key fields
             api_visitor_id = session_from_api.get("visitor_id")
@@ -0,0 +1,131 @@
+"""Integration tests for the pipelined chat turn handler."""
+import uuid
+
+import pytest
+
+from src.models.session import MessageRole
+from src.schemas.session import SessionCreate
+from src.services.chat_pipeline import ChatTurnPipeline
+from src.services.monitoring_service import monitoring_service
+from src.services.session_service import SessionService
+from src.services.stream_buffer_service import stream_buffer
+
+
+def _instrument(pipeline: ChatTurnPipeline, events: list[str]) -> None:
+    """Replace the LLM stream with a fake one and record turn events."""
+    session_service = pipeline.session_service
+    add_message = session_service.add_message
+
+    async def fake_stream(user_message, conversation_history=None, context=None):
+        events.append("first_chunk")
+        yield "Nice to meet you, "
+        yield f"{context['client_info'].get('name')}!"
+
+    async def recording_add_message(session_id, message_create, role, message_id=None):
+        events.append(f"add_message:{role.value}")
+        return await add_message(session_id, message_create, role, message_id=message_id)
+
+    session_service.ai_service.stream_response = fake_stream  # type: ignore[method-assign]
+    session_service.add_message = recording_add_message  # type: ignore[method-assign]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_before_persisting_user_message(db_session, sample_visitor_id):
+    """Test the LLM stream starts before the user message is written."""
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    pipeline = ChatTurnPipeline(db_session)
+    events: list[str] = []
+    _instrument(pipeline, events)
+
+    chunks: list[str] = []
+    completed: list[str] = []
+
+    async def on_chunk(message_id: str, offset: int, chunk: str) -> None:
+        assert offset == len(chunks)
+        chunks.append(chunk)
+
+    async def on_complete(message_id: str) -> None:
+        completed.append(message_id)
+
+    turns_before = monitoring_service.get_chat_turn_metrics()["turns"]
+    result = await pipeline.run(
+        str(session.id), "My name is Jane Roe", on_chunk=on_chunk, on_complete=on_complete
+    )
+
+    assert events[0] == "first_chunk"
+    assert events.index("add_message:user") < events.index("add_message:assistant")
+
+    # Session data extracted before the stream is used in the prompt context
+    assert "".join(chunks) == "Nice to meet you, Jane Roe!"
+    assert result["ai_message"]["content"] == "Nice to meet you, Jane Roe!"
+    assert completed == [result["ai_message"]["id"]]
+
+    # Chunks are buffered under the saved AI message ID for resumption
+    buffered = await stream_buffer.read(result["ai_message"]["id"])
+    assert buffered is not None
+    assert buffered.complete is True
+    assert [chunk for _, chunk in buffered.chunks] == chunks
+
+    # Deferred session updates are persisted
+    assert result["session"]["client_info"]["name"] == "Jane Roe"
+    stored = await SessionService(db_session).get_session(session.id, skip_cache=True)
+    assert stored is not None
+    assert stored.client_info["name"] == "Jane Roe"
+    assert [m.role for m in stored.messages][-2:] == [MessageRole.USER.value, MessageRole.ASSISTANT.value]
+
+    metrics = monitoring_service.get_chat_turn_metrics()
+    assert metrics["turns"] == turns_before + 1
+    assert metrics["time_to_first_token"]["p95"] > 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_marks_failed_stream(db_session, sample_visitor_id):
+    """Test a stream that breaks off is buffered as failed for resuming clients."""
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    pipeline = ChatTurnPipeline(db_session)
+
+    async def failing_stream(user_message, conversation_history=None, context=None):
+        yield "Let me "
+        raise RuntimeError("LLM unavailable")
+
+    pipeline.session_service.ai_service.stream_response = failing_stream  # type: ignore[method-assign]
+    message_ids: list[str] = []
+
+    async def on_chunk(message_id: str, offset: int, chunk: str) -> None:
+        message_ids.append(message_id)
+
+    with pytest.raises(RuntimeError):
+        await pipeline.run(str(session.id), "Hello", on_chunk=on_chunk)
+
+    stream = await stream_buffer.read(message_ids[0])
+    assert stream is not None
+    assert stream.chunks == [(0, "Let me ")]
+    assert stream.complete is True
+    assert stream.failed is True
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rejects_invalid_content_before_streaming(db_session, sample_visitor_id):
+    """Test invalid content fails the turn without starting the LLM stream."""
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    pipeline = ChatTurnPipeline(db_session)
+    events: list[str] = []
+    _instrument(pipeline, events)
+
+    with pytest.raises(ValueError):
+        await pipeline.run(str(session.id), "'; DROP TABLE conversation_sessions; --")
+
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_pipeline_unknown_session(db_session):
+    """Test a turn for a missing session raises ValueError."""
+    with pytest.raises(ValueError, match="not found"):
+        await ChatTurnPipeline(db_session).run(str(uuid.uuid4()), "Hello")
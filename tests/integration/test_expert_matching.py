@@ -1,6 +1,7 @@
 """Integration tests for expert matching functionality."""
 import uuid
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from httpx import AsyncClient
@@ -340,3 +341,125 @@ async def test_workload_penalty_increases_with_more_bookings(
         from sqlalchemy import delete
         await db_session.execute(delete(Booking).where(Booking.expert_id == expert.id))
         await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_workload_map_is_rebuilt_after_booking_changes(db_session):
+    """Test that booking changes update the column and drop the cached workload map."""
+    from src.models.expert import Expert
+    from src.services.cache_service import (
+        delete_cached_expert_workload,
+        get_cached_expert_workload,
+    )
+    from src.services.expert_service import ExpertService
+
+    await delete_cached_expert_workload()
+    service = ExpertService(db_session)
+    expert = await service.create_expert(
+        ExpertCreate(
+            name="Counter Expert",
+            email=f"counter.{uuid.uuid4().hex[:6]}@example.com",
+            role="AI Consultant",
+            specialties=["AI"],
+            services=["AI Strategy & Planning"],
+        )
+    )
+
+    # Cold cache: built from the database
+    assert expert.id not in await service.get_workload_map()
+    assert await get_cached_expert_workload() is not None
+
+    start = datetime.utcnow() + timedelta(days=2)
+    bookings = [
+        Booking(
+            session_id=uuid.uuid4(),
+            expert_id=expert.id,
+            title="Future booking",
+            start_time=start + timedelta(days=day),
+            end_time=start + timedelta(days=day, hours=1),
+            expert_email=expert.email,
+            client_email="client@test.com",
+            client_name="Client",
+            status="confirmed",
+        )
+        for day in range(2)
+    ]
+    for booking in bookings:
+        db_session.add(booking)
+        await db_session.commit()
+        await service.adjust_workload(expert.id, 1, booking.start_time)
+    assert await get_cached_expert_workload() is None
+
+    assert (await service.get_workload_map())[expert.id] == 2
+    # Warm cache is served without re-running the aggregate query
+    with patch.object(
+        service, "_get_expert_workload_counts", side_effect=AssertionError
+    ):
+        assert (await service.get_workload_map())[expert.id] == 2
+
+    bookings[0].status = "cancelled"
+    await db_session.commit()
+    await service.adjust_workload(expert.id, -1, bookings[0].start_time)
+    result = await db_session.execute(
+        select(Expert.active_booking_count).where(Expert.id == expert.id)
+    )
+    assert result.scalar_one() == 1
+    assert (await service.get_workload_map())[expert.id] == 1
+
+    # Past bookings never count towards the active workload
+    await service.adjust_workload(expert.id, 1, datetime.utcnow() - timedelta(hours=1))
+    assert await get_cached_expert_workload() is not None
+
+    await delete_cached_expert_workload()
+
+
+@pytest.mark.asyncio
+async def test_workload_map_reconciles_when_booking_starts(db_session):
+    """Test that a counted booking passing its start time triggers reconciliation."""
+    from src.models.expert import Expert
+    from src.services.cache_service import (
+        cache_expert_workload,
+        delete_cached_expert_workload,
+    )
+    from src.services.expert_service import ExpertService
+
+    service = ExpertService(db_session)
+    expert = await service.create_expert(
+        ExpertCreate(
+            name="Reconcile Expert",
+            email=f"reconcile.{uuid.uuid4().hex[:6]}@example.com",
+            role="AI Consultant",
+            specialties=["AI"],
+            services=["AI Strategy & Planning"],
+        )
+    )
+
+    now = datetime.utcnow()
+    db_session.add(Booking(
+        session_id=uuid.uuid4(),
+        expert_id=expert.id,
+        title="Future booking",
+        start_time=now + timedelta(days=1),
+        end_time=now + timedelta(days=1, hours=1),
+        expert_email=expert.email,
+        client_email="client@test.com",
+        client_name="Client",
+        status="confirmed",
+    ))
+    await db_session.commit()
+
+    # Cached map claims a second booking that has already started
+    await cache_expert_workload({
+        "counts": {str(expert.id): 2},
+        "next_transition": (now - timedelta(minutes=1)).isoformat(),
+    })
+
+    workload_map = await service.get_workload_map()
+    assert workload_map[expert.id] == 1
+
+    result = await db_session.execute(
+        select(Expert.active_booking_count).where(Expert.id == expert.id)
+    )
+    assert result.scalar_one() == 1
+
+    await delete_cached_expert_workload()
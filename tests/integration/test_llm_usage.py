@@ -0,0 +1,97 @@
+"""Integration tests for LLM token and latency accounting."""
+import pytest
+from sqlalchemy import select
+
+from src.core.security import AdminSecurity
+from src.models.llm_usage import LLMUsageRecord
+from src.schemas.session import SessionCreate
+from src.services.chat_pipeline import ChatTurnPipeline
+from src.services.fake_llm import FaultInjectingLLM
+from src.services.llm_resilience import CircuitBreaker
+from src.services.session_service import SessionService
+from src.services.usage_service import LLMUsage, record_llm_call, track_llm_usage
+
+
+def test_usage_is_only_recorded_inside_a_tracker():
+    """Test LLM calls report into the innermost tracker of the context."""
+    record_llm_call({"input_tokens": 5, "output_tokens": 5}, 0.1)  # No tracker: ignored
+
+    with track_llm_usage() as usage:
+        record_llm_call({"input_tokens": 100, "output_tokens": 20}, 0.5, 0.2)
+        record_llm_call({"input_tokens": 50, "output_tokens": 10}, 0.25, 0.1)
+
+    assert usage == LLMUsage(
+        prompt_tokens=150, completion_tokens=30, llm_calls=2,
+        time_to_first_token=0.2, generation_time=0.75,
+    )
+    assert usage.total_tokens == 180
+
+
+def _admin_headers() -> dict[str, str]:
+    return {"Authorization": f"Bearer {AdminSecurity.create_admin_token('admin')}"}
+
+
+@pytest.mark.asyncio
+async def test_chat_turn_usage_is_recorded_and_reported(client, db_session, sample_visitor_id):
+    """Test a chat turn's tokens and timings reach the admin analytics."""
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    pipeline = ChatTurnPipeline(db_session)
+    ai_service = pipeline.session_service.ai_service
+    ai_service.llm = FaultInjectingLLM(  # type: ignore[assignment]
+        response="Great to meet you! What brings you here today?",
+        first_token_latency=0, chunk_latency=0,
+    )
+    ai_service.circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60)
+
+    await pipeline.run(str(session.id), "Hi, I'm looking for help with a mobile app")
+
+    result = await db_session.execute(
+        select(LLMUsageRecord).where(LLMUsageRecord.session_id == session.id)
+    )
+    record = result.scalar_one()
+    assert record.phase == "greeting"
+    assert record.operation == "chat"
+    assert record.llm_calls == 1
+    assert record.prompt_tokens > 0 and record.completion_tokens > 0
+    assert record.time_to_first_token_ms is not None
+    assert record.fallback is False
+
+    headers = _admin_headers()
+    response = await client.get("/api/v1/admin/analytics/llm-usage", headers=headers)
+    assert response.status_code == 200
+    analytics = response.json()
+    assert analytics["totals"]["total_tokens"] >= record.prompt_tokens + record.completion_tokens
+    assert analytics["by_phase"]["greeting"]["generations"] >= 1
+    assert analytics["daily"][-1]["total_tokens"] > 0
+    assert str(session.id) in [s["session_id"] for s in analytics["top_sessions"]]
+
+    response = await client.get(
+        f"/api/v1/admin/analytics/llm-usage/sessions/{session.id}", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["totals"]["prompt_tokens"] == record.prompt_tokens
+    assert response.json()["by_phase"]["greeting"]["completion_tokens"] == record.completion_tokens
+
+
+@pytest.mark.asyncio
+async def test_fallback_turn_is_recorded_without_tokens(db_session, sample_visitor_id):
+    """Test turns answered from templates are counted as fallbacks."""
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    pipeline = ChatTurnPipeline(db_session)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()  # Open: every call falls back
+    pipeline.session_service.ai_service.llm = FaultInjectingLLM(first_token_latency=0)  # type: ignore[assignment]
+    pipeline.session_service.ai_service.circuit_breaker = breaker
+
+    await pipeline.run(str(session.id), "Hello there")
+
+    result = await db_session.execute(
+        select(LLMUsageRecord).where(LLMUsageRecord.session_id == session.id)
+    )
+    record = result.scalar_one()
+    assert record.fallback is True
+    assert record.prompt_tokens == 0 and record.llm_calls == 0
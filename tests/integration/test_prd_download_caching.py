@@ -0,0 +1,159 @@
+"""Integration tests for conditional, compressed and ranged PRD downloads."""
+import gzip
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.prd import PRDDocument
+from src.models.session import ConversationSession
+from src.services.cache_service import (
+    acquire_prd_download_flush_lock,
+    release_prd_download_flush_lock,
+)
+from src.services.prd_service import PRDService
+
+PRD_CONTENT = "# Project Requirements\n\n" + "## Scope\n\nBuild an analytics platform.\n\n" * 40
+
+
+@pytest.fixture
+async def prd(db_session: AsyncSession) -> PRDDocument:
+    """Create a PRD document."""
+    session = ConversationSession(visitor_id="download-visitor", client_info={"name": "Dana"})
+    db_session.add(session)
+    await db_session.commit()
+
+    prd = PRDDocument(
+        session_id=session.id,
+        content_markdown=PRD_CONTENT,
+        client_company="DownloadCorp",
+        version=1,
+    )
+    db_session.add(prd)
+    await db_session.commit()
+    await db_session.refresh(prd)
+    return prd
+
+
+@pytest.mark.asyncio
+async def test_download_returns_etag_and_304_when_unchanged(client, prd: PRDDocument):
+    """Test a matching If-None-Match returns 304 without a body."""
+    response = await client.get(f"/api/v1/prd/{prd.id}/download")
+
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+
+    cached = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_download_serves_precompressed_gzip(client, prd: PRDDocument):
+    """Test gzip-accepting clients get the precompressed variant."""
+    response = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == PRD_CONTENT
+
+    identity = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in identity.headers
+    assert len(identity.content) > len(gzip.compress(PRD_CONTENT.encode()))
+
+
+@pytest.mark.asyncio
+async def test_download_supports_byte_ranges(client, prd: PRDDocument):
+    """Test Range requests return 206 with the requested bytes."""
+    content = PRD_CONTENT.encode("utf-8")
+
+    response = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"Range": "bytes=0-9", "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 206
+    assert response.content == content[:10]
+    assert response.headers["content-range"] == f"bytes 0-9/{len(content)}"
+
+    suffix = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"Range": "bytes=-5", "Accept-Encoding": "identity"},
+    )
+    assert suffix.status_code == 206
+    assert suffix.content == content[-5:]
+
+    unsatisfiable = await client.get(
+        f"/api/v1/prd/{prd.id}/download",
+        headers={"Range": f"bytes={len(content)}-", "Accept-Encoding": "identity"},
+    )
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(content)}"
+
+
+@pytest.mark.asyncio
+async def test_download_counts_are_buffered_and_flushed(
+    client, db_session: AsyncSession, prd: PRDDocument
+):
+    """Test downloads are counted in the cache and flushed to the database."""
+    await client.get(f"/api/v1/prd/{prd.id}/download")
+    await client.get(f"/api/v1/prd/{prd.id}/download")
+
+    # Not yet persisted, but visible through the API
+    await db_session.refresh(prd)
+    assert prd.download_count == 0
+    response = await client.get(f"/api/v1/prd/{prd.id}")
+    assert response.json()["download_count"] == 2
+
+    flushed = await PRDService(db_session).flush_download_counts()
+    assert flushed == 2
+
+    await db_session.refresh(prd)
+    assert prd.download_count == 2
+    response = await client.get(f"/api/v1/prd/{prd.id}")
+    assert response.json()["download_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flush_does_not_double_count(
+    client, db_session: AsyncSession, prd: PRDDocument
+):
+    """Test a flush is skipped while another worker holds the flush lock."""
+    await client.get(f"/api/v1/prd/{prd.id}/download")
+
+    assert await acquire_prd_download_flush_lock("other-worker")
+    try:
+        assert await PRDService(db_session).flush_download_counts() == 0
+    finally:
+        await release_prd_download_flush_lock("other-worker")
+
+    await db_session.refresh(prd)
+    assert prd.download_count == 0
+
+    assert await PRDService(db_session).flush_download_counts() == 1
+    await db_session.refresh(prd)
+    assert prd.download_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_download_does_not_query_database(client, prd: PRDDocument):
+    """Test repeat downloads are served from the prepared download cache."""
+    await client.get(f"/api/v1/prd/{prd.id}/download")
+
+    with patch.object(PRDService, "get_prd", new=AsyncMock()) as get_prd:
+        response = await client.get(f"/api/v1/prd/{prd.id}/download")
+
+    assert response.status_code == 200
+    assert response.text == PRD_CONTENT
+    get_prd.assert_not_awaited()
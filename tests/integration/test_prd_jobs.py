@@ -0,0 +1,132 @@
+"""Integration tests for background PRD generation jobs."""
+import uuid
+
+import pytest
+
+from src.services.prd_job_service import (
+    PRDJobStatus,
+    prd_job_manager,
+    session_factory_for,
+)
+
+QUALIFYING_MESSAGES = [
+    "My name is Jane Roe",
+    "My email is jane@example.com",
+    "I work at JobCorp",
+    "We need help with AI strategy and data analytics",
+]
+
+
+async def _create_qualified_session(client, visitor_id: str) -> str:
+    """Create a session with enough data for PRD generation."""
+    create_response = await client.post(
+        "/api/v1/sessions",
+        json={"visitor_id": visitor_id},
+    )
+    session_id = create_response.json()["id"]
+
+    for msg in QUALIFYING_MESSAGES:
+        await client.post(
+            f"/api/v1/sessions/{session_id}/messages",
+            json={"content": msg},
+        )
+
+    return session_id
+
+
+@pytest.mark.asyncio
+async def test_prd_job_endpoint_returns_immediately(client, sample_visitor_id: str):
+    """Test POST /api/v1/prd/jobs starts a job and it can be polled to completion."""
+    session_id = await _create_qualified_session(client, sample_visitor_id)
+
+    response = await client.post("/api/v1/prd/jobs", json={"session_id": session_id})
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["session_id"] == session_id
+    assert data["status"] in ("pending", "running", "completed")
+
+    job = prd_job_manager.get_job(data["job_id"])
+    await prd_job_manager.wait(job, timeout=30)
+
+    status_response = await client.get(f"/api/v1/prd/jobs/{data['job_id']}")
+    assert status_response.status_code == 200
+    status_data = status_response.json()
+    assert status_data["status"] == "completed"
+    assert status_data["progress"] == 100
+    assert status_data["prd_id"] is not None
+
+    prd_response = await client.get(f"/api/v1/prd/{status_data['prd_id']}")
+    assert prd_response.status_code == 200
+    assert prd_response.json()["client_name"] == "Jane Roe"
+
+
+@pytest.mark.asyncio
+async def test_prd_job_not_found(client):
+    """Test GET /api/v1/prd/jobs/{id} returns 404 for unknown jobs."""
+    response = await client.get(f"/api/v1/prd/jobs/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_prd_job_requires_client_name(client, sample_visitor_id: str):
+    """Test POST /api/v1/prd/jobs validates the session before starting a job."""
+    create_response = await client.post(
+        "/api/v1/sessions",
+        json={"visitor_id": sample_visitor_id},
+    )
+    session_id = create_response.json()["id"]
+
+    response = await client.post("/api/v1/prd/jobs", json={"session_id": session_id})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_duplicate_submissions_join_active_job(client, db_session, sample_visitor_id: str):
+    """Test a second request for the same session joins the running job."""
+    session_id = await _create_qualified_session(client, sample_visitor_id)
+    active = prd_job_manager.get_active_job_for_session(uuid.UUID(session_id))
+    if active:
+        await prd_job_manager.wait(active, timeout=30)
+
+    factory = session_factory_for(db_session)
+    first = prd_job_manager.submit(uuid.UUID(session_id), session_factory=factory)
+    second = prd_job_manager.submit(uuid.UUID(session_id), session_factory=factory)
+
+    assert first is second
+
+    await prd_job_manager.wait(first, timeout=30)
+    assert first.status == PRDJobStatus.COMPLETED
+    assert prd_job_manager.get_active_job_for_session(uuid.UUID(session_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_prd_job_streams_progress(client, db_session, sample_visitor_id: str):
+    """Test the job reports increasing progress and streams partial content."""
+    session_id = await _create_qualified_session(client, sample_visitor_id)
+    active = prd_job_manager.get_active_job_for_session(uuid.UUID(session_id))
+    if active:
+        await prd_job_manager.wait(active, timeout=30)
+
+    events = []
+
+    async def record_emit(event, job, payload):
+        events.append((event, payload))
+
+    original_emit = prd_job_manager._emit
+    prd_job_manager._emit = record_emit
+    try:
+        job = prd_job_manager.submit(
+            uuid.UUID(session_id), session_factory=session_factory_for(db_session)
+        )
+        await prd_job_manager.wait(job, timeout=30)
+    finally:
+        prd_job_manager._emit = original_emit
+
+    progress_events = [payload for event, payload in events if event == "prd_progress"]
+    progress_values = [payload["progress"] for payload in progress_events]
+    assert progress_values == sorted(progress_values)
+    assert progress_values[-1] == 100
+    assert any(payload["chunk"] for payload in progress_events)
+    assert events[-1][0] == "prd_generated"
+    assert events[-1][1]["prd_id"] == str(job.prd_id)
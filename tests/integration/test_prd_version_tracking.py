@@ -1,9 +1,10 @@
 """Test PRD version tracking functionality."""
 import uuid
+from unittest.mock import AsyncMock
 
 import pytest
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.models.prd import PRDDocument
 from src.models.session import ConversationSession
@@ -182,6 +183,70 @@ async def test_multiple_prd_regenerations(db_session: AsyncSession):
     assert versions == {1, 2, 3}
 
 
+@pytest.mark.asyncio
+async def test_superseded_versions_are_stored_as_deltas(client, db_session: AsyncSession):
+    """Test only the latest version is stored in full and older ones are rebuilt."""
+    prd_service = PRDService(db_session)
+    session = ConversationSession(
+        visitor_id="test_delta_versions",
+        client_info={'name': 'Dee Delta', 'company': 'Delta Corp'},
+        business_context={'challenges': 'Version storage'},
+    )
+    db_session.add(session)
+    await db_session.commit()
+
+    sections = [f"## Section {i}\n\nRequirement {i} details.\n\n" for i in range(30)]
+    contents = [
+        "# PRD v1\n\n" + "".join(sections),
+        "# PRD v2\n\n" + "".join(sections) + "## Timeline\n\nSix months.\n",
+        "# PRD v3\n\n" + "".join(sections[:10]) + "## Budget\n\n$80k.\n" + "".join(sections[10:]),
+    ]
+    prd_service.ai_service.generate_prd = AsyncMock(side_effect=contents)
+
+    prd_v1 = await prd_service.generate_prd(session=session, conversation_summary="Summary")
+    prd_v2 = await prd_service.regenerate_prd(session=session, feedback="Add a timeline")
+    prd_v3 = await prd_service.regenerate_prd(session=session, feedback="Add a budget")
+
+    # Inspect stored rows from a fresh ORM session
+    fresh_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    async with fresh_factory() as fresh_db:
+        result = await fresh_db.execute(
+            select(
+                PRDDocument.version,
+                PRDDocument.content_markdown,
+                PRDDocument.content_delta,
+                PRDDocument.preview_text,
+                PRDDocument.content_length,
+            )
+            .where(PRDDocument.session_id == session.id)
+            .order_by(PRDDocument.version)
+        )
+        rows = result.all()
+
+        assert [row.content_markdown is None for row in rows] == [True, True, False]
+        assert all(
+            len(row.content_delta) < len(content)
+            for row, content in zip(rows[:2], contents[:2], strict=True)
+        )
+        assert [row.preview_text for row in rows] == [content[:197] + "..." for content in contents]
+        assert [row.content_length for row in rows] == [len(content) for content in contents]
+
+        fresh_service = PRDService(fresh_db)
+        for prd, content in zip((prd_v1, prd_v2, prd_v3), contents, strict=True):
+            restored = await fresh_service.get_prd(prd.id)
+            assert restored.content_markdown == content
+
+    response = await client.get(f"/api/v1/prd/session/{session.id}/versions")
+    assert response.status_code == 200
+    listed = response.json()
+    assert [item["version"] for item in listed] == [1, 2, 3]
+    assert [item["id"] for item in listed] == [str(prd_v1.id), str(prd_v2.id), str(prd_v3.id)]
+    assert all("content_markdown" not in item for item in listed)
+
+    latest = await client.get(f"/api/v1/prd/session/{session.id}")
+    assert latest.json()["version"] == 3
+
+
 if __name__ == "__main__":
     import asyncio
 
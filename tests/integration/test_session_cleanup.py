@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from httpx import ASGITransport, AsyncClient
 
 from src.main import app
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.models.session import ConversationSession, SessionStatus
 
@@ -53,6 +53,8 @@ async def test_session_cleanup_endpoint():
 
         app.dependency_overrides[get_db] = override_get_db
 
+        app.dependency_overrides[get_read_db] = override_get_db
+
         # Test cleanup endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
             # First, create an admin token
@@ -113,6 +115,8 @@ async def test_cleanup_stats_endpoint():
 
         app.dependency_overrides[get_db] = override_get_db
 
+        app.dependency_overrides[get_read_db] = override_get_db
+
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
             # Create admin token
             token_response = await client.post("/api/v1/admin/auth/token", data={
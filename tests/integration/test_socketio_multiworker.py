@@ -0,0 +1,103 @@
+"""Integration tests for Socket.IO across multiple workers.
+
+Two Socket.IO servers ("workers") share an in-process pub/sub client
+manager, standing in for Redis. A client connected to one worker must
+receive emits made by the other.
+"""
+import asyncio
+import socket
+import uuid
+
+import pytest
+import socketio
+import uvicorn
+
+from src.api.routes.websocket import create_sio_server
+from src.services.cache_service import cache_service
+from src.services.socketio_service import InProcessPubSubManager, PresenceService
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_worker(channel: str):
+    """Start a Socket.IO worker on a free port."""
+    manager = InProcessPubSubManager(channel=channel)
+    sio = create_sio_server(client_manager=manager)
+
+    @sio.on("join_session")
+    async def join_session(sid, data):
+        await sio.enter_room(sid, data["session_id"])
+        await sio.emit("connected", {"session_id": data["session_id"]}, room=sid)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        socketio.ASGIApp(sio), host="127.0.0.1", port=port, log_level="warning", lifespan="off",
+    ))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return sio, manager, server, task, port
+
+
+@pytest.mark.asyncio
+async def test_emit_reaches_client_on_another_worker():
+    """Test a room emit from worker A reaches a client connected to worker B."""
+    channel = f"test-{uuid.uuid4().hex}"
+    session_id = str(uuid.uuid4())
+    worker_a = await _start_worker(channel)
+    worker_b = await _start_worker(channel)
+
+    client = socketio.AsyncClient()
+    connected = asyncio.Event()
+    received: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    @client.on("connected")
+    async def on_connected(data):
+        connected.set()
+
+    @client.on("prd_progress")
+    async def on_progress(data):
+        if not received.done():
+            received.set_result(data)
+
+    try:
+        await client.connect(f"http://127.0.0.1:{worker_b[4]}")
+        await client.emit("join_session", {"session_id": session_id})
+        await asyncio.wait_for(connected.wait(), timeout=5)
+
+        # Worker A has no connections of its own
+        sio_a = worker_a[0]
+        await sio_a.emit("prd_progress", {"progress": 50}, room=session_id)
+
+        assert await asyncio.wait_for(received, timeout=5) == {"progress": 50}
+    finally:
+        await client.disconnect()
+        for _, manager, server, task, _ in (worker_a, worker_b):
+            server.should_exit = True
+            await task
+            manager.close()
+
+
+@pytest.mark.asyncio
+async def test_presence_is_shared_between_workers():
+    """Test presence written by one worker is visible to another."""
+    cache_service.in_memory_cache.cache.clear()
+    session_id = str(uuid.uuid4())
+    worker_a = PresenceService()
+    worker_b = PresenceService()
+
+    await worker_a.mark_connected(session_id, "sid-a")
+    await worker_b.mark_connected(session_id, "sid-b")
+
+    assert set(await worker_b.get_connections(session_id)) == {"sid-a", "sid-b"}
+
+    await worker_b.mark_disconnected(session_id, "sid-a")
+    assert await worker_a.is_online(session_id)
+
+    await worker_a.mark_disconnected(session_id, "sid-b")
+    assert not await worker_b.is_online(session_id)
@@ -0,0 +1,129 @@
+"""Integration tests for the Server-Sent Events chat endpoint."""
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from src.schemas.session import SessionCreate
+from src.services.ai_service import AIService
+from src.services.prd_job_service import session_factory_for
+from src.services.session_service import SessionService
+from src.services.sse_service import HEARTBEAT_FRAME, chat_turn_event_stream
+
+
+def _parse_events(body: str) -> list[dict]:
+    """Parse an event-stream body into events (comments are skipped)."""
+    events = []
+    for frame in body.split("\n\n"):
+        event: dict = {}
+        for line in frame.splitlines():
+            if line.startswith(":"):
+                continue
+            name, _, value = line.partition(": ")
+            event[name] = json.loads(value) if name == "data" else value
+        if event:
+            events.append(event)
+    return events
+
+
+@pytest.fixture
+def fake_llm_stream(monkeypatch):
+    """Replace the LLM stream with fixed chunks."""
+    async def stream_response(self, user_message, conversation_history=None, context=None):
+        for chunk in ["Happy ", "to ", "help!"]:
+            yield chunk
+
+    monkeypatch.setattr(AIService, "stream_response", stream_response)
+
+
+@pytest.mark.asyncio
+async def test_stream_message_sends_chunks_then_message(client, sample_visitor_id, fake_llm_stream):
+    """Test POST /messages/stream streams chunk events and the completed turn."""
+    create_response = await client.post("/api/v1/sessions", json={"visitor_id": sample_visitor_id})
+    session_id = create_response.json()["id"]
+
+    response = await client.post(
+        f"/api/v1/sessions/{session_id}/messages/stream",
+        json={"content": "We need help with our data platform"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+
+    events = _parse_events(response.text)
+    chunks = [e for e in events if e["event"] == "chunk"]
+    assert [e["data"]["chunk"] for e in chunks] == ["Happy ", "to ", "help!"]
+    message_id = chunks[0]["data"]["message_id"]
+    assert [e["id"] for e in chunks] == [f"{message_id}:{i}" for i in range(3)]
+
+    final = events[-1]
+    assert final["event"] == "message"
+    assert final["data"]["duplicate"] is False
+    assert final["data"]["ai_message"]["id"] == message_id
+    assert final["data"]["ai_message"]["content"] == "Happy to help!"
+
+    session_response = await client.get(f"/api/v1/sessions/{session_id}")
+    contents = [m["content"] for m in session_response.json()["messages"]]
+    assert contents[-2:] == ["We need help with our data platform", "Happy to help!"]
+
+
+@pytest.mark.asyncio
+async def test_stream_message_unknown_session(client):
+    """Test streaming to a missing session fails before the stream starts."""
+    response = await client.post(
+        f"/api/v1/sessions/{uuid.uuid4()}/messages/stream",
+        json={"content": "Hello"},
+    )
+    assert response.status_code == 404
+
+
+class FakeRequest:
+    """Request stand-in whose disconnect state the test controls."""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_and_disconnect_cancels_llm(db_session, sample_visitor_id, monkeypatch):
+    """Test idle streams send heartbeats and a disconnect cancels the LLM call."""
+    llm_cancelled = asyncio.Event()
+
+    async def stalled_stream(self, user_message, conversation_history=None, context=None):
+        yield "Thinking"
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            llm_cancelled.set()
+            raise
+        yield "never sent"
+
+    monkeypatch.setattr(AIService, "stream_response", stalled_stream)
+
+    session = await SessionService(db_session).create_session(
+        SessionCreate(visitor_id=sample_visitor_id)  # type: ignore[call-arg]
+    )
+    request = FakeRequest()
+    stream = chat_turn_event_stream(
+        request, str(session.id), "Tell me about your services",
+        session_factory_for(db_session), heartbeat_interval=0.05,
+    )
+
+    first = await stream.__anext__()
+    assert first.startswith("event: chunk\n")
+    assert await stream.__anext__() == HEARTBEAT_FRAME
+
+    request.disconnected = True
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+    await asyncio.wait_for(llm_cancelled.wait(), timeout=1)
+
+    # The user message is kept even though the response was cancelled
+    messages = await SessionService(db_session).get_session_messages(session.id)
+    assert messages[-1].content == "Tell me about your services"
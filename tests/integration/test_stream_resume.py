@@ -0,0 +1,131 @@
+"""Integration tests for resuming response streams after a reconnect."""
+import asyncio
+import socket
+import uuid
+
+import pytest
+import socketio
+import uvicorn
+
+from src.main import sio
+from src.services.cache_service import cache_service
+from src.services.stream_buffer_service import stream_buffer
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+async def server_url():
+    """Serve the application's Socket.IO server on a free port."""
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        socketio.ASGIApp(sio), host="127.0.0.1", port=port, log_level="warning", lifespan="off",
+    ))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    await task
+
+
+async def _join_and_collect(
+    url: str, join_data: dict, expect_complete: bool, errors: list[dict] | None = None
+) -> list[dict]:
+    """Join a session and collect the streaming_message events received."""
+    client = socketio.AsyncClient()
+    received: list[dict] = []
+    done = asyncio.Event()
+
+    @client.on("error")
+    async def on_error(data):
+        if errors is not None:
+            errors.append(data)
+            done.set()
+
+    @client.on("streaming_message")
+    async def on_streaming_message(data):
+        received.append(data)
+        # A failed stream is followed by an error event
+        if data["is_complete"] and not data.get("failed"):
+            done.set()
+
+    @client.on("connected")
+    async def on_connected(data):
+        if not expect_complete:
+            # Replayed chunks are sent right after the connected event
+            await asyncio.sleep(0.2)
+            done.set()
+
+    try:
+        await client.connect(url)
+        await client.emit("join_session", join_data)
+        await asyncio.wait_for(done.wait(), timeout=5)
+    finally:
+        await client.disconnect()
+    return received
+
+
+@pytest.mark.asyncio
+async def test_rejoin_resumes_from_offset(server_url):
+    """Test a client rejoining mid-stream receives only the chunks it missed."""
+    cache_service.in_memory_cache.cache.clear()
+    session_id = str(uuid.uuid4())
+    message_id = str(uuid.uuid4())
+    for offset, chunk in enumerate(["We ", "can ", "help ", "with ", "that."]):
+        await stream_buffer.append(session_id, message_id, offset, chunk)
+    await stream_buffer.complete(session_id, message_id)
+
+    received = await _join_and_collect(server_url, {
+        "session_id": session_id,
+        "resume": {"message_id": message_id, "offset": 2},
+    }, expect_complete=True)
+
+    chunks = [event for event in received if not event["is_complete"]]
+    assert [event["offset"] for event in chunks] == [2, 3, 4]
+    assert "".join(event["chunk"] for event in chunks) == "help with that."
+    assert all(event["resumed"] and event["message_id"] == message_id for event in received)
+    assert received[-1]["is_complete"] is True
+
+
+@pytest.mark.asyncio
+async def test_rejoin_without_message_id_uses_latest_stream(server_url):
+    """Test a client that missed the first chunk resumes the session's latest stream."""
+    cache_service.in_memory_cache.cache.clear()
+    session_id = str(uuid.uuid4())
+    message_id = str(uuid.uuid4())
+    await stream_buffer.append(session_id, message_id, 0, "Still ")
+    await stream_buffer.append(session_id, message_id, 1, "typing")
+
+    received = await _join_and_collect(server_url, {
+        "session_id": session_id,
+        "resume": {"offset": 0},
+    }, expect_complete=False)
+
+    assert [(event["offset"], event["chunk"]) for event in received] == [(0, "Still "), (1, "typing")]
+
+
+@pytest.mark.asyncio
+async def test_rejoin_failed_stream_gets_terminal_event(server_url):
+    """Test a client resuming a stream that failed is told it ended."""
+    cache_service.in_memory_cache.cache.clear()
+    session_id = str(uuid.uuid4())
+    message_id = str(uuid.uuid4())
+    await stream_buffer.append(session_id, message_id, 0, "Let me ")
+    await stream_buffer.complete(session_id, message_id, failed=True)
+
+    errors: list[dict] = []
+    received = await _join_and_collect(server_url, {
+        "session_id": session_id,
+        "resume": {"message_id": message_id, "offset": 1},
+    }, expect_complete=True, errors=errors)
+
+    assert len(received) == 1
+    assert received[0]["is_complete"] is True
+    assert received[0]["failed"] is True
+    assert [error["message_id"] for error in errors] == [message_id]
@@ -237,10 +237,11 @@ async def test_prd_api_endpoint_creates_prd():
         await session.refresh(session_obj)
 
         # Override DB dependency
-        from src.core.database import get_db
+        from src.core.database import get_db, get_read_db
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Mock AI service
         with patch('src.services.prd_service.AIService') as mock_ai_service:
@@ -301,10 +302,11 @@ async def test_prd_download_endpoint_works():
         await session.refresh(prd)
 
         # Override DB dependency
-        from src.core.database import get_db
+        from src.core.database import get_db, get_read_db
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Test API endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -357,10 +359,11 @@ async def test_prd_preview_endpoint_works():
         await session.refresh(prd)
 
         # Override DB dependency
-        from src.core.database import get_db
+        from src.core.database import get_db, get_read_db
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Test API endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -8,7 +8,7 @@ from httpx import ASGITransport, AsyncClient
 from src.main import app
 from src.models.prd import PRDDocument
 from src.models.session import ConversationSession
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 
@@ -81,6 +81,7 @@ async def test_feature_75_post_prd_generate_endpoint():
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Test endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -132,6 +133,7 @@ async def test_feature_76_prd_download_endpoint():
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Test endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -180,6 +182,7 @@ async def test_feature_77_prd_preview_endpoint():
         async def override_get_db():
             yield session
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
 
         # Test endpoint
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
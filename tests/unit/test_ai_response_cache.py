@@ -0,0 +1,95 @@
+"""Unit tests for fingerprinted AI response caching."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.ai_service import (
+    AIService,
+    fingerprint_inputs,
+    hash_conversation_history,
+)
+from src.services.cache_service import cache_service
+
+HISTORY = [
+    {"role": "user", "content": "We need help with AI strategy"},
+    {"role": "assistant", "content": "Tell me more about your data."},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start each test with an empty in-memory cache."""
+    cache_service.in_memory_cache.cache.clear()
+    yield
+    cache_service.in_memory_cache.cache.clear()
+
+
+@pytest.fixture
+def ai_service():
+    """Create an AIService with a fake LLM."""
+    service = AIService()
+    service.llm = SimpleNamespace(
+        ainvoke=AsyncMock(return_value=SimpleNamespace(content="# PRD"))
+    )
+    return service
+
+
+def test_fingerprint_is_stable_across_key_order():
+    """Test dict key order does not change the fingerprint."""
+    first = fingerprint_inputs("prd", context={"a": 1, "b": 2}, feedback="")
+    second = fingerprint_inputs("prd", feedback="", context={"b": 2, "a": 1})
+
+    assert first == second
+    assert first.startswith("prd:")
+
+
+def test_fingerprint_changes_with_inputs():
+    """Test history and feedback changes produce a new fingerprint."""
+    base = fingerprint_inputs("prd", history=hash_conversation_history(HISTORY), feedback="")
+    more_history = fingerprint_inputs(
+        "prd",
+        history=hash_conversation_history(HISTORY + [{"role": "user", "content": "Budget is $50k"}]),
+        feedback="",
+    )
+    with_feedback = fingerprint_inputs(
+        "prd", history=hash_conversation_history(HISTORY), feedback="Add a timeline"
+    )
+
+    assert len({base, more_history, with_feedback}) == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_prd_reuses_cached_response(ai_service):
+    """Test identical PRD inputs call the LLM only once."""
+    kwargs = {
+        "business_context": {"challenges": "AI strategy"},
+        "client_info": {"name": "Jane"},
+        "conversation_history": HISTORY,
+    }
+
+    first = await ai_service.generate_prd(**kwargs)
+    second = await ai_service.generate_prd(**kwargs)
+
+    assert first == second == "# PRD"
+    assert ai_service.llm.ainvoke.await_count == 1
+
+    await ai_service.generate_prd(**kwargs, feedback="Add a timeline")
+    assert ai_service.llm.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_prd_does_not_cache_fallback(ai_service):
+    """Test a failed LLM call is not cached."""
+    ai_service.llm.ainvoke.side_effect = [RuntimeError("unavailable"), SimpleNamespace(content="# PRD")]
+    kwargs = {
+        "business_context": {"challenges": "AI strategy"},
+        "client_info": {"name": "Jane"},
+        "conversation_history": HISTORY,
+    }
+
+    fallback = await ai_service.generate_prd(**kwargs)
+    result = await ai_service.generate_prd(**kwargs)
+
+    assert fallback != "# PRD"
+    assert result == "# PRD"
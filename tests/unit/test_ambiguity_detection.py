@@ -257,6 +257,10 @@ class TestAmbiguityDetection:
         session_service.db.add = MagicMock()
         session_service.db.commit = AsyncMock()
         session_service.db.refresh = AsyncMock()
+        # Session data updates are UPDATE ... RETURNING statements
+        session_service.db.execute = AsyncMock(
+            return_value=MagicMock(one_or_none=MagicMock(return_value=None))
+        )
 
         # Test with an ambiguous message
         ambiguous_message = "maybe"
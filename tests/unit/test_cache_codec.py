@@ -0,0 +1,53 @@
+"""Unit tests for the compact cache encoding."""
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.utils import cache_codec, json_codec
+
+SESSION = {
+    "id": str(uuid.uuid4()),
+    "client_info": {"name": "Jane Roe"},
+    "messages": [
+        {"role": "user", "content": f"Message {i}: we need help with our intake workflow."}
+        for i in range(50)
+    ],
+}
+
+
+@pytest.mark.parametrize("compression", ["none", "zstd", "lz4"])
+def test_round_trip(compression):
+    """Test that values decode to what was encoded, with each compression."""
+    encoded = cache_codec.encode(SESSION, compression=compression, min_size=0)
+    assert encoded[0] == cache_codec.MAGIC
+    assert encoded[1] == cache_codec.VERSION
+    assert cache_codec.decode(encoded) == SESSION
+
+
+def test_compresses_only_above_threshold():
+    """Test that small values are stored uncompressed and large ones compressed."""
+    small = cache_codec.encode({"a": 1}, compression="zstd", min_size=1024)
+    large = cache_codec.encode(SESSION, compression="zstd", min_size=1024)
+
+    assert small[2] >> 4 == cache_codec.COMPRESSION_NONE
+    if cache_codec.ZSTD_AVAILABLE or cache_codec.LZ4_AVAILABLE:
+        assert large[2] >> 4 != cache_codec.COMPRESSION_NONE
+        assert len(large) < len(json_codec.dumps(SESSION)) / 2
+
+
+def test_native_types_encode_like_json():
+    """Test that UUIDs and datetimes decode to the strings the JSON cache stored."""
+    value = {"id": uuid.UUID(int=1), "at": datetime(2026, 1, 2, 3, 4, 5)}
+    assert cache_codec.decode(cache_codec.encode(value)) == json_codec.loads(json_codec.dumps(value))
+
+
+def test_decodes_legacy_json_and_rejects_garbage():
+    """Test that values cached as JSON before the binary encoding still decode."""
+    assert cache_codec.decode('{"a": 1}') == {"a": 1}
+    assert cache_codec.decode(b'{"a": 1}') == {"a": 1}
+
+    with pytest.raises(cache_codec.CacheDecodeError):
+        cache_codec.decode(bytes((cache_codec.MAGIC, 99, 0)) + b"data")
+    with pytest.raises(cache_codec.CacheDecodeError):
+        cache_codec.decode(bytes((cache_codec.MAGIC, cache_codec.VERSION, 0x11)) + b"not zstd")
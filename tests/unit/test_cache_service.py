@@ -1,19 +1,29 @@
 """Unit tests for CacheService."""
 import asyncio
+import fnmatch
 import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import pytest_asyncio
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from src.core.config import settings
 from src.services.cache_service import (
+    CACHE_PREFIXES,
+    NEGATIVE_ENTRY,
     CacheService,
     InMemoryCache,
+    cache_expert_data,
     cache_session_data,
     clear_expired_cache,
     delete_cached_session_data,
+    get_cache_service,
+    get_cached_expert_data,
     get_cached_session_data,
     increment_rate_limit,
+    invalidate_namespace,
 )
 
 
@@ -175,6 +185,18 @@ class TestInMemoryCache:
         value = await in_memory_cache.get_hash("test_hash", "field2")
         assert value == "value2"
 
+    @pytest.mark.asyncio
+    async def test_lock_acquire_and_release(self, in_memory_cache):
+        """Test locks are exclusive and only released by their holder."""
+        assert await in_memory_cache.acquire_lock("lock", "token-a", ttl=60) is True
+        assert await in_memory_cache.acquire_lock("lock", "token-b", ttl=60) is False
+
+        # Another holder's token cannot release the lock
+        assert await in_memory_cache.release_lock("lock", "token-b") is False
+        assert await in_memory_cache.release_lock("lock", "token-a") is True
+
+        assert await in_memory_cache.acquire_lock("lock", "token-b", ttl=60) is True
+
 
 class TestCacheService:
     """Test cases for CacheService with Redis fallback."""
@@ -190,12 +212,17 @@ class TestCacheService:
         with patch('redis.asyncio.from_url') as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.ping.return_value = True
+            mock_redis_instance.pubsub = Mock(side_effect=Exception("Pub/sub unavailable"))
             mock_redis.return_value = mock_redis_instance
 
             await cache_service.connect()
 
             assert cache_service.use_redis is True
             assert cache_service.redis == mock_redis_instance
+            # L1 stays off without invalidation messages
+            await asyncio.sleep(0)
+            assert cache_service.l1_active is False
+            await cache_service.disconnect()
 
     @pytest.mark.asyncio
     async def test_connect_redis_unavailable(self, cache_service):
@@ -251,6 +278,41 @@ class TestCacheService:
         value = await cache_service.get("test_key")
         assert value == "test_value"
 
+    @pytest.mark.asyncio
+    async def test_set_packed_redis_stores_binary(self, cache_service):
+        """Test that packed values go to Redis encoded, through the binary client."""
+        await cache_service.connect()
+        cache_service.use_redis = True
+        cache_service.redis = AsyncMock()
+        cache_service.redis_binary = AsyncMock()
+
+        value = {"messages": [{"content": "hello " * 500}]}
+        assert await cache_service.set_packed("test_key", value, ttl=60) is True
+
+        key, ttl, encoded = cache_service.redis_binary.setex.call_args.args
+        assert (key, ttl) == ("test_key", 60)
+        assert len(encoded) < len(json.dumps(value))
+        cache_service.redis.setex.assert_not_called()
+
+        cache_service.redis_binary.get.return_value = encoded
+        assert await cache_service.get_packed("test_key") == value
+
+    @pytest.mark.asyncio
+    async def test_memory_report(self, cache_service):
+        """Test reporting the size of cached values matching a pattern."""
+        await cache_service.connect()
+        await cache_service.set_packed("session:1", {"messages": ["hi"] * 10})
+        await cache_service.set_packed("session:2", {"messages": []})
+        await cache_service.set("expert:1", {"name": "Expert"})
+
+        sizes = [len(await cache_service.in_memory_cache.get(f"session:{i}")) for i in (1, 2)]
+        assert await cache_service.memory_report("session:*") == {
+            "keys": 2,
+            "total_bytes": sum(sizes),
+            "bytes_per_key": round(sum(sizes) / 2),
+            "max_bytes": max(sizes),
+        }
+
     @pytest.mark.asyncio
     async def test_delete_redis_available(self, cache_service):
         """Test deleting with Redis."""
@@ -275,6 +337,526 @@ class TestCacheService:
         assert result is True
 
 
+class FakeRedis:
+    """Minimal Redis double sharing a store and pub/sub channels between clients."""
+
+    def __init__(self, store: dict, channels: dict):
+        self.store = store
+        self.channels = channels
+        self.gets = 0
+        self.round_trips = 0
+        self.down = False
+
+    def _check_up(self):
+        if self.down:
+            raise RedisConnectionError("Connection refused")
+
+    async def ping(self):
+        self._check_up()
+        return True
+
+    async def get(self, key):
+        self._check_up()
+        self.gets += 1
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    async def scan_iter(self, match, count):
+        for key in fnmatch.filter(list(self.store), match):
+            yield key
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, nx=False, ex=None):
+        self._check_up()
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def incr(self, key, amount=1):
+        self.store[key] = str(int(self.store.get(key, 0)) + amount)
+        return int(self.store[key])
+
+    async def setex(self, key, ttl, value):
+        self._check_up()
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, message):
+        for queue in self.channels.get(channel, []):
+            queue.put_nowait(message)
+
+    def pubsub(self):
+        return FakePubSub(self.channels)
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    """Buffers commands and runs them on execute() in one round trip."""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def set(self, key, value):
+        self.commands.append(lambda: self.redis.store.__setitem__(key, value))
+
+    def setex(self, key, ttl, value):
+        self.set(key, value)
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.store.get(key))
+
+    def ttl(self, key):
+        self.commands.append(lambda: -1 if key in self.redis.store else -2)
+
+    def pttl(self, key):
+        self.commands.append(lambda: 60_000 if key in self.redis.store else -2)
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: key in self.redis.store)
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [command() for command in self.commands]
+
+
+class FakePubSub:
+    def __init__(self, channels: dict):
+        self.channels = channels
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.setdefault(channel, []).append(self.queue)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        # Like redis-py: without a timeout, reads time out after the
+        # client's socket_timeout; with one, a quiet channel returns None
+        try:
+            async with asyncio.timeout(settings.redis_socket_timeout_seconds if timeout is None else timeout):
+                return {"type": "message", "data": await self.queue.get()}
+        except TimeoutError:
+            if timeout is None:
+                raise RedisTimeoutError("Timeout reading from socket") from None
+            return None
+
+    async def aclose(self):
+        for queues in self.channels.values():
+            if self.queue in queues:
+                queues.remove(self.queue)
+
+
+class TestTwoTierCache:
+    """Test the in-process L1 cache in front of Redis."""
+
+    @pytest_asyncio.fixture
+    async def workers(self):
+        """Two cache services (workers) sharing one Redis."""
+        store: dict = {}
+        channels: dict = {}
+        services = []
+        for _ in range(2):
+            service = CacheService()
+            for prefix in ("turn_lock:",):
+                service.mark_strongly_consistent(prefix)
+            service.use_redis = True
+            service.redis = service.redis_binary = FakeRedis(store, channels)
+            service._invalidation_task = asyncio.create_task(service._listen_for_invalidations())
+            services.append(service)
+        await asyncio.sleep(0)
+        yield services
+        for service in services:
+            await service.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_reads_are_served_from_l1(self, workers):
+        """Test that repeated reads skip Redis and hit ratios are counted per tier."""
+        writer, reader = workers
+        await writer.set("expert:1", {"name": "Expert"})
+
+        assert await reader.get("expert:1") == {"name": "Expert"}
+        assert await reader.get("expert:1") == {"name": "Expert"}
+        assert reader.redis.gets == 1
+
+        stats = reader.get_tier_stats()
+        assert stats["l1"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+        assert stats["l2"] == {"hits": 1, "misses": 0, "hit_ratio": 1.0}
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_l1_in_other_workers(self, workers):
+        """Test that set and delete on one worker drop the key from the others' L1."""
+        writer, reader = workers
+        await writer.set_packed("session:1", {"phase": "greeting"})
+        assert await reader.get_packed("session:1") == {"phase": "greeting"}
+
+        await writer.set_packed("session:1", {"phase": "discovery"})
+        await asyncio.sleep(0)
+        assert await reader.get_packed("session:1") == {"phase": "discovery"}
+
+        await writer.delete("session:1")
+        await asyncio.sleep(0)
+        assert await reader.get_packed("session:1") is None
+
+    @pytest.mark.asyncio
+    async def test_strongly_consistent_keys_bypass_l1(self, workers):
+        """Test that keys marked strongly consistent are always read from Redis."""
+        _, reader = workers
+        await reader.set("turn_lock:1", "token")
+
+        assert await reader.get("turn_lock:1") == "token"
+        assert await reader.get("turn_lock:1") == "token"
+        assert reader.redis.gets == 2
+        assert reader.get_tier_stats()["l1"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_operations_batch_round_trips(self, workers, monkeypatch):
+        """Test that set_many/get_many/delete_many use one round trip per batch."""
+        monkeypatch.setattr("src.services.cache_service.BATCH_SIZE", 2)
+        writer, reader = workers
+        values = {f"expert:{i}": {"id": i} for i in range(3)}
+        assert await writer.set_many(values, ttl=60) is True
+        assert writer.redis.round_trips == 2
+
+        writer.redis.round_trips = 0
+        assert await reader.get_many([*values, "expert:missing"]) == values
+        assert reader.redis.round_trips == 2
+        assert await reader.get_many(values) == values
+        assert reader.redis.round_trips == 2  # Served from L1
+
+        assert await writer.delete_many(values) == 3
+        await asyncio.sleep(0)
+        assert await reader.get_many(values) == {}
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_scans_in_batches(self, workers, monkeypatch):
+        """Test that delete_pattern deletes scanned keys in batches and invalidates L1."""
+        monkeypatch.setattr("src.services.cache_service.BATCH_SIZE", 2)
+        writer, reader = workers
+        for i in range(5):
+            await writer.set(f"expert:{i}", i)
+        await writer.set("session:1", "kept")
+        assert await reader.get("expert:0") == 0
+
+        writer.redis.round_trips = 0
+        assert await writer.delete_pattern("expert:*") == 5
+        assert writer.redis.round_trips == 3
+        await asyncio.sleep(0)
+        assert await reader.get("expert:0") is None
+        assert await reader.keys("*") == ["session:1"]
+
+    @pytest.mark.asyncio
+    async def test_clear_expired_cache_pipelines_ttls(self, workers, monkeypatch):
+        """Test that clear_expired_cache reads TTLs and sets expirations in pipelines."""
+        writer, _ = workers
+        monkeypatch.setattr("src.services.cache_service.cache_service", writer)
+        for i in range(4):
+            await writer.set(f"session:{i}", i)
+
+        writer.redis.round_trips = 0
+        assert await clear_expired_cache("session:*") == 4
+        assert writer.redis.round_trips == 2  # TTL pipeline, one DEL
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_reads_value_and_ttl_together(self, workers):
+        """Test that get_or_load reads a hit and its TTL in one round trip, then from L1."""
+        writer, reader = workers
+        await writer.set_packed("session:1", {"phase": "greeting"})
+
+        async def loader():
+            raise AssertionError("loader must not run on a hit")
+
+        assert await reader.get_or_load("session:1", loader, 60, packed=True) == {"phase": "greeting"}
+        assert reader.redis.round_trips == 1
+        assert await reader.get_or_load("session:1", loader, 60, packed=True) == {"phase": "greeting"}
+        assert reader.redis.round_trips == 1
+
+
+    @pytest.mark.asyncio
+    async def test_idle_subscription_outlives_socket_timeout(self, monkeypatch):
+        """Test that a quiet invalidation channel keeps L1 active past the socket timeout."""
+        monkeypatch.setattr(settings, "redis_socket_timeout_seconds", 0.02)
+        monkeypatch.setattr(settings, "redis_health_check_seconds", 0.01)
+        store: dict = {}
+        channels: dict = {}
+        writer, reader = CacheService(), CacheService()
+        for service in (writer, reader):
+            service.use_redis = True
+            service.redis = service.redis_binary = FakeRedis(store, channels)
+            service._invalidation_task = asyncio.create_task(service._listen_for_invalidations())
+        await asyncio.sleep(0)
+        await writer.set("expert:1", {"name": "Expert"})
+        await asyncio.sleep(0)
+        assert await reader.get("expert:1") == {"name": "Expert"}
+
+        await asyncio.sleep(settings.redis_socket_timeout_seconds * 5)
+
+        # Still subscribed once, with the value served from L1
+        assert reader.l1_active is True
+        assert len(channels[settings.cache_invalidation_channel]) == 2
+        assert await reader.get("expert:1") == {"name": "Expert"}
+        assert reader.redis.gets == 1
+
+        await writer.set("expert:1", {"name": "Renamed"})
+        await asyncio.sleep(0)
+        assert await reader.get("expert:1") == {"name": "Renamed"}
+        for service in (writer, reader):
+            await service.disconnect()
+
+
+class TestNamespaces:
+    """Test generation-versioned cache namespaces."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_namespace(self):
+        """Test that bumping a namespace's generation hides all its entries."""
+        generation = await get_cache_service().get_generation(CACHE_PREFIXES["expert"])
+        assert generation > 1_000_000_000_000  # Starts at the time in milliseconds
+
+        await cache_expert_data("1", {"name": "Expert"})
+        await cache_session_data("1", {"phase": "greeting"})
+        assert await get_cached_expert_data("1") == {"name": "Expert"}
+
+        assert await invalidate_namespace("expert") == generation + 1
+        assert await get_cached_expert_data("1") is None
+        assert await get_cached_session_data("1") == {"phase": "greeting"}
+
+        await cache_expert_data("1", {"name": "Renamed"})
+        assert await get_cached_expert_data("1") == {"name": "Renamed"}
+
+    @pytest.mark.asyncio
+    async def test_bump_reaches_other_workers_l1(self, monkeypatch):
+        """Test that a generation cached in another worker's L1 is invalidated on bump."""
+        store: dict = {}
+        channels: dict = {}
+        writer, reader = CacheService(), CacheService()
+        for service in (writer, reader):
+            service.use_redis = True
+            service.redis = service.redis_binary = FakeRedis(store, channels)
+            service._invalidation_task = asyncio.create_task(service._listen_for_invalidations())
+        await asyncio.sleep(0)
+
+        key = await reader.namespaced_key("api:", "abc")
+        await writer.set(key, {"ok": True})
+        assert await reader.get(await reader.namespaced_key("api:", "abc")) == {"ok": True}
+
+        await writer.bump_generation("api:")
+        await asyncio.sleep(0)
+        assert await reader.namespaced_key("api:", "abc") != key
+        for service in (writer, reader):
+            await service.disconnect()
+
+class TestDegradedMode:
+    """Test switching between Redis and the in-memory cache as Redis goes down and recovers."""
+
+    @pytest_asyncio.fixture
+    async def redis(self, monkeypatch):
+        """Patch the Redis client with a double that can be taken down."""
+        monkeypatch.setattr(settings, "redis_health_check_seconds", 0.01)
+        monkeypatch.setattr(settings, "redis_reconnect_seconds", 0.01)
+        monkeypatch.setattr(settings, "cache_l1_enabled", False)
+        fake = FakeRedis({}, {})
+        with patch("redis.asyncio.from_url", return_value=fake):
+            yield fake
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_switch_to_memory_and_back(self, redis):
+        """Test that connection errors switch to memory and recovery drops keys written meanwhile."""
+        service = CacheService()
+        await service.connect()
+        assert service.use_redis is True
+        await service.set("session:1", "before outage")
+
+        redis.down = True
+        for _ in range(settings.cache_breaker_failure_threshold):
+            assert await service.get("expert:1") is None
+        assert service.use_redis is False
+        assert service.get_connection_stats()["switches"] == {"to_memory": 1, "to_redis": 0}
+
+        # Degraded operations don't touch Redis
+        await service.set("session:1", "during outage")
+        assert await service.get("session:1") == "during outage"
+
+        redis.down = False
+        await asyncio.sleep(0.05)
+        stats = service.get_connection_stats()
+        assert stats["backend"] == "redis"
+        assert stats["switches"] == {"to_memory": 1, "to_redis": 1}
+        # The value cached before the outage is stale, so it was dropped
+        assert await service.get("session:1") is None
+        assert service.in_memory_cache.cache == {}
+        await service.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_listener_follows_switches(self, redis, monkeypatch):
+        """Test that the invalidation listener stops while degraded and restarts on recovery."""
+        monkeypatch.setattr(settings, "cache_l1_enabled", True)
+        service = CacheService()
+        await service.connect()
+        await asyncio.sleep(0)
+        assert service.l1_active is True
+
+        redis.down = True
+        for _ in range(settings.cache_breaker_failure_threshold):
+            await service.get("expert:1")
+        await asyncio.sleep(0.05)
+        assert service._invalidation_task is not None
+        assert service._invalidation_task.done()
+        assert service.l1_active is False
+
+        redis.down = False
+        await asyncio.sleep(0.05)
+        assert service.use_redis is True
+        assert service.l1_active is True
+        await service.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_connect_while_redis_is_down(self, redis):
+        """Test that a cache started without Redis switches to it once it is up."""
+        redis.down = True
+        service = CacheService()
+        await service.connect()
+        assert service.use_redis is False
+        assert service.degraded is True
+
+        redis.down = False
+        await asyncio.sleep(0.05)
+        assert service.use_redis is True
+        assert service.degraded is False
+        await service.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_tracked_before_redis_was_reached(self, redis):
+        """Test that writes of a cache that never reached Redis are not tracked for recovery."""
+        redis.down = True
+        service = CacheService()
+        await service.connect()
+        await service.set("session:1", "in memory")
+        assert service.get_connection_stats()["pending_stale_keys"] == 0
+        await service.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_tracked_writes_past_the_cap_drop_their_prefix(self, redis, monkeypatch):
+        """Test that past the cap, recovery drops the prefixes of keys written while degraded."""
+        monkeypatch.setattr(settings, "cache_degraded_max_tracked_keys", 2)
+        service = CacheService()
+        await service.connect()
+        await service.set("session:old", "before outage")
+        await service.set("expert:1", "before outage")
+
+        redis.down = True
+        for _ in range(settings.cache_breaker_failure_threshold):
+            await service.get("expert:1")
+        assert service.use_redis is False
+        for i in range(50):
+            await service.set(f"session:{i}", "during outage")
+        # The prefix pattern plus at most the capped number of keys
+        assert service.get_connection_stats()["pending_stale_keys"] <= 3
+
+        redis.down = False
+        await asyncio.sleep(0.05)
+        assert service.use_redis is True
+        assert await service.get("session:old") is None
+        assert await service.get("expert:1") == "before outage"
+        await service.disconnect()
+
+
+class TestGetOrLoad:
+    """Test single-flight cache-aside loads."""
+
+    @pytest.fixture
+    def cache_service(self):
+        """Create CacheService instance (in-memory)."""
+        return CacheService()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, cache_service):
+        """Test that concurrent misses for a key run the loader once."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"name": "Expert"}
+
+        results = await asyncio.gather(
+            *(cache_service.get_or_load("expert:1", loader, 60) for _ in range(10))
+        )
+        assert results == [{"name": "Expert"}] * 10
+        assert calls == 1
+        assert await cache_service.get("expert:1") == {"name": "Expert"}
+
+    @pytest.mark.asyncio
+    async def test_load_errors_reach_waiters_and_are_not_cached(self, cache_service):
+        """Test that a failed load raises for every waiter and the next call retries."""
+        async def failing_loader():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database unavailable")
+
+        results = await asyncio.gather(
+            *(cache_service.get_or_load("expert:1", failing_loader, 60) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def loader():
+            return {"name": "Expert"}
+
+        assert await cache_service.get_or_load("expert:1", loader, 60) == {"name": "Expert"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_keys_are_negatively_cached(self, cache_service):
+        """Test that a missing value is remembered for negative_ttl."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return None
+
+        for _ in range(3):
+            assert await cache_service.get_or_load("session:unknown", loader, 60, packed=True, negative_ttl=30) is None
+        assert calls == 1
+        assert await cache_service.get_packed("session:unknown") == NEGATIVE_ENTRY
+
+        await cache_service.delete("session:unknown")
+        await cache_service.get_or_load("session:unknown", loader, 60, packed=True, negative_ttl=30)
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_hits_near_expiry_are_refreshed_early(self, cache_service, monkeypatch):
+        """Test that a hit is reloaded early when loads are slow relative to the remaining TTL."""
+        async def loader():
+            return "fresh"
+
+        await cache_service.set("expert:1", "stale", ttl=5)
+        assert await cache_service.get_or_load("expert:1", loader, 60) == "stale"
+
+        cache_service._load_seconds["expert"] = 10.0
+        monkeypatch.setattr("src.services.cache_service.random.random", lambda: 0.9)
+        assert await cache_service.get_or_load("expert:1", loader, 60) == "fresh"
+
+        monkeypatch.setattr(settings, "cache_early_refresh_beta", 0.0)
+        await cache_service.set("expert:1", "cached", ttl=5)
+        assert await cache_service.get_or_load("expert:1", loader, 60) == "cached"
+
+
 class TestCacheConvenienceFunctions:
     """Test convenience functions."""
 
@@ -0,0 +1,53 @@
+"""Unit tests for skipping schema creation on an up-to-date database."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import src.models  # noqa: F401  Registers every model table
+from src.core.database import Base, _schema_is_current, get_migration_head
+
+
+@pytest.mark.asyncio
+async def test_schema_is_current_only_when_migrated_to_head():
+    """Test that create_all is needed until all tables exist at the head revision."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        assert await conn.run_sync(_schema_is_current) is False
+
+        await conn.run_sync(Base.metadata.create_all)
+        # Tables exist but the database was never stamped
+        assert await conn.run_sync(_schema_is_current) is False
+
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        await conn.execute(
+            text("INSERT INTO alembic_version (version_num) VALUES (:head)"),
+            {"head": get_migration_head()},
+        )
+        assert await conn.run_sync(_schema_is_current) is True
+
+        await conn.execute(text("DROP TABLE llm_usage"))
+        assert await conn.run_sync(_schema_is_current) is False
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_refuses_writes():
+    """Test that read-only sessions can query but never flush or commit."""
+    from sqlalchemy.exc import InvalidRequestError
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from src.core.database import ReadOnlySession
+    from src.models.expert import Expert
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, class_=ReadOnlySession)() as session:
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+        session.add(Expert(name="Reader", email="reader@example.com", role="Engineer"))
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
+        with pytest.raises(InvalidRequestError):
+            await session.commit()
+    await engine.dispose()
@@ -0,0 +1,55 @@
+"""Unit tests for the fast JSON codec."""
+import importlib
+import sys
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.models.session import MessageRole
+from src.utils import json_codec
+
+PAYLOAD = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, 600000, tzinfo=UTC),
+    "role": MessageRole.USER,
+    "name": "Zoë",
+    "tags": ["a", "b"],
+    1: None,
+}
+EXPECTED = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "created_at": "2026-01-02T03:04:05.600000+00:00",
+    "role": "user",
+    "name": "Zoë",
+    "tags": ["a", "b"],
+    "1": None,
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """The codec module with each backend."""
+    if request.param == "stdlib":
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    elif not json_codec.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    yield importlib.reload(json_codec)
+    monkeypatch.undo()
+    importlib.reload(json_codec)
+
+
+def test_native_types_round_trip(codec):
+    """Test that UUIDs, datetimes, enums and non-string keys are encoded natively."""
+    encoded = codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == EXPECTED
+    assert codec.loads(codec.dumps_str(PAYLOAD)) == EXPECTED
+
+
+def test_backends_produce_identical_output(codec):
+    """Test that sorted output is byte-identical, so cache keys don't depend on the backend."""
+    assert codec.dumps({"b": 1, "a": [True, None, 1.5]}, sort_keys=True) == b'{"a":[true,null,1.5],"b":1}'
+    # Other objects fall back to str()
+    assert codec.dumps({"price": Decimal("1.50")}) == b'{"price":"1.50"}'
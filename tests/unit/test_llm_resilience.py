@@ -0,0 +1,182 @@
+"""Unit tests for the LLM circuit breaker, deadlines and hedged requests."""
+import asyncio
+
+import pytest
+
+from src.core.config import settings
+from src.core.exceptions import LLMUnavailableError
+from src.services.ai_service import AIService
+from src.services.fake_llm import FakeLLMError, FaultInjectingLLM
+from src.services.llm_resilience import CircuitBreaker, guarded_stream, hedged_call
+from src.services.llm_scheduler import LLMScheduler
+
+CONTEXT = {"client_info": {}, "business_context": {}, "qualification": {}}
+
+
+async def _fail() -> None:
+    raise FakeLLMError("boom")
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_threshold_and_rejects():
+    """Test consecutive failures open the breaker, which then fails fast."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    for _ in range(2):
+        breaker.check()
+        with pytest.raises(FakeLLMError):
+            async with breaker.track():
+                await _fail()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(LLMUnavailableError):
+        breaker.check()
+    assert breaker.get_metrics()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_probe_closes_on_success():
+    """Test a single probe is admitted after recovery and closes the breaker."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    breaker.check()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(LLMUnavailableError):
+        breaker.check()  # Only one probe at a time
+
+    async with breaker.track():
+        pass
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_probe_failure_reopens():
+    """Test a failed probe reopens the breaker."""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0.01)
+    for _ in range(3):
+        breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    breaker.check()
+    with pytest.raises(FakeLLMError):
+        async with breaker.track():
+            await _fail()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_uses_the_faster_attempt():
+    """Test a slow first attempt is hedged and the hedge's result wins."""
+    delays = [1.0, 0.01]
+    started = []
+
+    async def call() -> str:
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return f"done after {delay}"
+
+    scheduler = LLMScheduler(max_concurrency=2, max_queue_depth=1, max_queue_wait=1)
+    await scheduler.acquire()  # The primary's slot
+    result = await asyncio.wait_for(hedged_call(call, hedge_delay=0.05, scheduler=scheduler), 0.5)
+
+    assert result == "done after 0.01"
+    assert scheduler.in_flight == 1  # The hedge slot was returned
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_skips_hedge_without_free_slot():
+    """Test hedging never exceeds the concurrency budget."""
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=1, max_queue_wait=1)
+    await scheduler.acquire()
+    assert await hedged_call(call, hedge_delay=0.01, scheduler=scheduler) == "ok"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_guarded_stream_first_token_deadline():
+    """Test a stream with no first token in time raises TimeoutError."""
+    llm = FaultInjectingLLM(first_token_latency=0, stall_rate=1.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        async for _ in guarded_stream(lambda: llm.astream([]), first_token_timeout=0.05, timeout=1):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_guarded_stream_hedges_stalled_stream():
+    """Test a stream stalled before its first token is replaced by a hedge."""
+    stalled = FaultInjectingLLM(response="never", first_token_latency=0, stall_rate=1.0)
+    healthy = FaultInjectingLLM(response="hedged reply", first_token_latency=0)
+    streams = iter([stalled.astream([]), healthy.astream([])])
+
+    chunks = [
+        chunk.content
+        async for chunk in guarded_stream(
+            lambda: next(streams), first_token_timeout=1, timeout=1, hedge_delay=0.02
+        )
+    ]
+    assert "".join(chunks) == "hedged reply"
+
+
+@pytest.mark.asyncio
+async def test_generate_response_falls_back_fast_when_breaker_open(monkeypatch):
+    """Test an open breaker answers from templates without calling the LLM."""
+    monkeypatch.setattr(settings, "llm_timeout_seconds", 0.05)
+    service = AIService()
+    service.llm = FaultInjectingLLM(first_token_latency=0, stall_rate=1.0)  # type: ignore[assignment]
+    service.circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    fallback = service._fallback_response("Hello", CONTEXT)
+
+    # Deadline misses count as failures and open the breaker
+    for _ in range(2):
+        assert await service.generate_response("Hello", [], CONTEXT) == fallback
+    assert service.circuit_breaker.state == CircuitBreaker.OPEN
+
+    calls = service.llm.calls  # type: ignore[union-attr]
+    assert await service.generate_response("Hello", [], CONTEXT) == fallback
+    assert service.llm.calls == calls  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_stream_response_falls_back_on_first_token_deadline(monkeypatch):
+    """Test a stalled stream is answered from templates after the deadline."""
+    monkeypatch.setattr(settings, "llm_first_token_timeout_seconds", 0.05)
+    service = AIService()
+    service.llm = FaultInjectingLLM(first_token_latency=0, stall_rate=1.0)  # type: ignore[assignment]
+    service.circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60)
+
+    chunks = [chunk async for chunk in service.stream_response("Hello", [], CONTEXT)]
+
+    assert "".join(chunks) == service._fallback_response("Hello", CONTEXT)
+    assert service.circuit_breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_response_reraises_after_partial_output():
+    """Test a stream failing mid-response is not followed by a fallback."""
+    service = AIService()
+    service.llm = FaultInjectingLLM(first_token_latency=0)  # type: ignore[assignment]
+
+    async def failing_stream(messages, priority):
+        yield "Partial answer"
+        raise FakeLLMError("connection reset")
+
+    service.stream_llm = failing_stream  # type: ignore[method-assign]
+
+    chunks = []
+    with pytest.raises(FakeLLMError):
+        async for chunk in service.stream_response("Hello", [], CONTEXT):
+            chunks.append(chunk)
+
+    assert chunks == ["Partial answer"]
@@ -0,0 +1,134 @@
+"""Unit tests for LLM admission control and priority scheduling."""
+import asyncio
+
+import pytest
+
+from src.core.exceptions import LLMOverloadedError
+from src.services.ai_service import AIService
+from src.services.llm_scheduler import LLMScheduler, chat_priority
+
+
+async def _hold_slot(scheduler: LLMScheduler, release: asyncio.Event) -> None:
+    async with scheduler.slot():
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_budget_is_enforced():
+    """Test no more than max_concurrency calls run at once."""
+    scheduler = LLMScheduler(max_concurrency=2, max_queue_depth=10, max_queue_wait=5)
+    running = 0
+    max_running = 0
+
+    async def call():
+        nonlocal running, max_running
+        async with scheduler.slot():
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert max_running == 2
+    assert scheduler.in_flight == 0
+    assert scheduler.get_metrics()["admitted"] == 6
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_priority():
+    """Test the highest-priority waiter gets the next free slot."""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=10, max_queue_wait=5)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(scheduler, release))
+    await asyncio.sleep(0)
+
+    order: list[str] = []
+
+    async def call(name: str, priority: int):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    waiters = [
+        asyncio.create_task(call("greeting", 0)),
+        asyncio.create_task(call("booking", 90)),
+        asyncio.create_task(call("qualification", 40)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    assert order == ["booking", "qualification", "greeting"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_load():
+    """Test calls are rejected when the queue is full."""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=1, max_queue_wait=5)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(scheduler, release))
+    queued = asyncio.create_task(_hold_slot(scheduler, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(LLMOverloadedError):
+        await scheduler.acquire()
+
+    release.set()
+    await asyncio.gather(holder, queued)
+    assert scheduler.get_metrics()["shed"] == 1
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_timeout_sheds_load():
+    """Test a call waiting longer than max_queue_wait is shed."""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=10, max_queue_wait=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(scheduler, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(LLMOverloadedError):
+        await scheduler.acquire()
+    assert scheduler.queue_depth == 0
+
+    release.set()
+    await holder
+    assert scheduler.in_flight == 0
+
+
+def test_chat_priority_prefers_late_phases_and_high_scores():
+    """Test booking-phase, high-score turns outrank new visitors."""
+    new_visitor = chat_priority({"current_phase": "greeting", "lead_score": 0})
+    qualified = chat_priority({"current_phase": "qualification", "lead_score": 60})
+    booking = chat_priority({"current_phase": "booking", "lead_score": 80})
+
+    assert new_visitor < qualified < booking
+    assert chat_priority(None) == 0
+
+
+@pytest.mark.asyncio
+async def test_shed_turn_uses_fallback_response(monkeypatch):
+    """Test an overloaded scheduler makes AIService answer from templates."""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=1, max_queue_wait=5)
+    monkeypatch.setattr("src.services.ai_service.llm_scheduler", scheduler)
+
+    class UnusedLLM:
+        async def ainvoke(self, messages):
+            raise AssertionError("LLM must not be called when shedding")
+
+    service = AIService()
+    service.llm = UnusedLLM()  # type: ignore[assignment]
+    context = {"client_info": {}, "business_context": {}, "qualification": {}}
+
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(scheduler, release))
+    queued = asyncio.create_task(_hold_slot(scheduler, release))
+    await asyncio.sleep(0)
+
+    response = await service.generate_response("Hello", [], context)
+
+    assert response == service._fallback_response("Hello", context)
+    release.set()
+    await asyncio.gather(holder, queued)
@@ -0,0 +1,68 @@
+"""Unit tests for the queued, secure logging pipeline."""
+import json
+import logging
+import queue
+
+from src.core.logging_config import (
+    DeferredQueueHandler,
+    JSONFormatter,
+    SecureQueueListener,
+)
+
+
+class ListHandler(logging.Handler):
+    """Handler collecting formatted records."""
+
+    def __init__(self, level: int) -> None:
+        super().__init__(level)
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+def _pipeline(handler_level: int) -> tuple[logging.Logger, SecureQueueListener, ListHandler]:
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = ListHandler(handler_level)
+    handler.setFormatter(JSONFormatter())
+    listener = SecureQueueListener(log_queue, handler, respect_handler_level=True)
+    logger = logging.getLogger(f"test_logging_config.{handler_level}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    return logger, listener, handler
+
+
+def test_records_are_masked_and_written_as_json():
+    """Test that the listener masks messages, args and tracebacks."""
+    logger, listener, handler = _pipeline(logging.INFO)
+    listener.start()
+    logger.info("Contact %s", "john.doe@example.com", extra={"session_id": "abc"})
+    try:
+        raise ValueError("key sk-s8ksxnh1xvhy5pmljwe8cjbcbbfjvm2njios6zcvh6z9izep")
+    except ValueError:
+        logger.exception("Failed")
+    listener.stop()
+
+    first, second = (json.loads(line) for line in handler.lines)
+    assert first["message"] == "Contact [EMAIL_MASKED]"
+    assert first["level"] == "INFO"
+    assert first["session_id"] == "abc"
+    assert "[API_KEY_MASKED]" in second["exception"]
+    assert "sk-s8ksxnh1" not in second["exception"]
+
+
+def test_records_below_handler_level_are_not_masked():
+    """Test that records no handler accepts are dropped before masking."""
+    logger, listener, handler = _pipeline(logging.WARNING)
+    prepared: list[logging.LogRecord] = []
+    prepare = listener.prepare
+    listener.prepare = lambda record: prepared.append(record) or prepare(record)  # type: ignore[method-assign]
+    listener.start()
+    logger.debug("Debug %s", "john.doe@example.com")
+    logger.warning("Warning %s", "john.doe@example.com")
+    listener.stop()
+    listener.stop()  # Idempotent
+
+    assert [record.levelno for record in prepared] == [logging.WARNING]
+    assert len(handler.lines) == 1
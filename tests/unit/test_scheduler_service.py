@@ -0,0 +1,57 @@
+"""Unit tests for the background scheduler service."""
+import asyncio
+
+import pytest
+
+from src.services.scheduler_service import SchedulerService
+
+
+@pytest.mark.asyncio
+async def test_periodic_job_runs_on_start_and_repeats():
+    """Test that a job with run_on_start runs immediately and then on interval."""
+    scheduler = SchedulerService()
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    scheduler.register("test_job", 0.01, job, run_on_start=True)
+    await scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert len(calls) >= 2
+    status = scheduler.get_status()["test_job"]
+    assert status["run_count"] == len(calls)
+    assert status["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_failing_job_records_error_and_keeps_running():
+    """Test that job exceptions are recorded without stopping the loop."""
+    scheduler = SchedulerService()
+
+    async def failing_job():
+        raise RuntimeError("boom")
+
+    scheduler.register("failing", 0.01, failing_job, run_on_start=True)
+    await scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    status = scheduler.get_status()["failing"]
+    assert status["run_count"] >= 2
+    assert status["last_error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_run_job_now():
+    """Test running a registered job on demand."""
+    scheduler = SchedulerService()
+
+    async def job():
+        return 42
+
+    scheduler.register("on_demand", 60, job)
+    assert await scheduler.run_job_now("on_demand") == 42
+    assert scheduler.get_status()["on_demand"]["run_count"] == 1
@@ -2,9 +2,15 @@
 import uuid
 
 import pytest
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.session import MessageRole, SessionPhase, SessionStatus
+from src.models.session import (
+    ConversationSession,
+    MessageRole,
+    SessionPhase,
+    SessionStatus,
+)
 from src.schemas.session import MessageCreate, SessionCreate
 from src.services.session_service import SessionService
 
@@ -163,6 +169,37 @@ async def test_update_session_data(db_session: AsyncSession, sample_visitor_id:
     assert session.recommended_service == "AI Strategy"
 
 
+@pytest.mark.asyncio
+async def test_update_session_data_patches_json_in_database(db_session: AsyncSession, sample_visitor_id: str):
+    """Test that JSON fields are merged in the database, keeping keys written elsewhere."""
+    service = SessionService(db_session)
+    session = await service.create_session(SessionCreate(visitor_id=sample_visitor_id))
+    await service.update_session_data(session, client_info={"name": "John Doe"})
+
+    # Another request adds a key this session object hasn't seen
+    await db_session.execute(
+        update(ConversationSession)
+        .where(ConversationSession.id == session.id)
+        .values(client_info={"name": "John Doe", "company": "Acme"})
+        .execution_options(synchronize_session=False)
+    )
+    await db_session.commit()
+
+    await service.update_session_data(
+        session,
+        client_info={"email": "john@example.com"},
+        business_context={"challenges": ["scaling", "costs"], "size": {"employees": 50}},
+    )
+
+    assert session.client_info == {"name": "John Doe", "company": "Acme", "email": "john@example.com"}
+    assert session.business_context == {"challenges": ["scaling", "costs"], "size": {"employees": 50}}
+    assert session not in db_session.dirty
+    stored = await db_session.scalar(
+        select(ConversationSession.business_context).where(ConversationSession.id == session.id)
+    )
+    assert stored["size"] == {"employees": 50}
+
+
 @pytest.mark.asyncio
 async def test_get_session_messages(db_session: AsyncSession, sample_visitor_id: str):
     """Test retrieving all messages for a session."""
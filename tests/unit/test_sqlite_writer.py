@@ -0,0 +1,116 @@
+"""Unit tests for the SQLite production profile's writer queue."""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import String, func, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.core.sqlite import create_sqlite_engines, queued_write_sessionmaker
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    writer, reader = create_sqlite_engines(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pragmas_are_set_on_connect(engines):
+    """Test that both pools use WAL and the read pool is query-only."""
+    writer, reader = engines
+    async with reader.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+        assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+    async with writer.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 0
+        assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() > 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commits_are_batched(engines):
+    """Test that many sessions' commits share few transactions."""
+    writer, reader = engines
+    session_factory = queued_write_sessionmaker(writer, reader, expire_on_commit=False)
+
+    async def write(i: int) -> None:
+        async with session_factory() as session:
+            session.add(Item(id=i, name=f"item {i}"))
+            await session.commit()
+
+    await asyncio.gather(*(write(i) for i in range(50)))
+
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count(Item.id))) == 50
+        write_queue = session.write_queue
+    assert write_queue.commits < 50
+
+
+@pytest.mark.asyncio
+async def test_failed_session_only_rolls_back_its_own_writes(engines):
+    """Test that a constraint violation doesn't affect the rest of the batch."""
+    writer, reader = engines
+    session_factory = queued_write_sessionmaker(writer, reader, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(Item(id=1, name="first"))
+        await session.commit()
+
+    async def write(item_id: int) -> None:
+        async with session_factory() as session:
+            session.add(Item(id=item_id, name="second"))
+            await session.commit()
+
+    results = await asyncio.gather(write(1), write(2), write(3), return_exceptions=True)
+
+    assert isinstance(results[0], IntegrityError)
+    assert results[1:] == [None, None]
+    async with session_factory() as session:
+        names = (await session.scalars(select(Item.name).order_by(Item.id))).all()
+    assert names == ["first", "second", "second"]
+
+
+@pytest.mark.asyncio
+async def test_leased_writer_reads_its_own_writes(engines):
+    """Test that a session holding the writer sees its uncommitted changes."""
+    writer, reader = engines
+    session_factory = queued_write_sessionmaker(writer, reader, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add(Item(id=1, name="draft"))
+        await session.flush()
+        await session.execute(update(Item).where(Item.id == 1).values(name="final"))
+        assert await session.scalar(select(Item.name).where(Item.id == 1)) == "final"
+
+        # Other sessions wait for the writer but can still read
+        async with session_factory() as other:
+            assert await other.scalar(select(func.count(Item.id))) == 0
+        await session.commit()
+
+    async with session_factory() as session:
+        assert await session.scalar(select(Item.name)) == "final"
+
+    # Rolled back leases leave no trace
+    async with session_factory() as session:
+        await session.execute(text("SELECT 1"))
+        session.add(Item(id=2, name="discarded"))
+        await session.flush()
+        await session.rollback()
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count(Item.id))) == 1
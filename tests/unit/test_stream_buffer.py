@@ -0,0 +1,122 @@
+"""Unit tests for the response stream buffer."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.services.cache_service import cache_service
+from src.services.stream_buffer_service import StreamBuffer
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start each test with an empty in-memory cache."""
+    cache_service.in_memory_cache.cache.clear()
+    yield
+    cache_service.in_memory_cache.cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_read_from_offset():
+    """Test a reader resumes from the first chunk it has not received."""
+    buffer = StreamBuffer(ttl=60, max_chunks=100)
+    for offset, chunk in enumerate(["Hel", "lo ", "there"]):
+        await buffer.append("session-1", "message-1", offset, chunk)
+
+    stream = await buffer.read("message-1", offset=1)
+
+    assert stream is not None
+    assert stream.chunks == [(1, "lo "), (2, "there")]
+    assert stream.next_offset == 3
+    assert stream.complete is False
+    assert await buffer.get_latest_message_id("session-1") == "message-1"
+
+
+@pytest.mark.asyncio
+async def test_complete_stream():
+    """Test completion is recorded with the buffered chunks."""
+    buffer = StreamBuffer(ttl=60, max_chunks=100)
+    await buffer.append("session-1", "message-1", 0, "Done")
+    await buffer.complete("session-1", "message-1")
+
+    stream = await buffer.read("message-1", offset=1)
+
+    assert stream is not None
+    assert stream.chunks == []
+    assert stream.complete is True
+
+
+@pytest.mark.asyncio
+async def test_failed_stream():
+    """Test a stream that ended in an error is complete and failed."""
+    buffer = StreamBuffer(ttl=60, max_chunks=100)
+    await buffer.append("session-1", "message-1", 0, "Partial")
+    await buffer.complete("session-1", "message-1", failed=True)
+
+    stream = await buffer.read("message-1")
+
+    assert stream is not None
+    assert stream.chunks == [(0, "Partial")]
+    assert stream.complete is True
+    assert stream.failed is True
+
+
+@pytest.mark.asyncio
+async def test_every_write_refreshes_ttl():
+    """Test the buffer expires ttl seconds after its last write."""
+    buffer = StreamBuffer(ttl=60, max_chunks=100)
+    await buffer.append("session-1", "message-1", 0, "Hel")
+    cache_service.in_memory_cache.cache[buffer._key("message-1")]["expires_at"] -= timedelta(seconds=30)
+
+    await buffer.append("session-1", "message-1", 1, "lo")
+
+    assert await cache_service.ttl(buffer._key("message-1")) > 50
+
+
+@pytest.mark.asyncio
+async def test_writer_buffers_in_background():
+    """Test writer appends return at once and are written in batches."""
+    buffer = StreamBuffer(ttl=60, max_chunks=100)
+    writes: list[dict[int, str]] = []
+    append_many = buffer.append_many
+
+    async def recording_append_many(session_id, message_id, chunks):
+        writes.append(dict(chunks))
+        await append_many(session_id, message_id, chunks)
+
+    buffer.append_many = recording_append_many  # type: ignore[method-assign]
+    writer = buffer.writer("session-1", "message-1")
+    for offset, chunk in enumerate(["a", "b", "c"]):
+        writer.append(offset, chunk)
+
+    # Nothing is written until the stream yields to the event loop
+    assert writes == []
+    await asyncio.sleep(0)
+    await writer.close()
+    await writer.close()
+
+    assert writes == [{0: "a", 1: "b", 2: "c"}]
+    stream = await buffer.read("message-1")
+    assert stream is not None
+    assert stream.chunks == [(0, "a"), (1, "b"), (2, "c")]
+    assert stream.complete is True
+    assert stream.failed is False
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_drops_oldest_chunks():
+    """Test only the last max_chunks chunks are kept."""
+    buffer = StreamBuffer(ttl=60, max_chunks=3)
+    for offset in range(5):
+        await buffer.append("session-1", "message-1", offset, str(offset))
+
+    stream = await buffer.read("message-1")
+
+    assert stream is not None
+    assert stream.chunks == [(2, "2"), (3, "3"), (4, "4")]
+
+
+@pytest.mark.asyncio
+async def test_unknown_stream():
+    """Test reading a stream that was never buffered."""
+    assert await StreamBuffer().read("missing") is None
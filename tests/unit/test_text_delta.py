@@ -0,0 +1,29 @@
+"""Unit tests for text delta encoding."""
+import zlib
+
+from src.utils.text_delta import apply_delta, encode_delta
+
+
+def test_delta_round_trip():
+    """Test a delta reconstructs the target from the base."""
+    base = "# PRD\n\n## Scope\n\nAnalytics.\n\n## Timeline\n\nThree months.\n"
+    target = "# PRD v2\n\n## Scope\n\nAnalytics and ML.\n\n## Timeline\n\nThree months.\n"
+
+    assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_delta_handles_empty_and_unrelated_texts():
+    """Test deltas work without shared lines or trailing newlines."""
+    for base, target in [("", "new text"), ("old text", ""), ("a\nb", "c\nd\ne")]:
+        assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_delta_is_smaller_than_compressed_target_for_similar_texts():
+    """Test shared lines are referenced rather than stored."""
+    sections = "".join(f"## Section {i}\n\nRequirement {i} details.\n\n" for i in range(50))
+    base = "# PRD v2\n\n" + sections
+    target = "# PRD v1\n\n" + sections
+
+    delta = encode_delta(base, target)
+
+    assert len(delta) < len(zlib.compress(target.encode(), 9))
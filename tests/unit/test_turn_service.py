@@ -0,0 +1,167 @@
+"""Unit tests for per-session chat turn coordination."""
+import asyncio
+
+import pytest
+
+from src.core.exceptions import ConflictError
+from src.services.cache_service import CACHE_PREFIXES, cache_service
+from src.services.turn_service import TurnCoordinator
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start each test with an empty in-memory cache."""
+    cache_service.in_memory_cache.cache.clear()
+    yield
+    cache_service.in_memory_cache.cache.clear()
+
+
+@pytest.fixture
+def coordinator():
+    """Create a TurnCoordinator with short timeouts."""
+    return TurnCoordinator(lock_ttl=5, lock_timeout=1, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_turns_for_one_session_are_serialized(coordinator):
+    """Test two different messages to one session never run concurrently."""
+    running = 0
+    max_running = 0
+
+    async def handler():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return {"ok": True}
+
+    await asyncio.gather(
+        coordinator.run_turn("s1", handler),
+        coordinator.run_turn("s1", handler),
+    )
+
+    assert max_running == 1
+
+
+@pytest.mark.asyncio
+async def test_turns_for_different_sessions_run_concurrently(coordinator):
+    """Test the lock is per session."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def blocking():
+        started.set()
+        await release.wait()
+        return {"session": "s1"}
+
+    async def other():
+        return {"session": "s2"}
+
+    first = asyncio.create_task(coordinator.run_turn("s1", blocking))
+    await started.wait()
+
+    result, _ = await asyncio.wait_for(coordinator.run_turn("s2", other), 1)
+    assert result == {"session": "s2"}
+
+    release.set()
+    await first
+
+
+@pytest.mark.asyncio
+async def test_in_flight_retries_are_coalesced(coordinator):
+    """Test a retry of an in-flight turn runs the handler once and shares its result."""
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"reply": "hi"}
+
+    (first, first_dup), (second, second_dup) = await asyncio.gather(
+        coordinator.run_turn("s1", handler, idempotency_key="m1"),
+        coordinator.run_turn("s1", handler, idempotency_key="m1"),
+    )
+
+    assert calls == 1
+    assert first == second == {"reply": "hi"}
+    assert (first_dup, second_dup) == (False, True)
+
+
+@pytest.mark.asyncio
+async def test_repeated_messages_without_key_both_run(coordinator):
+    """Test the same reply sent twice without a key is processed twice."""
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"reply": calls}
+
+    results = await asyncio.gather(
+        coordinator.run_turn("s1", handler),
+        coordinator.run_turn("s1", handler),
+    )
+
+    assert calls == 2
+    assert sorted(result["reply"] for result, _ in results) == [1, 2]
+    assert [duplicate for _, duplicate in results] == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_completed_turn(coordinator):
+    """Test a retry with the same key returns the stored result."""
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        return {"reply": calls}
+
+    first, duplicate = await coordinator.run_turn("s1", handler, idempotency_key="m1")
+    assert (first, duplicate) == ({"reply": 1}, False)
+
+    retry, duplicate = await coordinator.run_turn("s1", handler, idempotency_key="m1")
+    assert (retry, duplicate) == ({"reply": 1}, True)
+
+    # A new key is a new turn, even with the same content
+    other, duplicate = await coordinator.run_turn("s1", handler, idempotency_key="m2")
+    assert (other, duplicate) == ({"reply": 2}, False)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_is_not_cached(coordinator):
+    """Test a failed turn can be retried with the same key."""
+    attempts = 0
+
+    async def handler():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("LLM unavailable")
+        return {"reply": "ok"}
+
+    with pytest.raises(RuntimeError):
+        await coordinator.run_turn("s1", handler, idempotency_key="m1")
+
+    result, duplicate = await coordinator.run_turn("s1", handler, idempotency_key="m1")
+    assert (result, duplicate) == ({"reply": "ok"}, False)
+
+
+@pytest.mark.asyncio
+async def test_lock_held_by_another_worker_times_out(coordinator):
+    """Test the shared lock blocks turns held by another worker."""
+    key = f"{CACHE_PREFIXES['turn_lock']}s1"
+    await cache_service.acquire_lock(key, "other-worker", ttl=5)
+
+    async def handler():
+        return {}
+
+    with pytest.raises(ConflictError):
+        await coordinator.run_turn("s1", handler)
+
+    await cache_service.release_lock(key, "other-worker")
+    assert await coordinator.run_turn("s1", handler) == ({}, False)